@@ -0,0 +1,93 @@
+"""
+Matching benchmarks.
+
+    python -m benchmarks run --scale 10k --output bench.json
+    python -m benchmarks compare baseline.json bench.json
+
+`run` creates a throwaway test database (like `manage.py test`), fills it with
+the synthetic population for the scale and times the matching paths.
+`compare` exits with status 1 when a benchmark's median regressed by more
+than --threshold.
+"""
+import argparse
+import json
+import os
+import sys
+
+import django
+
+
+def run(args):
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from core.models import WorkerProfile
+    from core.synthetic import SCALES, scale_counts
+    from .suite import environment, populate, run_benchmarks
+
+    if args.scale not in SCALES:
+        sys.exit(f'--scale must be one of {", ".join(SCALES)}')
+    workers, jobs, employers = scale_counts(args.scale)
+    workers = args.workers or workers
+    jobs = args.jobs or jobs
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=args.keepdb)
+    try:
+        if WorkerProfile.objects.count() != workers:
+            populate(workers, jobs, employers, seed=args.seed, stdout=sys.stderr)
+
+        results = run_benchmarks(
+            seed=args.seed, repeats=args.repeats,
+            progress=lambda name: print(f'  {name}', file=sys.stderr)
+        )
+        report = {'environment': environment(args.scale, args.seed), 'results': results}
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+def compare(args):
+    from .compare import compare_results, format_comparison, load_results
+
+    rows = compare_results(load_results(args.baseline), load_results(args.current), args.threshold)
+    print(format_comparison(rows))
+    if any(regressed for *_, regressed in rows):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Job matching benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Generate a synthetic population and time matching')
+    run_parser.add_argument('--scale', default='10k', help='Population size: 10k, 100k or 1m')
+    run_parser.add_argument('--workers', type=int, help='Override the number of workers')
+    run_parser.add_argument('--jobs', type=int, help='Override the number of jobs')
+    run_parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic population')
+    run_parser.add_argument('--repeats', type=int, default=20, help='Timed calls per benchmark')
+    run_parser.add_argument('--output', help='Write the JSON results to this file')
+    run_parser.add_argument('--keepdb', action='store_true', help='Keep and reuse the benchmark database')
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser('compare', help='Compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help='Relative median slowdown reported as a regression')
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mkononi_backend.settings')
+        django.setup()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+import json
+
+# Benchmark results are compared on their median; noise below this is ignored
+DEFAULT_THRESHOLD = 0.10
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Rows of (name, baseline median ms, current median ms, relative change, regressed)
+    for every benchmark present in both result files
+    """
+    rows = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        change = result['median_ms'] / before['median_ms'] - 1 if before['median_ms'] else 0.0
+        rows.append((name, before['median_ms'], result['median_ms'], change, change > threshold))
+    return rows
+
+
+def format_comparison(rows):
+    lines = [f'{"benchmark":<28} {"baseline ms":>12} {"current ms":>12} {"change":>8}']
+    for name, before, after, change, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        lines.append(f'{name:<28} {before:>12.3f} {after:>12.3f} {change:>+8.1%}{flag}')
+    return '\n'.join(lines)
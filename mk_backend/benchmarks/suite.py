@@ -0,0 +1,203 @@
+from itertools import cycle
+from unittest import mock
+import io
+import platform
+import random
+import statistics
+import subprocess
+import time
+
+import django
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+from core.models import WorkerProfile, JobPosting
+from core.matching import (
+    WORKER_FEATURE_FIELDS, build_worker_features, calculate_match_score, score_workers_for_job
+)
+from core.ranking import top_matches_for_job
+
+# Workers x jobs held in memory for the scalar scorer benchmark
+PAIR_SAMPLE_WORKERS = 1000
+PAIR_SAMPLE_JOBS = 10
+
+# Distinct jobs / workers the endpoint benchmarks cycle through
+REQUEST_SAMPLE = 50
+
+
+def _check(response):
+    if response.status_code != 200:
+        raise RuntimeError(f'{response.status_code} from {response.request["PATH_INFO"]}: {response.data}')
+
+
+def populate(workers, jobs, employers, seed=0, stdout=None):
+    """Insert a synthetic population with generate_load_data"""
+    call_command(
+        'generate_load_data', workers=workers, jobs=jobs, employers=employers, seed=seed,
+        stdout=stdout or io.StringIO()
+    )
+
+
+def summarize(samples, operations=1):
+    """Timing statistics in milliseconds for a list of durations in seconds"""
+    samples = sorted(samples)
+    median = statistics.median(samples)
+    return {
+        'repeats': len(samples),
+        'operations': operations,
+        'min_ms': samples[0] * 1000,
+        'median_ms': median * 1000,
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        'max_ms': samples[-1] * 1000,
+        'ops_per_second': operations / median if median else None,
+    }
+
+
+def measure(func, repeats, setup=None, warmup=1, operations=1):
+    """Time func() repeats times after warmup calls; setup() runs untimed before each call"""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    samples = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples, operations)
+
+
+def bench_calculate_match_score(repeats):
+    workers = list(WorkerProfile.objects.order_by('id')[:PAIR_SAMPLE_WORKERS])
+    jobs = list(JobPosting.objects.filter(is_open=True).order_by('id')[:PAIR_SAMPLE_JOBS])
+    pairs = [(worker, job) for job in jobs for worker in workers]
+
+    def score_pairs():
+        for worker, job in pairs:
+            calculate_match_score(worker, job)
+    return measure(score_pairs, repeats, operations=len(pairs))
+
+
+def bench_batch_scoring(job_ids, repeats):
+    rows = WorkerProfile.objects.order_by('id').values_list(*WORKER_FEATURE_FIELDS)
+    build = measure(lambda: build_worker_features(rows.iterator(chunk_size=settings.MATCH_SCAN_CHUNK_SIZE)),
+                    max(1, repeats // 5), warmup=0)
+    features = build_worker_features(rows.iterator(chunk_size=settings.MATCH_SCAN_CHUNK_SIZE))
+    jobs = cycle(JobPosting.objects.filter(id__in=job_ids))
+    score = measure(lambda: score_workers_for_job(next(jobs), features), repeats, operations=len(features))
+    return build, score
+
+
+def bench_top_matches(job_ids, repeats):
+    jobs = cycle(JobPosting.objects.filter(id__in=job_ids))
+    return measure(lambda: top_matches_for_job(next(jobs), limit=settings.MATCH_RESULTS_DEFAULT_LIMIT), repeats)
+
+
+def bench_matches_action(job_ids, repeats, cold):
+    # Each job's matches are only visible to its employer
+    requests = []
+    for job in JobPosting.objects.filter(id__in=job_ids).select_related('employer__user'):
+        client = APIClient()
+        client.force_authenticate(job.employer.user)
+        requests.append((client, reverse('jobposting-matches', kwargs={'pk': job.id})))
+    requests = cycle(requests)
+
+    def get_matches():
+        client, url = next(requests)
+        _check(client.get(url))
+    if cold:
+        return measure(get_matches, repeats, setup=cache.clear)
+    return measure(get_matches, repeats, warmup=len(job_ids))
+
+
+def bench_whatsapp_job_search(worker_rows, repeats):
+    client = APIClient()
+    messages = cycle([
+        {'From': f'whatsapp:{phone}', 'Body': f'jobs {location}'}
+        for phone, location in worker_rows
+    ])
+    url = reverse('whatsapp_webhook')
+    return measure(lambda: _check(client.post(url, next(messages), format='json')), repeats)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def sample_rows(rows, positions):
+    """Rows at the given positions of a queryset, in that order, streamed in chunks"""
+    wanted = {position: index for index, position in enumerate(positions)}
+    sampled = [None] * len(positions)
+    last = max(positions, default=-1)
+    for position, row in enumerate(rows.iterator(chunk_size=settings.MATCH_SCAN_CHUNK_SIZE)):
+        if position > last:
+            break
+        if position in wanted:
+            sampled[wanted[position]] = row
+    return sampled
+
+
+def run_benchmarks(seed=0, repeats=20, progress=None):
+    """
+    Time matching against the population already in the database.
+    Returns the benchmark results keyed by name.
+    """
+    progress = progress or (lambda message: None)
+    rng = random.Random(seed)
+    open_job_ids = list(JobPosting.objects.filter(is_open=True).order_by('id').values_list('id', flat=True))
+    job_ids = rng.sample(open_job_ids, min(REQUEST_SAMPLE, len(open_job_ids)))
+    worker_count = WorkerProfile.objects.count()
+    worker_rows = sample_rows(
+        WorkerProfile.objects.order_by('id').values_list('phone_number', 'location'),
+        rng.sample(range(worker_count), min(REQUEST_SAMPLE, worker_count))
+    )
+
+    results = {}
+    progress('calculate_match_score')
+    results['calculate_match_score'] = bench_calculate_match_score(repeats)
+    progress('build_worker_features / score_workers_for_job')
+    results['build_worker_features'], results['score_workers_for_job'] = bench_batch_scoring(job_ids, repeats)
+    progress('top_matches_for_job')
+    results['top_matches_for_job'] = bench_top_matches(job_ids, repeats)
+
+    # Request rates are not under test
+    with mock.patch.object(SimpleRateThrottle, 'allow_request', return_value=True):
+        progress('matches action (cold cache)')
+        results['matches_action_cold'] = bench_matches_action(job_ids, repeats, cold=True)
+        progress('matches action (warm cache)')
+        results['matches_action_warm'] = bench_matches_action(job_ids, repeats, cold=False)
+        progress('WhatsApp job search')
+        results['whatsapp_job_search'] = bench_whatsapp_job_search(worker_rows, repeats)
+    return results
+
+
+def environment(scale, seed):
+    """Metadata stored next to the results so runs can be compared"""
+    return {
+        'commit': git_commit(),
+        'created_at': timezone.now().isoformat(),
+        'scale': scale,
+        'seed': seed,
+        'workers': WorkerProfile.objects.count(),
+        'jobs': JobPosting.objects.count(),
+        'database': connection.vendor,
+        'match_backend': settings.MATCH_BACKEND,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+    }
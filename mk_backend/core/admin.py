@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import WorkerProfile, Employer, JobPosting, Application, MatchScore
+from .models import (
+    WorkerProfile, Employer, JobPosting, Application, MatchScore, ArchivedJobPosting, ArchivedApplication
+)
 
 
 @admin.register(WorkerProfile)
@@ -39,4 +41,18 @@ class MatchScoreAdmin(admin.ModelAdmin):
     list_display = ['worker', 'job', 'score', 'calculated_at']
     list_filter = ['calculated_at']
     search_fields = ['worker__full_name', 'job__title']
-    readonly_fields = ['calculated_at']
\ No newline at end of file
+    readonly_fields = ['calculated_at']
+
+
+@admin.register(ArchivedJobPosting)
+class ArchivedJobPostingAdmin(admin.ModelAdmin):
+    list_display = ['title', 'employer', 'location', 'applications_count', 'created_at', 'archived_at']
+    list_filter = ['job_type', 'archived_at']
+    search_fields = ['title', 'location']
+
+
+@admin.register(ArchivedApplication)
+class ArchivedApplicationAdmin(admin.ModelAdmin):
+    list_display = ['worker', 'job', 'status', 'channel', 'applied_at']
+    list_filter = ['status', 'channel']
+    search_fields = ['worker__full_name', 'job__title']
@@ -0,0 +1,74 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import (
+    JobPosting, Application, MatchScore, JobSkill, ArchivedJobPosting, ArchivedApplication
+)
+
+# Jobs closed (last updated) more than ARCHIVE_CLOSED_JOBS_AFTER_DAYS ago
+# leave the hot tables: the job and its applications are copied, ids
+# included, into ArchivedJobPosting/ArchivedApplication and deleted with
+# their skill postings and match scores. Match scores are derived data -
+# closed jobs have none once materialized - so they are dropped, not kept.
+
+# Tables holding rows of a job, deleted before the job itself
+JOB_DEPENDENTS = (Application, MatchScore, JobSkill)
+
+
+def _copied_fields(archive_model):
+    return [field.attname for field in archive_model._meta.concrete_fields if field.name != 'archived_at']
+
+
+def archivable_jobs(days=None, now=None):
+    """Closed jobs untouched for days (default ARCHIVE_CLOSED_JOBS_AFTER_DAYS)"""
+    days = settings.ARCHIVE_CLOSED_JOBS_AFTER_DAYS if days is None else days
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return JobPosting.objects.filter(is_open=False, updated_at__lt=cutoff)
+
+
+def archive_jobs(job_ids):
+    """
+    Move the closed jobs among job_ids, with their applications, to the
+    archive tables in one transaction. Returns (jobs, applications) moved.
+    """
+    with transaction.atomic():
+        jobs = JobPosting.objects.select_for_update().filter(id__in=job_ids, is_open=False)
+        archived_jobs = [ArchivedJobPosting(**row) for row in jobs.values(*_copied_fields(ArchivedJobPosting))]
+        job_ids = [job.id for job in archived_jobs]
+        archived_applications = [
+            ArchivedApplication(**row)
+            for row in Application.objects.filter(job_id__in=job_ids).values(*_copied_fields(ArchivedApplication))
+        ]
+        ArchivedJobPosting.objects.bulk_create(archived_jobs)
+        ArchivedApplication.objects.bulk_create(archived_applications, batch_size=settings.MATCH_SCAN_CHUNK_SIZE)
+
+        # Raw deletes skip per-row signals: the counters and indexes they
+        # maintain belong to the jobs going away
+        for model in JOB_DEPENDENTS:
+            rows = model.objects.filter(job_id__in=job_ids)
+            rows._raw_delete(rows.db)
+        jobs = JobPosting.objects.filter(id__in=job_ids)
+        jobs._raw_delete(jobs.db)
+    return len(archived_jobs), len(archived_applications)
+
+
+def archive_closed_jobs(days=None, batch_size=1000, dry_run=False):
+    """
+    Archive every archivable job, batch_size jobs per transaction.
+    Returns (jobs, applications) moved, or that would be with dry_run.
+    """
+    jobs = archivable_jobs(days).order_by('id').values_list('id', flat=True)
+    if dry_run:
+        return jobs.count(), Application.objects.filter(job_id__in=jobs).count()
+
+    moved_jobs = moved_applications = 0
+    last_id = 0
+    while True:
+        batch = list(jobs.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return moved_jobs, moved_applications
+        archived_jobs, archived_applications = archive_jobs(batch)
+        moved_jobs += archived_jobs
+        moved_applications += archived_applications
+        last_id = batch[-1]
@@ -0,0 +1,46 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import JobPosting, Application
+
+
+def adjust_applications_count(job_id, delta):
+    """Add delta to a job's applications_count in the database (F(), so concurrent changes add up)"""
+    jobs = JobPosting.objects.filter(pk=job_id)
+    if delta < 0:
+        # A drifted count stays at zero instead of failing; reconcile fixes it
+        jobs = jobs.filter(applications_count__gte=-delta)
+    jobs.update(applications_count=F('applications_count') + delta)
+
+
+def _actual_applications_count():
+    applications = Application.objects.filter(job=OuterRef('pk')).order_by().values('job')
+    return Coalesce(Subquery(applications.annotate(count=Count('pk')).values('count')), 0)
+
+
+def drifted_jobs(jobs=None):
+    """Jobs whose applications_count differs from their Application rows"""
+    jobs = JobPosting.objects.all() if jobs is None else jobs
+    return jobs.alias(actual_count=_actual_applications_count()).exclude(
+        applications_count=F('actual_count')
+    )
+
+
+def reconcile_applications_counts(batch_size=5000, dry_run=False):
+    """
+    Recount applications for every job, batch_size job ids per UPDATE.
+    Returns the number of jobs whose count was (or with dry_run would be) fixed.
+    """
+    ids = JobPosting.objects.order_by('pk').values_list('pk', flat=True)
+    fixed = 0
+    last_id = None
+    while True:
+        batch = ids if last_id is None else ids.filter(pk__gt=last_id)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return fixed
+        drifted = drifted_jobs(JobPosting.objects.filter(pk__gte=batch[0], pk__lte=batch[-1]))
+        if dry_run:
+            fixed += drifted.count()
+        else:
+            fixed += drifted.update(applications_count=_actual_applications_count())
+        last_id = batch[-1]
@@ -0,0 +1,115 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+# Reads go to the primary unless a view opts in (ReplicaReadMixin,
+# replica_reads). Even then they stay on the primary once the request has
+# written, or while the client's pin from an earlier write lasts
+# (REPLICA_PIN_SECONDS), so nobody misses their own writes to replication lag.
+
+# Cookie pinning an HTTP client to the primary after a write
+REPLICA_PIN_COOKIE = 'db_pin'
+
+_routing = ContextVar('db_routing', default=None)
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.replica = False
+        self.wrote = False
+
+
+@contextmanager
+def routing_request(pinned=False):
+    """Track reads and writes of one request (see ReplicaRoutingMiddleware)"""
+    state = RoutingState(pinned)
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+def _client_pin_key(client):
+    return f'db_pin:{client}'
+
+
+def pin_to_primary(client):
+    """Keep client's reads on the primary for REPLICA_PIN_SECONDS"""
+    if client and settings.REPLICA_DATABASES:
+        cache.set(_client_pin_key(client), True, settings.REPLICA_PIN_SECONDS)
+
+
+def request_wrote():
+    state = _routing.get()
+    return state is not None and state.wrote
+
+
+def read_from_replica(client=None):
+    """Send the rest of this request's reads to a replica, unless it must see its own writes"""
+    state = _routing.get()
+    if state is None or state.pinned or not settings.REPLICA_DATABASES:
+        return
+    if not (client and cache.get(_client_pin_key(client))):
+        state.replica = True
+
+
+@contextmanager
+def replica_reads(client=None):
+    """Send reads in the block to a replica, like read_from_replica"""
+    state = _routing.get()
+    token = None
+    if state is None:
+        state = RoutingState()
+        token = _routing.set(state)
+    previous = state.replica
+    read_from_replica(client)
+    try:
+        yield
+    finally:
+        state.replica = previous
+        if token is not None:
+            _routing.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Writes go to the primary; opted-in reads to a random REPLICA_DATABASES alias"""
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or not state.replica or state.wrote or not settings.REPLICA_DATABASES:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.REPLICA_DATABASES)
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's rows
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """Serves replica_actions of a viewset from a read replica"""
+    replica_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.replica_actions:
+            read_from_replica()
@@ -1,9 +1,14 @@
 import django_filters
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
 from .models import JobPosting, Application
+from .search import search_jobs, search_terms
+from .skill_index import index_keys, jobs_with_skills
 
 
 class JobPostingFilter(django_filters.FilterSet):
     skills = django_filters.CharFilter(method='filter_skills')
+    skills_any = django_filters.CharFilter(method='filter_skills')
     location = django_filters.CharFilter(field_name='location', lookup_expr='icontains')
     job_type = django_filters.ChoiceFilter(choices=JobPosting.JOB_TYPE_CHOICES)
     min_pay = django_filters.NumberFilter(field_name='pay_rate', lookup_expr='gte')
@@ -14,10 +19,13 @@ class JobPostingFilter(django_filters.FilterSet):
         fields = ['location', 'job_type', 'is_open']
     
     def filter_skills(self, queryset, name, value):
-        skills = [skill.strip() for skill in value.split(',')]
-        for skill in skills:
-            queryset = queryset.filter(required_skills__icontains=skill)
-        return queryset
+        """Jobs requiring all (skills) or any (skills_any) of the comma-separated skills"""
+        # Exact canonical names through the skill index, so synonyms match
+        # and "art" does not match "carpentry"
+        skills = value.split(',')
+        if not index_keys(skills):
+            return queryset
+        return queryset.filter(id__in=jobs_with_skills(skills, match_all=name == 'skills'))
 
 
 class ApplicationFilter(django_filters.FilterSet):
@@ -26,4 +34,28 @@ class ApplicationFilter(django_filters.FilterSet):
     
     class Meta:
         model = Application
-        fields = ['status', 'channel']
\ No newline at end of file
+        fields = ['status', 'channel']
+
+
+class JobSearchFilter(BaseFilterBackend):
+    """?search= over title, description and location, most relevant first"""
+    search_param = api_settings.SEARCH_PARAM
+    
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not search_terms(text):
+            return queryset
+        queryset = search_jobs(queryset, text)
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+        # Runs after OrderingFilter; its default ordering breaks ties
+        return queryset.order_by('-search_rank', *queryset.query.order_by)
+    
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Words in the title, description or location (English stemming, prefix matches)',
+            'schema': {'type': 'string'},
+        }]
@@ -0,0 +1,119 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+import json
+import math
+import re
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'kenya_places.json'
+
+KM_PER_DEGREE = 111.32
+
+# (max distance in km, location score), nearest band first; anything further scores 0.3
+DISTANCE_BANDS = [
+    (2.0, 1.0),
+    (10.0, 0.85),
+    (25.0, 0.7),
+    (50.0, 0.5),
+]
+FAR_LOCATION_SCORE = 0.3
+
+# Spatial grid used to find workers near a job: square cells of GRID_CELL_DEGREES
+GRID_CELL_DEGREES = 0.1
+GRID_COLUMNS = int(360 / GRID_CELL_DEGREES) + 1
+
+Point = Tuple[float, float]
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer():
+    with open(GAZETTEER_PATH, encoding='utf-8') as f:
+        data = json.load(f)
+    places = {name: tuple(point) for name, point in data['places'].items()}
+    for alias, name in data['aliases'].items():
+        places[alias] = places[name]
+    return places
+
+
+def resolve_location(location: str) -> Optional[Point]:
+    """
+    Resolve a free-text location to (latitude, longitude) with the bundled gazetteer.
+    Tries the whole string, then each comma/slash separated part, most specific first.
+    """
+    if not location:
+        return None
+    places = load_gazetteer()
+
+    text = ' '.join(location.lower().split())
+    candidates = [text] + [part.strip() for part in re.split(r'[,/;]', text)]
+    for candidate in candidates:
+        point = places.get(candidate)
+        if point is not None:
+            return point
+    return None
+
+
+def grid_cell(point: Optional[Point]) -> Optional[int]:
+    """Id of the grid cell containing point"""
+    if point is None:
+        return None
+    row = math.floor((point[0] + 90) / GRID_CELL_DEGREES)
+    column = math.floor((point[1] + 180) / GRID_CELL_DEGREES)
+    return row * GRID_COLUMNS + column
+
+
+def cells_within(point: Point, radius_km: float) -> List[int]:
+    """Ids of every grid cell that can hold a point within radius_km of point"""
+    latitude, longitude = point
+    lat_span = radius_km / KM_PER_DEGREE
+    lon_span = radius_km / (KM_PER_DEGREE * math.cos(math.radians(latitude)))
+
+    first_row, first_column = divmod(grid_cell((latitude - lat_span, longitude - lon_span)), GRID_COLUMNS)
+    last_row, last_column = divmod(grid_cell((latitude + lat_span, longitude + lon_span)), GRID_COLUMNS)
+    return [
+        row * GRID_COLUMNS + column
+        for row in range(first_row, last_row + 1)
+        for column in range(first_column, last_column + 1)
+    ]
+
+
+def longitude_scale(job_latitude: float) -> float:
+    """Kilometres per degree of longitude at the job's latitude"""
+    return KM_PER_DEGREE * math.cos(math.radians(job_latitude))
+
+
+def squared_distance_km(worker_point: Point, job_point: Point) -> float:
+    """
+    Squared equirectangular distance, scaled at the job's latitude.
+    Accurate to well under 1% over the distances that matter for matching.
+    """
+    dlat = (worker_point[0] - job_point[0]) * KM_PER_DEGREE
+    dlon = (worker_point[1] - job_point[1]) * longitude_scale(job_point[0])
+    return dlat * dlat + dlon * dlon
+
+
+def distance_location_score(squared_km: float) -> float:
+    """Location score for a squared distance"""
+    for max_km, score in DISTANCE_BANDS:
+        if squared_km <= max_km * max_km:
+            return score
+    return FAR_LOCATION_SCORE
+
+
+def location_score_beyond(radius_km: float) -> float:
+    """Best location score of a point further than radius_km away"""
+    for max_km, score in DISTANCE_BANDS:
+        if max_km > radius_km:
+            return score
+    return FAR_LOCATION_SCORE
+
+
+def location_fields(location: str) -> dict:
+    """Model field values derived from a location string"""
+    point = resolve_location(location)
+    return {
+        'latitude': point[0] if point else None,
+        'longitude': point[1] if point else None,
+        'geo_cell': grid_cell(point),
+        'location_key': (location or '').lower(),
+    }
@@ -0,0 +1,127 @@
+import codecs
+import csv
+import json
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from .models import JobPosting, JobSkill
+from .serializers import JobPostingCreateSerializer
+from .skill_index import index_keys
+
+# Bulk job import: uploads are read line by line and handled
+# JOB_IMPORT_CHUNK_SIZE rows at a time - validated with one reused
+# JobPostingCreateSerializer, inserted with bulk_create - so memory depends on
+# the chunk size, not on the upload. bulk_create skips save() and post_save,
+# so their work (coordinates, skill mask, skill postings) is done here per
+# chunk. Match scores are not: scoring every worker would bound neither the
+# request's time nor its memory, so the new job ids are returned for
+# rebuild_match_scores --jobs instead.
+
+IMPORT_CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+}
+IMPORT_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+
+def _decoded_lines(lines):
+    # utf-8-sig drops the byte order mark spreadsheet exports start with
+    return codecs.iterdecode(lines, 'utf-8-sig')
+
+
+def _unreadable(exc):
+    return ValidationError({'non_field_errors': [f'Unreadable upload: {exc}']})
+
+
+def _csv_values(row):
+    """A CSV row as serializer input: blank cells take the field default"""
+    data = {key: value for key, value in row.items() if key is not None and value not in ('', None)}
+    skills = data.get('required_skills')
+    if skills is not None:
+        if skills.lstrip().startswith('['):
+            try:
+                data['required_skills'] = json.loads(skills)
+            except ValueError:
+                pass
+        else:
+            data['required_skills'] = [skill.strip() for skill in skills.split(',') if skill.strip()]
+    return data
+
+
+def csv_rows(lines):
+    """(line number, values or ValidationError) for each data row of CSV lines (bytes)"""
+    reader = csv.DictReader(_decoded_lines(lines))
+    try:
+        for row in reader:
+            yield reader.line_num, _csv_values(row)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        # Nothing after this can be read; the rows before it are kept
+        yield reader.line_num + 1, _unreadable(exc)
+
+
+def ndjson_rows(lines):
+    """(line number, values or ValidationError) for each non-blank line of NDJSON lines (bytes)"""
+    number = 0
+    try:
+        for number, line in enumerate(_decoded_lines(lines), 1):
+            if not line.strip():
+                continue
+            try:
+                values = json.loads(line)
+            except ValueError:
+                yield number, ValidationError({'non_field_errors': ['Invalid JSON']})
+                continue
+            if not isinstance(values, dict):
+                values = ValidationError({'non_field_errors': ['Expected a JSON object']})
+            yield number, values
+    except UnicodeDecodeError as exc:
+        yield number + 1, _unreadable(exc)
+
+
+IMPORT_READERS = {'csv': csv_rows, 'ndjson': ndjson_rows}
+
+
+def _insert_jobs(jobs):
+    with transaction.atomic():
+        JobPosting.objects.bulk_create(jobs)
+        JobSkill.objects.bulk_create([
+            JobSkill(job_id=job.id, skill=skill) for job in jobs for skill in index_keys(job.required_skills)
+        ])
+
+
+def import_jobs(rows, employer, chunk_size=None, max_errors=None):
+    """
+    Create jobs for employer from (line number, values) rows, chunk_size rows
+    per bulk insert. Invalid rows are skipped; returns the created and failed
+    counts, the new job ids and the first max_errors row errors.
+    """
+    chunk_size = chunk_size or settings.JOB_IMPORT_CHUNK_SIZE
+    max_errors = settings.JOB_IMPORT_MAX_ERRORS if max_errors is None else max_errors
+    serializer = JobPostingCreateSerializer()
+    result = {'created': 0, 'failed': 0, 'job_ids': [], 'errors': []}
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return result
+
+        jobs = []
+        for number, values in chunk:
+            try:
+                if isinstance(values, ValidationError):
+                    raise values
+                job = JobPosting(employer=employer, **serializer.run_validation(values))
+            except ValidationError as exc:
+                result['failed'] += 1
+                if len(result['errors']) < max_errors:
+                    result['errors'].append({'line': number, 'errors': exc.detail})
+                continue
+            job.resolve_location()
+            job.resolve_skill_mask()
+            jobs.append(job)
+        if jobs:
+            _insert_jobs(jobs)
+            result['created'] += len(jobs)
+            result['job_ids'].extend(job.id for job in jobs)
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.archival import archive_closed_jobs
+
+
+class Command(BaseCommand):
+    help = 'Move long-closed jobs and their applications to the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.ARCHIVE_CLOSED_JOBS_AFTER_DAYS,
+            help='Archive jobs closed (last updated) more than this many days ago'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Jobs moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--days must not be negative and --batch-size must be positive')
+        jobs, applications = archive_closed_jobs(
+            options['days'], options['batch_size'], dry_run=options['dry_run']
+        )
+        if options['dry_run']:
+            self.stdout.write(f'{jobs} jobs with {applications} applications would be archived')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Archived {jobs} jobs with {applications} applications'))
@@ -1,7 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
-from core.models import WorkerProfile, Employer, JobPosting, Application, MatchScore
-from core.matching import calculate_match_score
+from core.models import WorkerProfile, Employer, JobPosting, Application
 import random
 
 
@@ -72,16 +71,7 @@ class Command(BaseCommand):
             channel='whatsapp'
         )
         
-        # Generate match scores
-        for worker in workers:
-            for job in jobs:
-                score = calculate_match_score(worker, job)
-                if score > 0.2:
-                    MatchScore.objects.create(
-                        worker=worker,
-                        job=job,
-                        score=score
-                    )
+        # Match scores are materialized by core.signals as workers and jobs are saved
         
         self.stdout.write(self.style.SUCCESS(
             f'Sample data created!\n'
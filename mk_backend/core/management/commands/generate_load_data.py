@@ -0,0 +1,203 @@
+from itertools import islice
+import csv
+import io
+import json
+import random
+import time
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from core.models import (
+    WorkerProfile, Employer, JobPosting, Application, MatchScore, WorkerSkill, JobSkill
+)
+from core.matching import (
+    MATCH_THRESHOLD, JOB_FEATURE_FIELDS, WORKER_FEATURE_FIELDS,
+    build_worker_features, score_workers_for_job
+)
+from core.match_cache import bump_worker_set_version
+from core.counters import reconcile_applications_counts
+from core.skill_index import index_keys
+from core.synthetic import (
+    SCALES, WORKER_PHONE_PREFIX, USERNAME_PREFIX, scale_counts, synthetic_workers,
+    synthetic_users, synthetic_employers, synthetic_jobs, synthetic_applications
+)
+
+# Written for NULL in COPY rows, so empty strings stay empty strings
+COPY_NULL = '\\N'
+
+# Workers scored against every job when generating MatchScore rows
+SCORING_POOL_SIZE = 20000
+
+
+def copy_value(field, instance):
+    """A field's value as COPY (csv) text"""
+    value = field.pre_save(instance, add=True)
+    if value is None:
+        return COPY_NULL
+    if isinstance(field, models.JSONField):
+        return json.dumps(value, cls=field.encoder)
+    return field.get_db_prep_save(value, connection)
+
+
+def copy_rows(model, instances):
+    """Insert instances with one COPY ... FROM STDIN (PostgreSQL)"""
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for instance in instances:
+        writer.writerow([copy_value(field, instance) for field in fields])
+    buffer.seek(0)
+
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+
+
+class Command(BaseCommand):
+    help = 'Generate a large deterministic synthetic dataset with bulk inserts (COPY on PostgreSQL)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=list(SCALES), help='Preset sizes (default 10k)')
+        parser.add_argument('--workers', type=int, help='Number of workers')
+        parser.add_argument('--jobs', type=int, help='Number of jobs')
+        parser.add_argument('--employers', type=int, help='Number of employers')
+        parser.add_argument(
+            '--applications-per-worker', type=float, default=0.5,
+            help='Average applications per worker'
+        )
+        parser.add_argument(
+            '--scores-per-job', type=int, default=50,
+            help='MatchScore rows per open job (best matches from a worker sample, 0 for none)'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic data')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per insert statement')
+        parser.add_argument('--no-copy', action='store_true', help='Use bulk_create on PostgreSQL too')
+        parser.add_argument('--flush', action='store_true', help='Delete previously generated data first')
+
+    def handle(self, *args, **options):
+        workers, jobs, employers = scale_counts(options['scale'] or '10k')
+        workers = options['workers'] if options['workers'] is not None else workers
+        jobs = options['jobs'] if options['jobs'] is not None else jobs
+        employers = options['employers'] if options['employers'] is not None else max(1, min(employers, jobs))
+        self.batch_size = options['batch_size']
+        if min(workers, jobs, employers, self.batch_size) < 1 or options['applications_per_worker'] < 0:
+            raise CommandError('Sizes must be positive')
+        seed = options['seed']
+
+        self.use_copy = connection.vendor == 'postgresql' and not options['no_copy']
+        if options['flush']:
+            self.flush()
+        elif self.synthetic_workers().exists() or self.synthetic_users().exists():
+            raise CommandError('Generated data already exists; pass --flush to replace it')
+
+        self.started = time.monotonic()
+        method = 'COPY' if self.use_copy else 'bulk_create'
+        self.stdout.write(f'Generating {workers} workers, {jobs} jobs, {employers} employers (seed {seed}, {method})...')
+
+        with transaction.atomic():
+            self.insert(User, synthetic_users(employers, seed))
+            user_ids = list(self.synthetic_users().order_by('id').values_list('id', flat=True))
+            self.insert(Employer, synthetic_employers(user_ids, seed))
+            employer_ids = list(
+                Employer.objects.filter(user_id__in=self.synthetic_users()).order_by('id').values_list('id', flat=True)
+            )
+
+            self.insert(WorkerProfile, synthetic_workers(workers, seed))
+            self.insert(JobPosting, synthetic_jobs(jobs, employer_ids, seed))
+            worker_ids = list(self.synthetic_workers().order_by('id').values_list('id', flat=True))
+            jobs_qs = JobPosting.objects.filter(employer_id__in=employer_ids)
+
+            # bulk inserts skip save(), so the skill index is written here
+            worker_skills = self.synthetic_workers().order_by('id').values_list('id', 'skills')
+            self.insert(WorkerSkill, (
+                WorkerSkill(worker_id=worker_id, skill=skill)
+                for worker_id, skills in worker_skills.iterator(chunk_size=self.batch_size)
+                for skill in index_keys(skills)
+            ))
+            job_skills = jobs_qs.order_by('id').values_list('id', 'required_skills')
+            self.insert(JobSkill, (
+                JobSkill(job_id=job_id, skill=skill)
+                for job_id, skills in job_skills.iterator(chunk_size=self.batch_size)
+                for skill in index_keys(skills)
+            ))
+
+            open_jobs = list(jobs_qs.filter(is_open=True).order_by('id').values_list('id', 'employer_id'))
+            self.insert(Application, synthetic_applications(
+                worker_ids, open_jobs, options['applications_per_worker'], seed
+            ))
+            # bulk inserts skip the counting signals
+            reconcile_applications_counts(self.batch_size)
+            if options['scores_per_job']:
+                self.insert(MatchScore, self.match_scores(
+                    jobs_qs.filter(is_open=True), worker_ids, options['scores_per_job'], seed
+                ))
+
+        bump_worker_set_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated load data in {time.monotonic() - self.started:.1f}s. '
+            f'Run rebuild_match_scores for a complete MatchScore table.'
+        ))
+
+    def synthetic_workers(self):
+        return WorkerProfile.objects.filter(phone_number__startswith=WORKER_PHONE_PREFIX)
+
+    def synthetic_users(self):
+        return User.objects.filter(username__startswith=USERNAME_PREFIX)
+
+    def insert(self, model, instances):
+        """Insert instances in batches of --batch-size"""
+        total = 0
+        while True:
+            batch = list(islice(instances, self.batch_size))
+            if not batch:
+                break
+            if self.use_copy:
+                copy_rows(model, batch)
+            else:
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+            total += len(batch)
+        self.stdout.write(
+            f'  {model._meta.object_name}: {total} rows ({time.monotonic() - self.started:.1f}s)'
+        )
+
+    def match_scores(self, open_jobs, worker_ids, per_job, seed):
+        """Exact scores of each open job's best matches among a seeded worker sample"""
+        rng = random.Random(f'{seed}:scores')
+        pool = set(rng.sample(worker_ids, min(SCORING_POOL_SIZE, len(worker_ids))))
+        features = build_worker_features(
+            row for row in self.synthetic_workers().order_by('id').values_list(*WORKER_FEATURE_FIELDS)
+            .iterator(chunk_size=self.batch_size) if row[0] in pool
+        )
+        fields = (*JOB_FEATURE_FIELDS, 'employer_id')
+        for row in open_jobs.order_by('id').values_list(*fields).iterator(chunk_size=self.batch_size):
+            job = JobPosting(**dict(zip(fields, row)))
+            scores = score_workers_for_job(job, features)
+            above = np.flatnonzero(scores > MATCH_THRESHOLD)
+            best = above[np.argsort(-scores[above], kind='stable')[:per_job]]
+            for index in best:
+                yield MatchScore(
+                    worker_id=int(features.worker_ids[index]), job_id=job.id,
+                    employer_id=job.employer_id, score=float(scores[index])
+                )
+
+    def flush(self):
+        """Delete generated rows, dependents first so each step is a plain DELETE"""
+        workers = self.synthetic_workers()
+        jobs = JobPosting.objects.filter(employer__user__in=self.synthetic_users())
+        with transaction.atomic():
+            for model, owner in ((MatchScore, 'worker'), (Application, 'worker'), (WorkerSkill, 'worker')):
+                model.objects.filter(**{f'{owner}__in': workers}).delete()
+            for model in (MatchScore, Application, JobSkill):
+                model.objects.filter(job__in=jobs).delete()
+            # Raw deletes skip per-row signals (cache invalidation is done once below)
+            jobs._raw_delete(jobs.db)
+            Employer.objects.filter(user__in=self.synthetic_users())._raw_delete(Employer.objects.db)
+            self.synthetic_users().delete()
+            workers._raw_delete(workers.db)
+        bump_worker_set_version()
+        self.stdout.write('Deleted previously generated data')
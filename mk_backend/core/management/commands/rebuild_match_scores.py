@@ -0,0 +1,150 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import time
+import numpy as np
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from core.models import WorkerProfile, JobPosting, MatchScore
+from core.matching import JOB_FEATURE_FIELDS, WORKER_FEATURE_FIELDS, build_worker_features, score_workers_for_job
+from core.materialization import top_matches, upsert_match_scores
+from core.match_cache import bump_worker_set_version
+
+
+def score_shard(first_id, last_id, job_rows):
+    """
+    Score workers first_id..last_id against every job in job_rows.
+    Runs in a pool process; returns the worker count and, per job id, the
+    shard's top matches as (worker_ids, scores)
+    """
+    features = build_worker_features(
+        WorkerProfile.objects.filter(id__gte=first_id, id__lte=last_id)
+        .order_by('id').values_list(*WORKER_FEATURE_FIELDS)
+    )
+    matches = {}
+    for row in job_rows:
+        job = JobPosting(**dict(zip(JOB_FEATURE_FIELDS, row)))
+        matches[job.id] = top_matches(features.worker_ids, score_workers_for_job(job, features))
+    return len(features), matches
+
+
+def init_pool_process():
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the MatchScore table by scoring worker shards against open jobs in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Number of scoring processes (1 scores in this process)'
+        )
+        parser.add_argument(
+            '--jobs', type=str, default='',
+            help='Comma separated job ids to rebuild (default: every open job)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.MATCH_SCAN_CHUNK_SIZE,
+            help='Workers per shard and rows per bulk upsert'
+        )
+
+    def handle(self, *args, **options):
+        processes = options['workers']
+        chunk_size = options['chunk_size']
+        if processes < 1 or chunk_size < 1:
+            raise CommandError('--workers and --chunk-size must be positive')
+
+        jobs = JobPosting.objects.filter(is_open=True)
+        if options['jobs']:
+            try:
+                job_ids = [int(job_id) for job_id in options['jobs'].split(',')]
+            except ValueError:
+                raise CommandError('--jobs must be a comma separated list of ids')
+            jobs = jobs.filter(id__in=job_ids)
+        job_rows = list(jobs.order_by('id').values_list(*JOB_FEATURE_FIELDS))
+        job_ids = [row[0] for row in job_rows]
+        employer_ids = dict(jobs.values_list('id', 'employer_id'))
+
+        shards = self.worker_shards(chunk_size)
+        total_workers = WorkerProfile.objects.count()
+        self.stdout.write(
+            f'Scoring {total_workers} workers against {len(job_rows)} jobs '
+            f'in {len(shards)} shards with {processes} process(es)...'
+        )
+
+        started_at = timezone.now()
+        started = time.monotonic()
+        done_workers = 0
+
+        # Each job's top matches so far, merged shard by shard
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+        matches = {job_id: empty for job_id in job_ids}
+        for shard_workers, shard_matches in self.run_shards(shards, job_rows, processes):
+            for job_id, (worker_ids, scores) in shard_matches.items():
+                kept_ids, kept_scores = matches[job_id]
+                matches[job_id] = top_matches(
+                    np.concatenate([kept_ids, worker_ids]), np.concatenate([kept_scores, scores])
+                )
+            done_workers += shard_workers
+
+            elapsed = max(time.monotonic() - started, 1e-9)
+            self.stdout.write(
+                f'  {done_workers}/{total_workers} workers scored '
+                f'({done_workers / elapsed:.0f} workers/s, '
+                f'{done_workers * len(job_rows) / elapsed:.0f} pairs/s)'
+            )
+
+        rows = [
+            MatchScore(worker_id=worker_id, job_id=job_id, employer_id=employer_ids[job_id], score=score)
+            for job_id, (worker_ids, scores) in matches.items()
+            for worker_id, score in zip(worker_ids.tolist(), scores.tolist())
+        ]
+        for start in range(0, len(rows), chunk_size):
+            upsert_match_scores(rows[start:start + chunk_size])
+        written = len(rows)
+
+        # Rows not rewritten by this run fell out of their job's top matches
+        stale = MatchScore.objects.filter(job_id__in=job_ids, calculated_at__lt=started_at).delete()[0]
+        if not options['jobs']:
+            stale += MatchScore.objects.filter(job__is_open=False).delete()[0]
+        # Cached match lists may predate the rebuilt rows
+        bump_worker_set_version()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt match scores: {written} rows written, {stale} stale rows removed '
+            f'in {elapsed:.1f}s'
+        ))
+
+    def worker_shards(self, chunk_size):
+        """Split worker ids into (first_id, last_id) ranges of chunk_size workers"""
+        shards = []
+        ids = WorkerProfile.objects.order_by('id').values_list('id', flat=True)
+        shard = []
+        for worker_id in ids.iterator(chunk_size=chunk_size):
+            shard.append(worker_id)
+            if len(shard) == chunk_size:
+                shards.append((shard[0], shard[-1]))
+                shard = []
+        if shard:
+            shards.append((shard[0], shard[-1]))
+        return shards
+
+    def run_shards(self, shards, job_rows, processes):
+        if processes == 1:
+            for first_id, last_id in shards:
+                yield score_shard(first_id, last_id, job_rows)
+            return
+
+        # Pool processes open their own connections; never share the parent's
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_pool_process) as pool:
+            futures = [
+                pool.submit(score_shard, first_id, last_id, job_rows)
+                for first_id, last_id in shards
+            ]
+            for future in as_completed(futures):
+                yield future.result()
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.counters import reconcile_applications_counts
+
+
+class Command(BaseCommand):
+    help = 'Recount JobPosting.applications_count from the Application table where it has drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Jobs per UPDATE statement')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many counts are wrong')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        fixed = reconcile_applications_counts(options['batch_size'], dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f'{fixed} jobs have a wrong applications_count')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Fixed applications_count of {fixed} jobs'))
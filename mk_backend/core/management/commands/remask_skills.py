@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.match_cache import bump_worker_set_version
+from core.skill_index import remask_skills
+
+
+class Command(BaseCommand):
+    help = 'Recompute skill masks and the skill index after skills were appended to SKILL_TAXONOMY'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows checked per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many masks are stale')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        workers, jobs = remask_skills(options['batch_size'], dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write(f'{workers} workers and {jobs} jobs have a stale skill mask')
+            return
+
+        if workers or jobs:
+            # Cached match lists were ranked with the old masks
+            bump_worker_set_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Remasked {workers} workers and {jobs} jobs; run rebuild_match_scores to rescore them'
+        ))
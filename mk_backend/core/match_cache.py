@@ -0,0 +1,162 @@
+import math
+import random
+import threading
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+# Generation counters built into every job_matches cache key. Bumping a
+# counter moves readers to new keys; old entries are never read again and
+# simply expire.
+WORKER_SET_VERSION_KEY = 'match_version_workers'
+
+# Worker fields shown in or scored by job_matches responses
+MATCH_CACHE_WORKER_FIELDS = {
+    'full_name', 'phone_number', 'skills', 'location', 'experience_level', 'preferred_job_types'
+}
+
+# XFetch beta: > 1 favours earlier recomputation, < 1 later
+XFETCH_BETA = 1.0
+
+# How often a request without a previous value polls for another process's result
+LOCK_POLL_SECONDS = 0.05
+
+# Striped locks for single-flight within this process (process-local caches)
+_LOCAL_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def job_version_key(job_id):
+    return f'match_version_job_{job_id}'
+
+
+def _new_version():
+    # Clock based, so a counter evicted from the cache never restarts at a
+    # value that older entries were stored under
+    return time.time_ns()
+
+
+def _current_versions(keys):
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), None)
+
+
+def bump_worker_set_version():
+    """Invalidate every cached match list (a worker joined, left or changed)"""
+    bump_version(WORKER_SET_VERSION_KEY)
+
+
+def bump_job_version(job_id):
+    """Invalidate the cached match lists of one job"""
+    bump_version(job_version_key(job_id))
+
+
+def job_matches_cache_key(job_id, limit):
+    """Cache key of a job's match list at the current worker-set and job versions"""
+    worker_version, job_version = _current_versions([WORKER_SET_VERSION_KEY, job_version_key(job_id)])
+    return f'job_matches_{job_id}_{limit}_w{worker_version}_j{job_version}'
+
+
+def _expires_early(entry):
+    """
+    XFetch (probabilistic early expiration): recompute before the soft expiry
+    with a probability that grows as it nears and with the cost of the last
+    computation, so one request refreshes a hot entry before it lapses.
+    """
+    jitter = -entry['delta'] * XFETCH_BETA * math.log(1.0 - random.random())
+    return time.time() + jitter >= entry['expires']
+
+
+def _store(key, value, delta, timeout):
+    entry = {'value': value, 'delta': delta, 'expires': time.time() + timeout}
+    # Kept past the soft expiry so it can be served stale during a rebuild
+    cache.set(key, entry, timeout + settings.MATCH_CACHE_STALE_TIMEOUT)
+    return entry
+
+
+def _uses_local_cache():
+    return isinstance(caches['default'], LocMemCache)
+
+
+def _acquire(key):
+    """Try to become the single recomputing caller; returns a release callable or None"""
+    if _uses_local_cache():
+        lock = _LOCAL_LOCKS[hash(key) % len(_LOCAL_LOCKS)]
+        return lock.release if lock.acquire(blocking=False) else None
+
+    lock_key = f'{key}_lock'
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, settings.MATCH_CACHE_LOCK_TIMEOUT):
+        return None
+
+    def release():
+        # Only delete our own lock; it may have timed out and been taken over
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    return release
+
+
+def _wait_for(key):
+    """Wait (at most MATCH_CACHE_LOCK_TIMEOUT) for the recomputing caller to store key"""
+    if _uses_local_cache():
+        lock = _LOCAL_LOCKS[hash(key) % len(_LOCAL_LOCKS)]
+        if lock.acquire(timeout=settings.MATCH_CACHE_LOCK_TIMEOUT):
+            lock.release()
+        return cache.get(key)
+
+    deadline = time.monotonic() + settings.MATCH_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_SECONDS)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def get_or_compute(key, compute, timeout):
+    """
+    Cached value of compute() with stampede protection.
+
+    Only one caller recomputes a missing or expiring entry: a lock in the
+    cache backend (a striped in-process lock for LocMemCache) picks it.
+    Everyone else gets the expiring entry under the same key or, with
+    nothing to serve, waits for the result. Entries of an older version
+    (another key) are never served, so invalidation is not bypassed.
+    """
+    entry = cache.get(key)
+    if entry is not None and not _expires_early(entry):
+        return entry['value']
+
+    release = _acquire(key)
+    if release is None:
+        stale = entry
+        if stale is None:
+            stale = _wait_for(key)
+        if stale is not None:
+            return stale['value']
+        # The recomputing caller died or is too slow; compute without the lock
+        release = lambda: None
+
+    try:
+        # Another caller may have stored a fresh entry while we took the lock
+        latest = cache.get(key)
+        if latest is not None and (entry is None or latest['expires'] > entry['expires']):
+            return latest['value']
+
+        started = time.monotonic()
+        value = compute()
+        return _store(key, value, time.monotonic() - started, timeout)['value']
+    finally:
+        release()
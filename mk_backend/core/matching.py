@@ -1,6 +1,31 @@
-from typing import List
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence
 import math
 
+import numpy as np
+from .geo import (
+    DISTANCE_BANDS, FAR_LOCATION_SCORE, KM_PER_DEGREE,
+    distance_location_score, longitude_scale, squared_distance_km
+)
+from .skills import canonical_skills, popcount, split_skills
+
+EXPERIENCE_WEIGHTS = {
+    'entry': 1,
+    'intermediate': 2,
+    'experienced': 3,
+    'expert': 4
+}
+
+JOB_TYPE_REQUIREMENTS = {
+    'temporary': 1,
+    'part_time': 2,
+    'contract': 3,
+    'full_time': 3
+}
+
+# Minimum score for a worker to be listed as a match for a job
+MATCH_THRESHOLD = 0.3
+
 
 def calculate_match_score(worker, job) -> float:
     """
@@ -14,7 +39,9 @@ def calculate_match_score(worker, job) -> float:
     score += skills_score * 0.4
     
     # Location matching (30% weight)
-    location_score = calculate_location_match(worker.location, job.location)
+    location_score = calculate_location_match(
+        worker.location, job.location, location_point(worker), location_point(job)
+    )
     score += location_score * 0.3
     
     # Experience level matching (20% weight)
@@ -29,23 +56,39 @@ def calculate_match_score(worker, job) -> float:
 
 
 def calculate_skills_match(worker_skills: List[str], required_skills: List[str]) -> float:
-    """Calculate skills overlap score"""
+    """Calculate skills overlap score over canonical skills (see core.skills)"""
     if not worker_skills or not required_skills:
         return 0.0
     
-    worker_skills_lower = [skill.lower() for skill in worker_skills]
-    required_skills_lower = [skill.lower() for skill in required_skills]
+    required = canonical_skills(required_skills)
+    if not required:
+        return 0.0
     
-    matches = sum(1 for skill in required_skills_lower if skill in worker_skills_lower)
-    return matches / len(required_skills_lower)
+    matches = len(required & canonical_skills(worker_skills))
+    return matches / len(required)
+
 
+def location_point(obj):
+    """(latitude, longitude) resolved for a worker or job, None when unknown"""
+    latitude = getattr(obj, 'latitude', None)
+    longitude = getattr(obj, 'longitude', None)
+    if latitude is None or longitude is None:
+        return None
+    return (latitude, longitude)
 
-def calculate_location_match(worker_location: str, job_location: str) -> float:
-    """Calculate location proximity score"""
+
+def calculate_location_match(worker_location: str, job_location: str, worker_point=None, job_point=None) -> float:
+    """
+    Calculate location proximity score.
+    Uses distance bands when both locations were resolved to coordinates
+    """
+    if worker_point is not None and job_point is not None:
+        return distance_location_score(squared_distance_km(worker_point, job_point))
+    
     if not worker_location or not job_location:
         return 0.5
     
-    # Simple string matching - can be enhanced with geolocation
+    # Fall back to string matching for places missing from the gazetteer
     if worker_location.lower() == job_location.lower():
         return 1.0
     elif worker_location.lower() in job_location.lower() or job_location.lower() in worker_location.lower():
@@ -56,22 +99,8 @@ def calculate_location_match(worker_location: str, job_location: str) -> float:
 
 def calculate_experience_match(worker_experience: str, job_type: str) -> float:
     """Calculate experience level appropriateness"""
-    experience_weights = {
-        'entry': 1,
-        'intermediate': 2,
-        'experienced': 3,
-        'expert': 4
-    }
-    
-    job_type_requirements = {
-        'temporary': 1,
-        'part_time': 2,
-        'contract': 3,
-        'full_time': 3
-    }
-    
-    worker_level = experience_weights.get(worker_experience, 1)
-    required_level = job_type_requirements.get(job_type, 2)
+    worker_level = EXPERIENCE_WEIGHTS.get(worker_experience, 1)
+    required_level = JOB_TYPE_REQUIREMENTS.get(job_type, 2)
     
     # Perfect match
     if worker_level == required_level:
@@ -89,4 +118,350 @@ def calculate_job_type_match(preferred_types: List[str], job_type: str) -> float
     if not preferred_types:
         return 0.5
     
-    return 1.0 if job_type in preferred_types else 0.3
\ No newline at end of file
+    return 1.0 if job_type in preferred_types else 0.3
+
+# Vectorized batch scoring
+#
+# The functions above score a single (worker, job) pair. The helpers below
+# score many workers against one job at once with NumPy and must return the
+# same values as calculate_match_score for every worker.
+
+WORKER_FEATURE_FIELDS = (
+    'id', 'skills', 'skill_mask', 'location', 'experience_level', 'preferred_job_types',
+    'latitude', 'longitude'
+)
+
+# JobPosting columns read by the scorers
+JOB_FEATURE_FIELDS = ('id', 'required_skills', 'location', 'job_type', 'latitude', 'longitude')
+
+
+class TokenMatrix:
+    """
+    Sparse worker x token membership, stored as flat (owner, token id) arrays.
+    Tokens are deduplicated per worker so counts match set membership.
+    """
+
+    def __init__(self, rows: Iterable[Iterable[str]]):
+        self.vocabulary: Dict[str, int] = {}
+        owners = []
+        token_ids = []
+        lengths = []
+
+        for row_index, tokens in enumerate(rows):
+            seen = set()
+            for token in tokens or []:
+                token_id = self.vocabulary.setdefault(token, len(self.vocabulary))
+                if token_id not in seen:
+                    seen.add(token_id)
+                    owners.append(row_index)
+                    token_ids.append(token_id)
+            lengths.append(len(tokens or []))
+
+        self.owners = np.asarray(owners, dtype=np.int64)
+        self.token_ids = np.asarray(token_ids, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def count_matches(self, tokens: Iterable[str]) -> np.ndarray:
+        """Per worker, how many of ``tokens`` (with repeats) the worker holds"""
+        weights = np.zeros(len(self.vocabulary), dtype=np.float64)
+        for token in tokens:
+            token_id = self.vocabulary.get(token)
+            if token_id is not None:
+                weights[token_id] += 1
+        if not len(self.token_ids):
+            return np.zeros(len(self), dtype=np.float64)
+        return np.bincount(self.owners, weights=weights[self.token_ids], minlength=len(self))
+
+
+@dataclass
+class WorkerFeatures:
+    """Column-oriented worker attributes consumed by score_workers_for_job"""
+    worker_ids: np.ndarray
+    skill_masks: np.ndarray
+    other_skills: TokenMatrix
+    location_codes: np.ndarray
+    locations: List[str]
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    experience_levels: np.ndarray
+    preferred_job_types: TokenMatrix
+
+    def __len__(self):
+        return len(self.worker_ids)
+
+
+def build_worker_features(rows: Iterable[Sequence]) -> WorkerFeatures:
+    """
+    Build WorkerFeatures from rows ordered like WORKER_FEATURE_FIELDS,
+    e.g. WorkerProfile.objects.values_list(*WORKER_FEATURE_FIELDS)
+    """
+    worker_ids = []
+    skill_masks = []
+    other_skills = []
+    location_codes = []
+    location_lookup: Dict[str, int] = {}
+    experience_levels = []
+    preferred_job_types = []
+    latitudes = []
+    longitudes = []
+
+    for worker_id, worker_skills, mask, location, experience, job_types, latitude, longitude in rows:
+        worker_ids.append(worker_id)
+        skill_masks.append(mask)
+        other_skills.append(split_skills(worker_skills)[1])
+        location_codes.append(location_lookup.setdefault(location or '', len(location_lookup)))
+        experience_levels.append(EXPERIENCE_WEIGHTS.get(experience, 1))
+        preferred_job_types.append(job_types)
+        latitudes.append(np.nan if latitude is None or longitude is None else latitude)
+        longitudes.append(np.nan if latitude is None or longitude is None else longitude)
+
+    return WorkerFeatures(
+        worker_ids=np.asarray(worker_ids, dtype=np.int64),
+        skill_masks=np.asarray(skill_masks, dtype=np.int64),
+        other_skills=TokenMatrix(other_skills),
+        location_codes=np.asarray(location_codes, dtype=np.int64),
+        locations=list(location_lookup),
+        latitudes=np.asarray(latitudes, dtype=np.float64),
+        longitudes=np.asarray(longitudes, dtype=np.float64),
+        experience_levels=np.asarray(experience_levels, dtype=np.float64),
+        preferred_job_types=TokenMatrix(preferred_job_types),
+    )
+
+
+def features_from_workers(workers: Iterable) -> WorkerFeatures:
+    """Build WorkerFeatures from WorkerProfile instances"""
+    return build_worker_features(
+        tuple(getattr(worker, field) for field in WORKER_FEATURE_FIELDS)
+        for worker in workers
+    )
+
+
+def score_workers_for_job(job, worker_features: WorkerFeatures) -> np.ndarray:
+    """
+    Calculate match scores for every worker in worker_features against job.
+    Returns an array aligned with worker_features.worker_ids
+    """
+    score = np.zeros(len(worker_features), dtype=np.float64)
+    if not len(worker_features):
+        return score
+
+    score += batch_skills_match(worker_features, job.required_skills) * 0.4
+    score += batch_location_match(worker_features, job.location, location_point(job)) * 0.3
+    score += batch_experience_match(worker_features, job.job_type) * 0.2
+    score += batch_job_type_match(worker_features, job.job_type) * 0.1
+
+    return np.minimum(score, 1.0)
+
+
+def batch_skills_match(worker_features: WorkerFeatures, required_skills: List[str]) -> np.ndarray:
+    """
+    Vectorized calculate_skills_match: taxonomy skills overlap is a popcount
+    of the AND of skill masks, other skills are counted by token membership
+    """
+    required_mask, required_others = split_skills(required_skills)
+    required_count = bin(required_mask).count('1') + len(required_others)
+    if not required_count:
+        return np.zeros(len(worker_features), dtype=np.float64)
+
+    matches = popcount(worker_features.skill_masks & required_mask) + \
+        worker_features.other_skills.count_matches(required_others)
+    return matches / required_count
+
+
+def batch_location_match(worker_features: WorkerFeatures, job_location: str, job_point=None) -> np.ndarray:
+    """
+    Vectorized calculate_location_match. Resolved workers are scored by
+    distance; each distinct unresolved location string is compared once
+    and the result is broadcast to the workers holding it.
+    """
+    per_location = np.asarray(
+        [calculate_location_match(location, job_location) for location in worker_features.locations],
+        dtype=np.float64,
+    )
+    if not len(per_location):
+        return np.zeros(len(worker_features), dtype=np.float64)
+    scores = per_location[worker_features.location_codes]
+
+    if job_point is not None:
+        resolved = ~np.isnan(worker_features.latitudes)
+        dlat = (worker_features.latitudes[resolved] - job_point[0]) * KM_PER_DEGREE
+        dlon = (worker_features.longitudes[resolved] - job_point[1]) * longitude_scale(job_point[0])
+        squared_km = dlat * dlat + dlon * dlon
+        scores[resolved] = np.select(
+            [squared_km <= max_km * max_km for max_km, _ in DISTANCE_BANDS],
+            [score for _, score in DISTANCE_BANDS],
+            default=FAR_LOCATION_SCORE,
+        )
+    return scores
+
+
+def batch_experience_match(worker_features: WorkerFeatures, job_type: str) -> np.ndarray:
+    """Vectorized calculate_experience_match"""
+    worker_level = worker_features.experience_levels
+    required_level = JOB_TYPE_REQUIREMENTS.get(job_type, 2)
+
+    underqualified = np.maximum(0.3, worker_level / required_level)
+    return np.where(
+        worker_level == required_level,
+        1.0,
+        np.where(worker_level > required_level, 0.8, underqualified),
+    )
+
+
+def batch_job_type_match(worker_features: WorkerFeatures, job_type: str) -> np.ndarray:
+    """Vectorized calculate_job_type_match"""
+    preferred = worker_features.preferred_job_types
+    has_type = preferred.count_matches([job_type]) > 0
+    scores = np.where(has_type, 1.0, 0.3)
+    scores[preferred.lengths == 0] = 0.5
+    return scores
+
+
+# Scoring one worker against many jobs
+#
+# The mirror image of the helpers above, used to refresh a worker's
+# MatchScore row: jobs are the columns, and the results must equal
+# calculate_match_score for every job.
+
+@dataclass
+class JobFeatures:
+    """Column-oriented job attributes consumed by score_jobs_for_worker"""
+    job_ids: np.ndarray
+    skill_masks: np.ndarray
+    other_skills: TokenMatrix
+    required_counts: np.ndarray
+    location_codes: np.ndarray
+    locations: List[str]
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    longitude_scales: np.ndarray
+    required_levels: np.ndarray
+    job_type_codes: np.ndarray
+    job_types: List[str]
+
+    def __len__(self):
+        return len(self.job_ids)
+
+
+def build_job_features(rows: Iterable[Sequence]) -> JobFeatures:
+    """
+    Build JobFeatures from rows ordered like JOB_FEATURE_FIELDS,
+    e.g. JobPosting.objects.values_list(*JOB_FEATURE_FIELDS)
+    """
+    job_ids = []
+    skill_masks = []
+    other_skills = []
+    required_counts = []
+    location_codes = []
+    location_lookup: Dict[str, int] = {}
+    latitudes = []
+    longitudes = []
+    longitude_scales = []
+    required_levels = []
+    job_type_codes = []
+    job_type_lookup: Dict[str, int] = {}
+
+    for job_id, required_skills, location, job_type, latitude, longitude in rows:
+        mask, others = split_skills(required_skills)
+        job_ids.append(job_id)
+        skill_masks.append(mask)
+        other_skills.append(others)
+        required_counts.append(bin(mask).count('1') + len(others))
+        location_codes.append(location_lookup.setdefault(location or '', len(location_lookup)))
+        resolved = latitude is not None and longitude is not None
+        latitudes.append(latitude if resolved else np.nan)
+        longitudes.append(longitude if resolved else np.nan)
+        longitude_scales.append(longitude_scale(latitude) if resolved else np.nan)
+        required_levels.append(JOB_TYPE_REQUIREMENTS.get(job_type, 2))
+        job_type_codes.append(job_type_lookup.setdefault(job_type, len(job_type_lookup)))
+
+    return JobFeatures(
+        job_ids=np.asarray(job_ids, dtype=np.int64),
+        skill_masks=np.asarray(skill_masks, dtype=np.int64),
+        other_skills=TokenMatrix(other_skills),
+        required_counts=np.asarray(required_counts, dtype=np.int64),
+        location_codes=np.asarray(location_codes, dtype=np.int64),
+        locations=list(location_lookup),
+        latitudes=np.asarray(latitudes, dtype=np.float64),
+        longitudes=np.asarray(longitudes, dtype=np.float64),
+        longitude_scales=np.asarray(longitude_scales, dtype=np.float64),
+        required_levels=np.asarray(required_levels, dtype=np.float64),
+        job_type_codes=np.asarray(job_type_codes, dtype=np.int64),
+        job_types=list(job_type_lookup),
+    )
+
+
+def features_from_jobs(jobs: Iterable) -> JobFeatures:
+    """Build JobFeatures from JobPosting instances"""
+    return build_job_features(
+        tuple(getattr(job, field) for field in JOB_FEATURE_FIELDS)
+        for job in jobs
+    )
+
+
+def score_jobs_for_worker(worker, job_features: JobFeatures) -> np.ndarray:
+    """
+    Calculate match scores for worker against every job in job_features.
+    Returns an array aligned with job_features.job_ids
+    """
+    score = np.zeros(len(job_features), dtype=np.float64)
+    if not len(job_features):
+        return score
+
+    score += _jobs_skills_match(job_features, worker.skills) * 0.4
+    score += _jobs_location_match(job_features, worker.location, location_point(worker)) * 0.3
+    score += _jobs_experience_match(job_features, worker.experience_level) * 0.2
+    score += _jobs_job_type_match(job_features, worker.preferred_job_types) * 0.1
+
+    return np.minimum(score, 1.0)
+
+
+def _jobs_skills_match(job_features: JobFeatures, worker_skills: List[str]) -> np.ndarray:
+    worker_mask, worker_others = split_skills(worker_skills)
+    matches = popcount(job_features.skill_masks & worker_mask) + \
+        job_features.other_skills.count_matches(worker_others)
+    counts = job_features.required_counts
+    return np.divide(matches, counts, out=np.zeros(len(job_features), dtype=np.float64), where=counts > 0)
+
+
+def _jobs_location_match(job_features: JobFeatures, worker_location: str, worker_point=None) -> np.ndarray:
+    per_location = np.asarray(
+        [calculate_location_match(worker_location, location) for location in job_features.locations],
+        dtype=np.float64,
+    )
+    scores = per_location[job_features.location_codes]
+
+    if worker_point is not None:
+        resolved = ~np.isnan(job_features.latitudes)
+        dlat = (worker_point[0] - job_features.latitudes[resolved]) * KM_PER_DEGREE
+        dlon = (worker_point[1] - job_features.longitudes[resolved]) * job_features.longitude_scales[resolved]
+        squared_km = dlat * dlat + dlon * dlon
+        scores[resolved] = np.select(
+            [squared_km <= max_km * max_km for max_km, _ in DISTANCE_BANDS],
+            [score for _, score in DISTANCE_BANDS],
+            default=FAR_LOCATION_SCORE,
+        )
+    return scores
+
+
+def _jobs_experience_match(job_features: JobFeatures, worker_experience: str) -> np.ndarray:
+    worker_level = EXPERIENCE_WEIGHTS.get(worker_experience, 1)
+    required_level = job_features.required_levels
+
+    underqualified = np.maximum(0.3, worker_level / required_level)
+    return np.where(
+        worker_level == required_level,
+        1.0,
+        np.where(worker_level > required_level, 0.8, underqualified),
+    )
+
+
+def _jobs_job_type_match(job_features: JobFeatures, preferred_types: List[str]) -> np.ndarray:
+    per_type = np.asarray(
+        [calculate_job_type_match(preferred_types, job_type) for job_type in job_features.job_types],
+        dtype=np.float64,
+    )
+    return per_type[job_features.job_type_codes]
@@ -0,0 +1,134 @@
+from itertools import islice
+import numpy as np
+from django.conf import settings
+from .models import WorkerProfile, JobPosting, MatchScore
+from .matching import (
+    MATCH_THRESHOLD, JOB_FEATURE_FIELDS, WORKER_FEATURE_FIELDS, build_job_features, build_worker_features,
+    score_jobs_for_worker, score_workers_for_job
+)
+
+# Fields whose change can move a worker's or a job's scores
+WORKER_SCORING_FIELDS = {'skills', 'location', 'experience_level', 'preferred_job_types'}
+JOB_SCORING_FIELDS = {'required_skills', 'location', 'job_type', 'is_open'}
+
+
+def upsert_match_scores(scores):
+    """Insert or update MatchScore rows in one statement per batch"""
+    MatchScore.objects.bulk_create(
+        scores,
+        batch_size=settings.MATCH_SCAN_CHUNK_SIZE,
+        update_conflicts=True,
+        unique_fields=['worker', 'job'],
+        update_fields=['score', 'calculated_at']
+    )
+
+
+def top_matches(worker_ids, scores, limit=None):
+    """
+    The best limit (worker_ids, scores) above MATCH_THRESHOLD, best first with
+    ties broken by worker id, the order ranked_matches_for_job reads them in.
+    limit defaults to MATCH_RESULTS_MAX_LIMIT, the rows kept per job.
+    """
+    limit = settings.MATCH_RESULTS_MAX_LIMIT if limit is None else limit
+    above = np.flatnonzero(scores > MATCH_THRESHOLD)
+    best = above[np.lexsort((worker_ids[above], -scores[above]))[:limit]]
+    return worker_ids[best], scores[best]
+
+
+def materialize_job(job, chunk_size=None):
+    """
+    Recompute the MatchScore column for one job.
+    Closed jobs lose all their rows; open jobs keep their top
+    MATCH_RESULTS_MAX_LIMIT workers above MATCH_THRESHOLD.
+    """
+    if not job.is_open:
+        MatchScore.objects.filter(job=job).delete()
+        return
+
+    chunk_size = chunk_size or settings.MATCH_SCAN_CHUNK_SIZE
+    rows = WorkerProfile.objects.order_by('id').values_list(*WORKER_FEATURE_FIELDS).iterator(chunk_size=chunk_size)
+    worker_ids, scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+
+        features = build_worker_features(chunk)
+        worker_ids, scores = top_matches(
+            np.concatenate([worker_ids, features.worker_ids]),
+            np.concatenate([scores, score_workers_for_job(job, features)])
+        )
+
+    upsert_match_scores([
+        MatchScore(worker_id=worker_id, job_id=job.id, employer_id=job.employer_id, score=score)
+        for worker_id, score in zip(worker_ids.tolist(), scores.tolist())
+    ])
+    MatchScore.objects.filter(job=job).exclude(worker_id__in=worker_ids.tolist()).delete()
+
+
+def materialize_worker(worker, chunk_size=None):
+    """
+    Recompute one worker's scores against every open job, keeping each job's
+    column to its top MATCH_RESULTS_MAX_LIMIT. A worker entering a full column
+    evicts its weakest row; a job whose full column the worker drops within is
+    recomputed with materialize_job, as workers outside it may now rank higher.
+    """
+    limit = settings.MATCH_RESULTS_MAX_LIMIT
+    chunk_size = chunk_size or settings.MATCH_SCAN_CHUNK_SIZE
+    rows = JobPosting.objects.filter(is_open=True).order_by('id').values_list(
+        *JOB_FEATURE_FIELDS, 'employer_id'
+    ).iterator(chunk_size=chunk_size)
+
+    recompute = []
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+
+        features = build_job_features(row[:-1] for row in chunk)
+        scores = score_jobs_for_worker(worker, features)
+
+        # Stored rows ranked like top_matches: (score, -worker_id, row id)
+        columns = {}
+        for row_id, job_id, worker_id, score in MatchScore.objects.filter(
+            job_id__in=features.job_ids.tolist()
+        ).values_list('id', 'job_id', 'worker_id', 'score'):
+            columns.setdefault(job_id, []).append((score, -worker_id, row_id))
+
+        upserts, evicted = [], []
+        for (job_id, *_, employer_id), score in zip(chunk, scores.tolist()):
+            column = columns.get(job_id, [])
+            entry = (score, -worker.id)
+            own = next((rank[:2] for rank in column if rank[1] == -worker.id), None)
+            full = len(column) >= limit
+            if own is not None:
+                if full and entry < own:
+                    recompute.append(job_id)
+                    continue
+                if score <= MATCH_THRESHOLD:
+                    evicted.extend(rank[2] for rank in column if rank[1] == -worker.id)
+                    continue
+            elif score <= MATCH_THRESHOLD:
+                continue
+            elif full:
+                weakest = min(column)
+                if entry < weakest[:2]:
+                    continue
+                evicted.append(weakest[2])
+            upserts.append(MatchScore(worker_id=worker.id, job_id=job_id, employer_id=employer_id, score=score))
+
+        MatchScore.objects.filter(id__in=evicted).delete()
+        upsert_match_scores(upserts)
+
+    for job in JobPosting.objects.filter(id__in=recompute):
+        materialize_job(job, chunk_size)
+
+
+def ranked_matches_for_job(job, limit):
+    """Read the materialized top matches for a job as (score, worker_id) pairs"""
+    return [
+        (score, worker_id)
+        for score, worker_id in MatchScore.objects.filter(job=job).order_by(
+            '-score', 'worker_id'
+        ).values_list('score', 'worker_id')[:limit]
+    ]
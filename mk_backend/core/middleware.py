@@ -1,12 +1,25 @@
 import json
 import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
 from django.http import JsonResponse
 from django.core.exceptions import ValidationError
 from rest_framework.views import exception_handler
 from rest_framework import status
+from .db_router import REPLICA_PIN_COOKIE, routing_request
 
 logger = logging.getLogger(__name__)
 
+# Per-view totals since startup (or reset_request_stats)
+_request_stats = {}
+_request_stats_lock = threading.Lock()
+
+_MISSING = object()
+
 
 class ErrorHandlingMiddleware:
     def __init__(self, get_response):
@@ -43,6 +56,144 @@ class ErrorHandlingMiddleware:
         }, status=500)
 
 
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.in_get_many = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper counting and timing every query"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - started
+
+
+@contextmanager
+def _counting_cache_lookups(backend, metrics):
+    """
+    Count a cache backend's get/get_many hits and misses into metrics inside
+    the block, then restore its own methods. Cache backends are per thread,
+    so other requests and code outside the block never see the wrappers.
+    """
+    get, get_many = backend.get, backend.get_many
+
+    def counted_get(key, default=None, version=None, **kwargs):
+        value = get(key, _MISSING, version=version, **kwargs)
+        if not metrics.in_get_many:
+            if value is _MISSING:
+                metrics.cache_misses += 1
+            else:
+                metrics.cache_hits += 1
+        return default if value is _MISSING else value
+
+    def counted_get_many(keys, version=None, **kwargs):
+        keys = list(keys)
+        # BaseCache.get_many calls get() per key; count the keys once
+        metrics.in_get_many = True
+        try:
+            values = get_many(keys, version=version, **kwargs)
+        finally:
+            metrics.in_get_many = False
+        metrics.cache_hits += len(values)
+        metrics.cache_misses += len(keys) - len(values)
+        return values
+
+    shadowed = {name: backend.__dict__[name] for name in ('get', 'get_many') if name in backend.__dict__}
+    backend.get, backend.get_many = counted_get, counted_get_many
+    try:
+        yield
+    finally:
+        del backend.get, backend.get_many
+        for name, method in shadowed.items():
+            setattr(backend, name, method)
+
+
+def _record(view_name, metrics, wall_seconds):
+    with _request_stats_lock:
+        stats = _request_stats.setdefault(view_name, {
+            'requests': 0, 'queries': 0, 'max_queries': 0, 'db_ms': 0.0,
+            'cache_hits': 0, 'cache_misses': 0, 'wall_ms': 0.0, 'max_wall_ms': 0.0,
+        })
+        stats['requests'] += 1
+        stats['queries'] += metrics.queries
+        stats['max_queries'] = max(stats['max_queries'], metrics.queries)
+        stats['db_ms'] += metrics.db_seconds * 1000
+        stats['cache_hits'] += metrics.cache_hits
+        stats['cache_misses'] += metrics.cache_misses
+        stats['wall_ms'] += wall_seconds * 1000
+        stats['max_wall_ms'] = max(stats['max_wall_ms'], wall_seconds * 1000)
+
+
+def request_stats():
+    """Totals per view name: requests, queries, DB and wall time, cache hits and misses"""
+    with _request_stats_lock:
+        return {view_name: dict(stats) for view_name, stats in _request_stats.items()}
+
+
+def reset_request_stats():
+    with _request_stats_lock:
+        _request_stats.clear()
+
+
+class PerformanceMiddleware:
+    """
+    Records SQL queries, DB time, cache hits/misses and wall time of every
+    request under its view name (see request_stats). With
+    PERF_METRICS_HEADERS they are also sent as X-DB-Queries, X-DB-Time-Ms,
+    X-Cache-Hits, X-Cache-Misses and X-Response-Time-Ms headers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in settings.CACHES:
+                stack.enter_context(_counting_cache_lookups(caches[alias], metrics))
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics))
+            response = self.get_response(request)
+        wall_seconds = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        _record(match.view_name if match else 'unresolved', metrics, wall_seconds)
+        if settings.PERF_METRICS_HEADERS:
+            response['X-DB-Queries'] = str(metrics.queries)
+            response['X-DB-Time-Ms'] = f'{metrics.db_seconds * 1000:.2f}'
+            response['X-Cache-Hits'] = str(metrics.cache_hits)
+            response['X-Cache-Misses'] = str(metrics.cache_misses)
+            response['X-Response-Time-Ms'] = f'{wall_seconds * 1000:.2f}'
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Tracks each request's database writes for core.db_router. A client
+    whose request wrote gets a cookie keeping its reads on the primary for
+    REPLICA_PIN_SECONDS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with routing_request(pinned=REPLICA_PIN_COOKIE in request.COOKIES) as state:
+            response = self.get_response(request)
+        if state.wrote and settings.REPLICA_DATABASES:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax'
+            )
+        return response
+
+
 def custom_exception_handler(exc, context):
     """Custom DRF exception handler for consistent JSON responses"""
     
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def index_keys(skills):
+    return {skill.lower()[:100] for skill in skills or [] if isinstance(skill, str) and skill}
+
+
+def backfill_skill_index(apps, schema_editor):
+    WorkerProfile = apps.get_model('core', 'WorkerProfile')
+    JobPosting = apps.get_model('core', 'JobPosting')
+    WorkerSkill = apps.get_model('core', 'WorkerSkill')
+    JobSkill = apps.get_model('core', 'JobSkill')
+
+    WorkerSkill.objects.bulk_create(
+        [
+            WorkerSkill(skill=skill, worker_id=worker_id)
+            for worker_id, skills in WorkerProfile.objects.values_list('id', 'skills').iterator()
+            for skill in index_keys(skills)
+        ],
+        batch_size=5000
+    )
+    JobSkill.objects.bulk_create(
+        [
+            JobSkill(skill=skill, job_id=job_id)
+            for job_id, skills in JobPosting.objects.values_list('id', 'required_skills').iterator()
+            for skill in index_keys(skills)
+        ],
+        batch_size=5000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=100)),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_postings', to='core.workerprofile')),
+            ],
+            options={
+                'unique_together': {('skill', 'worker')},
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=100)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_postings', to='core.jobposting')),
+            ],
+            options={
+                'unique_together': {('skill', 'job')},
+            },
+        ),
+        migrations.RunPython(backfill_skill_index, migrations.RunPython.noop),
+    ]
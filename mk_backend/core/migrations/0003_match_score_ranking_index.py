@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_skill_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='matchscore',
+            index=models.Index(fields=['job', '-score', 'worker'], name='core_match_job_score_idx'),
+        ),
+    ]
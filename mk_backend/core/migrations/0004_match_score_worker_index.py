@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_match_score_ranking_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='matchscore',
+            index=models.Index(fields=['worker', '-score', 'job'], name='core_match_worker_score_idx'),
+        ),
+    ]
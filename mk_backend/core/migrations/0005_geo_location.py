@@ -0,0 +1,217 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:15
+
+from itertools import islice
+import math
+import re
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# core/data/kenya_places.json and the core.geo resolver as of this migration,
+# frozen so later gazetteer edits do not change what it does
+PLACES = {
+    'nairobi': (-1.2864, 36.8172),
+    'mombasa': (-4.0435, 39.6682),
+    'kisumu': (-0.0917, 34.768),
+    'nakuru': (-0.3031, 36.08),
+    'eldoret': (0.5143, 35.2698),
+    'thika': (-1.0333, 37.0693),
+    'malindi': (-3.2192, 40.1169),
+    'kitale': (1.0157, 35.0062),
+    'garissa': (-0.4532, 39.6461),
+    'kakamega': (0.2827, 34.7519),
+    'nyeri': (-0.4201, 36.9476),
+    'machakos': (-1.5177, 37.2634),
+    'meru': (0.047, 37.6498),
+    'kericho': (-0.3677, 35.2831),
+    'embu': (-0.531, 37.4506),
+    'naivasha': (-0.7167, 36.4333),
+    'kisii': (-0.6817, 34.7667),
+    'kitui': (-1.3667, 38.0167),
+    'lamu': (-2.2717, 40.902),
+    'nanyuki': (0.0167, 37.0667),
+    'ruiru': (-1.1466, 36.9609),
+    'kikuyu': (-1.2463, 36.6629),
+    'kiambu': (-1.1714, 36.8356),
+    'athi river': (-1.456, 36.978),
+    'kitengela': (-1.4734, 36.9599),
+    'ngong': (-1.3528, 36.6699),
+    'rongai': (-1.3962, 36.7437),
+    'juja': (-1.1011, 37.0144),
+    'limuru': (-1.1136, 36.6422),
+    'voi': (-3.3961, 38.5561),
+    'kilifi': (-3.6305, 39.8499),
+    'ukunda': (-4.2869, 39.5668),
+    'diani': (-4.28, 39.594),
+    'mtwapa': (-3.939, 39.746),
+    'bungoma': (0.5635, 34.5606),
+    'busia': (0.4608, 34.1115),
+    'homa bay': (-0.5273, 34.4571),
+    'migori': (-1.0634, 34.4731),
+    'bomet': (-0.7813, 35.3416),
+    'narok': (-1.0833, 35.8667),
+    'isiolo': (0.3546, 37.5822),
+    'marsabit': (2.3284, 37.9899),
+    'lodwar': (3.1191, 35.5973),
+    'wajir': (1.7471, 40.0573),
+    'mandera': (3.9366, 41.867),
+    'kabarnet': (0.4919, 35.743),
+    'kerugoya': (-0.4989, 37.2803),
+    'muranga': (-0.721, 37.1526),
+    'nyahururu': (0.038, 36.3636),
+    'siaya': (0.0612, 34.2881),
+    'vihiga': (0.0766, 34.7229),
+    'kapsabet': (0.2039, 35.105),
+    'webuye': (0.6077, 34.7694),
+    'mumias': (0.335, 34.4886),
+    'maralal': (1.0968, 36.698),
+    'kajiado': (-1.8524, 36.7768),
+    'namanga': (-2.5446, 36.7868),
+    'karatina': (-0.4833, 37.1333),
+    'chuka': (-0.3333, 37.65),
+    'molo': (-0.2486, 35.7325),
+    'gilgil': (-0.4983, 36.3231),
+    'awendo': (-0.9, 34.5333),
+    'kapenguria': (1.2389, 35.1119),
+    'iten': (0.6703, 35.5081),
+    'wote': (-1.7833, 37.6333),
+    'ol kalou': (-0.2667, 36.3833),
+    'nairobi cbd': (-1.2841, 36.8233),
+    'westlands': (-1.2676, 36.8108),
+    'parklands': (-1.261, 36.816),
+    'kilimani': (-1.2893, 36.7856),
+    'kileleshwa': (-1.2806, 36.7808),
+    'lavington': (-1.2766, 36.7687),
+    'upper hill': (-1.298, 36.813),
+    'karen': (-1.319, 36.7073),
+    'langata': (-1.3352, 36.755),
+    'kibera': (-1.3133, 36.787),
+    'south b': (-1.3093, 36.8372),
+    'south c': (-1.319, 36.8246),
+    'industrial area': (-1.307, 36.851),
+    'eastleigh': (-1.2735, 36.8498),
+    'ngara': (-1.273, 36.827),
+    'pangani': (-1.268, 36.838),
+    'mathare': (-1.26, 36.86),
+    'kariobangi': (-1.254, 36.884),
+    'dandora': (-1.25, 36.9),
+    'kasarani': (-1.2215, 36.8998),
+    'roysambu': (-1.2183, 36.8875),
+    'githurai': (-1.2017, 36.914),
+    'kahawa': (-1.185, 36.926),
+    'kahawa west': (-1.187, 36.893),
+    'embakasi': (-1.317, 36.8986),
+    'donholm': (-1.299, 36.89),
+    'buruburu': (-1.2867, 36.8752),
+    'umoja': (-1.2837, 36.8994),
+    'kayole': (-1.275, 36.917),
+    'utawala': (-1.285, 36.97),
+    'ruai': (-1.273, 36.992),
+    'kawangware': (-1.2833, 36.75),
+    'dagoretti': (-1.295, 36.738),
+    'ruaka': (-1.2083, 36.783),
+    'runda': (-1.217, 36.808),
+    'gigiri': (-1.233, 36.805),
+    'muthaiga': (-1.248, 36.833),
+    'syokimau': (-1.367, 36.93),
+    'mlolongo': (-1.389, 36.941),
+    'nyali': (-4.0333, 39.7167),
+    'bamburi': (-3.9969, 39.72),
+    'likoni': (-4.0833, 39.6667),
+    'changamwe': (-4.0254, 39.6303),
+    'kisauni': (-4.0166, 39.6833),
+    'mombasa island': (-4.0547, 39.6636),
+}
+
+ALIASES = {
+    'nbi': 'nairobi',
+    'nrb': 'nairobi',
+    'town': 'nairobi cbd',
+    'cbd': 'nairobi cbd',
+    'msa': 'mombasa',
+    'ksm': 'kisumu',
+    "lang'ata": 'langata',
+    'ongata rongai': 'rongai',
+    'mavoko': 'athi river',
+    "murang'a": 'muranga',
+    'buru buru': 'buruburu',
+    'kahawa sukari': 'kahawa',
+    'embakasi east': 'embakasi',
+    'old town': 'mombasa island',
+}
+
+GRID_CELL_DEGREES = 0.1
+GRID_COLUMNS = int(360 / GRID_CELL_DEGREES) + 1
+
+
+def resolve_location(location):
+    if not location:
+        return None
+    text = ' '.join(location.lower().split())
+    for candidate in [text] + [part.strip() for part in re.split(r'[,/;]', text)]:
+        name = ALIASES.get(candidate, candidate)
+        if name in PLACES:
+            return PLACES[name]
+    return None
+
+
+def grid_cell(point):
+    row = math.floor((point[0] + 90) / GRID_CELL_DEGREES)
+    column = math.floor((point[1] + 180) / GRID_CELL_DEGREES)
+    return row * GRID_COLUMNS + column
+
+
+def resolve_locations(apps, schema_editor):
+    for model_name in ('WorkerProfile', 'JobPosting'):
+        model = apps.get_model('core', model_name)
+        rows = model.objects.only('id', 'location').order_by('id').iterator(chunk_size=BATCH_SIZE)
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+            for instance in batch:
+                point = resolve_location(instance.location)
+                instance.latitude, instance.longitude = point if point else (None, None)
+                instance.geo_cell = grid_cell(point) if point else None
+            model.objects.bulk_update(batch, ['latitude', 'longitude', 'geo_cell'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_match_score_worker_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='geo_cell',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='workerprofile',
+            name='geo_cell',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='workerprofile',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='workerprofile',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(resolve_locations, migrations.RunPython.noop),
+    ]
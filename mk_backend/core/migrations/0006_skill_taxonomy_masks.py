@@ -0,0 +1,137 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:18
+
+from itertools import islice
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# core.skills as of this migration, frozen so later edits to the taxonomy do
+# not change what it does; remask_skills applies later appends
+SKILL_TAXONOMY = [
+    ('plumbing', ['plumber', 'fundi bomba']),
+    ('pipe fitting', ['pipe fitter', 'pipefitter', 'pipe installation']),
+    ('electrical', ['electrician', 'electrical work', 'fundi stima']),
+    ('wiring', ['electrical wiring', 'house wiring']),
+    ('carpentry', ['carpenter', 'joinery', 'joiner', 'fundi seremala']),
+    ('woodwork', ['woodworking', 'furniture making']),
+    ('masonry', ['mason', 'bricklaying', 'bricklayer', 'fundi mjengo']),
+    ('painting', ['painter', 'house painting']),
+    ('welding', ['welder', 'metal fabrication', 'fabrication']),
+    ('roofing', ['roofer']),
+    ('tiling', ['tiler', 'tile fixing']),
+    ('plastering', ['plasterer']),
+    ('steel fixing', ['steel fixer']),
+    ('construction', ['construction work', 'building']),
+    ('general labour', ['general labor', 'labourer', 'laborer', 'casual labour', 'kibarua']),
+    ('cleaning', ['cleaner', 'usafi']),
+    ('housekeeping', ['housekeeper', 'house help', 'domestic work', 'mama fua']),
+    ('laundry', ['dobi', 'washing clothes']),
+    ('cooking', ['cook', 'chef', 'mpishi']),
+    ('baking', ['baker']),
+    ('waitering', ['waiter', 'waitress', 'serving']),
+    ('bartending', ['bartender']),
+    ('hospitality', ['hotel work']),
+    ('childcare', ['nanny', 'ayah', 'babysitting']),
+    ('elderly care', ['caregiver', 'caregiving']),
+    ('driving', ['driver', 'dereva', 'chauffeur']),
+    ('delivery', ['courier', 'deliveries']),
+    ('boda boda', ['bodaboda', 'motorbike riding', 'motorcycle riding', 'rider']),
+    ('mechanics', ['mechanic', 'motor vehicle repair', 'fundi gari']),
+    ('security', ['security guard', 'guard', 'askari', 'watchman']),
+    ('night shift', ['night work']),
+    ('farming', ['farm work', 'farmhand', 'agriculture', 'kilimo']),
+    ('gardening', ['gardener', 'landscaping', 'shamba']),
+    ('tailoring', ['tailor', 'dressmaking', 'fundi cherehani']),
+    ('hairdressing', ['hairdresser', 'salon', 'braiding']),
+    ('barbering', ['barber', 'kinyozi']),
+    ('sales', ['salesperson', 'selling', 'retail sales']),
+    ('customer service', ['customer care']),
+    ('cashier', ['till operator']),
+    ('loading', ['loader', 'porter', 'offloading']),
+    ('packing', ['packer', 'packaging']),
+    ('warehouse', ['warehousing', 'storekeeping', 'storekeeper']),
+    ('forklift operation', ['forklift', 'forklift driver']),
+    ('machine operation', ['machine operator']),
+    ('data entry', ['data clerk']),
+    ('computer skills', ['computer literacy', 'ms office']),
+    ('bookkeeping', ['accounting', 'book keeping']),
+    ('first aid', []),
+    ('butchery', ['butcher']),
+    ('fishing', ['fisherman', 'uvuvi']),
+]
+
+
+def normalize_skill(skill):
+    return ' '.join(skill.lower().replace('_', ' ').replace('-', ' ').split())
+
+
+VOCABULARY = {
+    normalize_skill(term): (name, skill_id)
+    for skill_id, (name, synonyms) in enumerate(SKILL_TAXONOMY)
+    for term in [name] + synonyms
+}
+
+
+def split_skills(skills):
+    """(bitmask of taxonomy skills, canonical names of every skill)"""
+    mask = 0
+    canonical = set()
+    for skill in skills or []:
+        if not isinstance(skill, str):
+            continue
+        normalized = normalize_skill(skill)
+        entry = VOCABULARY.get(normalized)
+        if entry:
+            mask |= 1 << entry[1]
+            canonical.add(entry[0])
+        elif normalized:
+            canonical.add(normalized)
+    return mask, canonical
+
+
+def backfill_skill_masks(apps, schema_editor):
+    """Compute skill masks and re-key the skill index by canonical skill"""
+    for model_name, skills_field, index_name, owner_field in (
+        ('WorkerProfile', 'skills', 'WorkerSkill', 'worker_id'),
+        ('JobPosting', 'required_skills', 'JobSkill', 'job_id'),
+    ):
+        model = apps.get_model('core', model_name)
+        index = apps.get_model('core', index_name)
+        index.objects.all().delete()
+
+        rows = model.objects.only('id', skills_field).order_by('id').iterator(chunk_size=BATCH_SIZE)
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+
+            postings = []
+            for instance in batch:
+                instance.skill_mask, canonical = split_skills(getattr(instance, skills_field))
+                postings.extend(
+                    index(skill=skill, **{owner_field: instance.id})
+                    for skill in {skill[:100] for skill in canonical}
+                )
+            model.objects.bulk_update(batch, ['skill_mask'])
+            index.objects.bulk_create(postings)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_geo_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='skill_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='workerprofile',
+            name='skill_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_skill_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:39
+
+from django.db import migrations, models
+
+# location__icontains compiles to UPPER(location::text) LIKE UPPER('%...%') on
+# PostgreSQL, which only a trigram index can serve. SQLite has no such index;
+# the partial open-jobs index keeps its scans to open jobs in list order.
+LOCATION_TRIGRAM_INDEX = 'core_job_location_trgm_idx'
+
+
+def create_location_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        f'CREATE INDEX {LOCATION_TRIGRAM_INDEX} ON core_jobposting '
+        f'USING gin (UPPER(location::text) gin_trgm_ops) WHERE is_open'
+    )
+
+
+def drop_location_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {LOCATION_TRIGRAM_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_skill_taxonomy_masks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['worker', '-applied_at'], name='core_app_worker_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(condition=models.Q(('is_open', True)), fields=['-created_at'], name='core_job_open_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(condition=models.Q(('is_open', True)), fields=['pay_rate'], name='core_job_open_pay_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['employer', '-created_at'], name='core_job_employer_created_idx'),
+        ),
+        migrations.RunPython(create_location_trigram_index, drop_location_trigram_index),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:58
+
+from django.db import migrations
+from core.search import (
+    POSTGRES_CONFIGS, POSTGRES_SEARCH_COLUMN, POSTGRES_SEARCH_INDEX, SEARCH_FIELD_WEIGHTS,
+    SQLITE_SEARCH_TABLE, SQLITE_TOKENIZER
+)
+
+# The search document is maintained by the database itself - a generated
+# column on PostgreSQL, triggers on SQLite - so bulk inserts and raw
+# deletes keep it current too.
+
+
+def _postgres_document():
+    parts = []
+    for field, weight in SEARCH_FIELD_WEIGHTS:
+        for config in POSTGRES_CONFIGS:
+            parts.append(f"setweight(to_tsvector('{config}', coalesce({field}, '')), '{weight}')")
+    return ' || '.join(parts)
+
+
+def _sqlite_values(prefix):
+    return ', '.join(f'{prefix}.{field}' for field, _ in SEARCH_FIELD_WEIGHTS)
+
+
+def create_search_document(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    fields = ', '.join(field for field, _ in SEARCH_FIELD_WEIGHTS)
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f'ALTER TABLE core_jobposting ADD COLUMN {POSTGRES_SEARCH_COLUMN} tsvector '
+            f'GENERATED ALWAYS AS ({_postgres_document()}) STORED'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX {POSTGRES_SEARCH_INDEX} ON core_jobposting USING gin ({POSTGRES_SEARCH_COLUMN})'
+        )
+    elif vendor == 'sqlite':
+        table = SQLITE_SEARCH_TABLE
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {table} USING fts5({fields}, content='core_jobposting', "
+            f"content_rowid='id', tokenize='{SQLITE_TOKENIZER}')"
+        )
+        delete_old = (
+            f"INSERT INTO {table} ({table}, rowid, {fields}) VALUES ('delete', old.id, {_sqlite_values('old')});"
+        )
+        insert_new = f'INSERT INTO {table} (rowid, {fields}) VALUES (new.id, {_sqlite_values("new")});'
+        schema_editor.execute(
+            f'CREATE TRIGGER {table}_insert AFTER INSERT ON core_jobposting BEGIN {insert_new} END'
+        )
+        schema_editor.execute(
+            f'CREATE TRIGGER {table}_delete AFTER DELETE ON core_jobposting BEGIN {delete_old} END'
+        )
+        schema_editor.execute(
+            f'CREATE TRIGGER {table}_update AFTER UPDATE OF {fields} ON core_jobposting '
+            f'BEGIN {delete_old} {insert_new} END'
+        )
+        schema_editor.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+
+
+def drop_search_document(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {POSTGRES_SEARCH_INDEX}')
+        schema_editor.execute(f'ALTER TABLE core_jobposting DROP COLUMN IF EXISTS {POSTGRES_SEARCH_COLUMN}')
+    elif vendor == 'sqlite':
+        for suffix in ('insert', 'delete', 'update'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {SQLITE_SEARCH_TABLE}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SQLITE_SEARCH_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_document, drop_search_document),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:47
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_applications(apps, schema_editor):
+    JobPosting = apps.get_model('core', 'JobPosting')
+    Application = apps.get_model('core', 'Application')
+    applications = Application.objects.filter(job=OuterRef('pk')).order_by().values('job')
+    JobPosting.objects.update(applications_count=Coalesce(
+        Subquery(applications.annotate(count=Count('pk')).values('count')), 0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_job_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:20
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def copy_employers(apps, schema_editor):
+    JobPosting = apps.get_model('core', 'JobPosting')
+    employer = Subquery(JobPosting.objects.filter(pk=OuterRef('job_id')).values('employer_id'))
+    for model_name in ('Application', 'MatchScore'):
+        apps.get_model('core', model_name).objects.update(employer_id=employer)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_jobposting_applications_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='employer',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='core.employer'),
+        ),
+        migrations.AddField(
+            model_name='matchscore',
+            name='employer',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='match_scores', to='core.employer'),
+        ),
+        migrations.RunPython(copy_employers, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='application',
+            name='employer',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='core.employer'),
+        ),
+        migrations.AlterField(
+            model_name='matchscore',
+            name='employer',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='match_scores', to='core.employer'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['employer', '-applied_at'], name='core_app_employer_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='matchscore',
+            index=models.Index(fields=['employer', '-score'], name='core_match_employer_score_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_application_matchscore_employer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJobPosting',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=100)),
+                ('pay_rate', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('required_skills', models.JSONField(default=list)),
+                ('job_type', models.CharField(choices=[('full_time', 'Full Time'), ('part_time', 'Part Time'), ('contract', 'Contract'), ('temporary', 'Temporary')], max_length=20)),
+                ('applications_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_job_postings', to='core.employer')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
+                ('channel', models.CharField(choices=[('whatsapp', 'WhatsApp'), ('ussd', 'USSD'), ('web', 'Web')], max_length=20)),
+                ('applied_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('employer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to='core.employer')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='core.archivedjobposting')),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to='core.workerprofile')),
+            ],
+            options={
+                'ordering': ['-applied_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobposting',
+            index=models.Index(fields=['employer', '-created_at'], name='core_archjob_employer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedapplication',
+            index=models.Index(fields=['worker', '-applied_at'], name='core_archapp_worker_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedapplication',
+            index=models.Index(fields=['employer', '-applied_at'], name='core_archapp_employer_idx'),
+        ),
+    ]
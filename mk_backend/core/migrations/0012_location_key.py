@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:49
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def lowercase_locations(apps, schema_editor):
+    for model_name in ('WorkerProfile', 'JobPosting'):
+        model = apps.get_model('core', model_name)
+        batch = []
+        for instance in model.objects.only('id', 'location').iterator(chunk_size=BATCH_SIZE):
+            instance.location_key = (instance.location or '').lower()
+            batch.append(instance)
+            if len(batch) == BATCH_SIZE:
+                model.objects.bulk_update(batch, ['location_key'])
+                batch = []
+        model.objects.bulk_update(batch, ['location_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_archive_tables'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='location_key',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='workerprofile',
+            name='location_key',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(lowercase_locations, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,55 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
+from .geo import location_fields
+from .skills import skill_mask
 
 
-class WorkerProfile(models.Model):
+class GeoLocatedModel(models.Model):
+    """Coordinates and grid cell resolved from `location` with the bundled gazetteer on save"""
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    geo_cell = models.IntegerField(null=True, blank=True, editable=False, db_index=True)
+    # location lowercased by Python, for string comparisons the database's
+    # LIKE/LOWER would only fold for ASCII (SQLite)
+    location_key = models.TextField(blank=True, default='', editable=False)
+
+    class Meta:
+        abstract = True
+
+    def resolve_location(self):
+        for field, value in location_fields(self.location).items():
+            setattr(self, field, value)
+
+    def save(self, *args, **kwargs):
+        self.resolve_location()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'location' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'latitude', 'longitude', 'geo_cell', 'location_key'}
+        super().save(*args, **kwargs)
+
+
+class SkillMaskedModel(models.Model):
+    """Bitmask of taxonomy skills (core.skills) computed from SKILLS_FIELD on save"""
+    SKILLS_FIELD = 'skills'
+
+    skill_mask = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def resolve_skill_mask(self):
+        self.skill_mask = skill_mask(getattr(self, self.SKILLS_FIELD))
+
+    def save(self, *args, **kwargs):
+        self.resolve_skill_mask()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.SKILLS_FIELD in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'skill_mask'}
+        super().save(*args, **kwargs)
+
+
+class WorkerProfile(SkillMaskedModel, GeoLocatedModel):
     EXPERIENCE_CHOICES = [
         ('entry', 'Entry Level'),
         ('intermediate', 'Intermediate'),
@@ -56,7 +102,9 @@ class Employer(models.Model):
         return self.company_name
 
 
-class JobPosting(models.Model):
+class JobPosting(SkillMaskedModel, GeoLocatedModel):
+    SKILLS_FIELD = 'required_skills'
+
     JOB_TYPE_CHOICES = [
         ('full_time', 'Full Time'),
         ('part_time', 'Part Time'),
@@ -72,11 +120,34 @@ class JobPosting(models.Model):
     required_skills = models.JSONField(default=list)
     job_type = models.CharField(max_length=20, choices=JOB_TYPE_CHOICES, default='full_time')
     is_open = models.BooleanField(default=True)
+    # Maintained with F() updates by core.signals; reconcile_applications_count fixes drift
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # The public job list: open jobs, newest first, optionally by pay range
+            models.Index(fields=['-created_at'], name='core_job_open_created_idx', condition=models.Q(is_open=True)),
+            models.Index(fields=['pay_rate'], name='core_job_open_pay_idx', condition=models.Q(is_open=True)),
+            # An employer's own jobs
+            models.Index(fields=['employer', '-created_at'], name='core_job_employer_created_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets core.signals move the employer copies when a job changes employer
+        instance._loaded_employer_id = instance.__dict__.get('employer_id')
+        return instance
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # A full save never writes back a stale in-memory applications_count
+        # over concurrent increments; inserts still write it
+        if update_fields is None:
+            values = [value for value in values if value[0].name != 'applications_count']
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
 
     def __str__(self):
         return f"{self.title} - {self.employer.company_name}"
@@ -97,6 +168,8 @@ class Application(models.Model):
 
     job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='applications')
     worker = models.ForeignKey(WorkerProfile, on_delete=models.CASCADE, related_name='applications')
+    # Copy of job.employer, so employer listings read one index instead of joining jobs
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='applications', editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     channel = models.CharField(max_length=20, choices=CHANNEL_CHOICES, default='web')
     applied_at = models.DateTimeField(auto_now_add=True)
@@ -105,6 +178,24 @@ class Application(models.Model):
     class Meta:
         unique_together = ['job', 'worker']
         ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['worker', '-applied_at'], name='core_app_worker_applied_idx'),
+            models.Index(fields=['employer', '-applied_at'], name='core_app_employer_applied_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets core.signals move applications_count (and save() the employer) when an application changes job
+        instance._loaded_job_id = instance.__dict__.get('job_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.employer_id is None or self.job_id != getattr(self, '_loaded_job_id', self.job_id):
+            self.employer_id = self.job.employer_id
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'employer'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.worker.full_name} -> {self.job.title}"
@@ -113,12 +204,95 @@ class Application(models.Model):
 class MatchScore(models.Model):
     worker = models.ForeignKey(WorkerProfile, on_delete=models.CASCADE, related_name='match_scores')
     job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='match_scores')
+    # Copy of job.employer; bulk writers must set it
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='match_scores', editable=False)
     score = models.FloatField(validators=[MinValueValidator(0.0), MaxValueValidator(1.0)])
     calculated_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ['worker', 'job']
         ordering = ['-score']
+        indexes = [
+            models.Index(fields=['job', '-score', 'worker'], name='core_match_job_score_idx'),
+            models.Index(fields=['worker', '-score', 'job'], name='core_match_worker_score_idx'),
+            models.Index(fields=['employer', '-score'], name='core_match_employer_score_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.employer_id is None:
+            self.employer_id = self.job.employer_id
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.worker.full_name} -> {self.job.title}: {self.score:.2f}"
+
+
+class WorkerSkill(models.Model):
+    """Inverted index posting: skill -> worker. Maintained by core.signals"""
+    skill = models.CharField(max_length=100)
+    worker = models.ForeignKey(WorkerProfile, on_delete=models.CASCADE, related_name='skill_postings')
+
+    class Meta:
+        unique_together = ['skill', 'worker']
+
+    def __str__(self):
+        return f"{self.skill} -> {self.worker_id}"
+
+
+class JobSkill(models.Model):
+    """Inverted index posting: skill -> job. Maintained by core.signals"""
+    skill = models.CharField(max_length=100)
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='skill_postings')
+
+    class Meta:
+        unique_together = ['skill', 'job']
+
+    def __str__(self):
+        return f"{self.skill} -> {self.job_id}"
+
+
+class ArchivedJobPosting(models.Model):
+    """A closed job moved out of JobPosting by core.archival, with its original id"""
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=100)
+    description = models.TextField()
+    location = models.CharField(max_length=100)
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='archived_job_postings')
+    pay_rate = models.DecimalField(max_digits=10, decimal_places=2)
+    required_skills = models.JSONField(default=list)
+    job_type = models.CharField(max_length=20, choices=JobPosting.JOB_TYPE_CHOICES)
+    applications_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['employer', '-created_at'], name='core_archjob_employer_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} (archived)"
+
+
+class ArchivedApplication(models.Model):
+    """An application of an archived job, with its original id"""
+    id = models.BigIntegerField(primary_key=True)
+    job = models.ForeignKey(ArchivedJobPosting, on_delete=models.CASCADE, related_name='applications')
+    worker = models.ForeignKey(WorkerProfile, on_delete=models.CASCADE, related_name='archived_applications')
+    employer = models.ForeignKey(Employer, on_delete=models.CASCADE, related_name='archived_applications')
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    channel = models.CharField(max_length=20, choices=Application.CHANNEL_CHOICES)
+    applied_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['worker', '-applied_at'], name='core_archapp_worker_idx'),
+            models.Index(fields=['employer', '-applied_at'], name='core_archapp_employer_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.worker.full_name} -> {self.job.title}: {self.score:.2f}"
\ No newline at end of file
+        return f"{self.worker_id} -> {self.job.title} (archived)"
@@ -0,0 +1,147 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _cursor_value(value):
+    # Full precision, so the next page starts exactly after the last row
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+class KeysetCursorPagination(PageNumberPagination):
+    """
+    Page-number pagination that switches to keyset ("seek") pagination when
+    ?cursor= is given (empty for the first page), or unless ?page= is given
+    with KEYSET_PAGINATION. A keyset page is the rows after the previous
+    page's last (ordering values, pk), the primary key breaking ties, with
+    no COUNT(*) and no OFFSET, so every page costs the same.
+    """
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def use_keyset(self, request):
+        if self.cursor_query_param in request.query_params:
+            return True
+        return settings.KEYSET_PAGINATION and self.page_query_param not in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = self.use_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.ordering = self.get_ordering(queryset)
+        cursor = self.decode_cursor(request)
+        backwards = bool(cursor and cursor['backwards'])
+        if cursor:
+            queryset = queryset.filter(self.seek(cursor['position'], backwards))
+        ordering = [self.reverse(field) for field in self.ordering] if backwards else self.ordering
+
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if backwards:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not backwards else True
+        self.has_previous = has_more if backwards else cursor is not None
+        return rows
+
+    def get_ordering(self, queryset):
+        """The queryset's ordering, ending with the primary key"""
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        for field in ordering:
+            if not isinstance(field, str):
+                raise ImproperlyConfigured('KeysetCursorPagination needs orderings given as field names')
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            descending = bool(ordering) and ordering[0].startswith('-')
+            ordering.append('-pk' if descending else 'pk')
+        return ordering
+
+    def reverse(self, field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def seek(self, position, backwards):
+        """Rows after position in the ordering (before it, backwards)"""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            after = field.startswith('-') == backwards
+            condition |= equal & Q(**{f'{name}__{"gt" if after else "lt"}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def position(self, row):
+        return [_cursor_value(getattr(row, field.lstrip('-'))) for field in self.ordering]
+
+    def encode_cursor(self, row, backwards):
+        data = {'o': self.ordering, 'p': self.position(row), 'b': backwards}
+        token = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token.encode()))
+            position, backwards = data['p'], bool(data['b'])
+            valid = data['o'] == self.ordering and len(position) == len(self.ordering)
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            valid = False
+        if not valid:
+            # Garbled, or made for another ?ordering=
+            raise NotFound(self.invalid_cursor_message)
+        return {'position': position, 'backwards': backwards}
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], backwards=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, '')
+        return self.encode_cursor(self.page[0], backwards=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor from a next or previous link (empty for the first page); '
+                               'switches to keyset pagination without a count',
+                'schema': {'type': 'string'},
+            },
+        ]
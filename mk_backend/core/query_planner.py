@@ -0,0 +1,121 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Set
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+# Derives the joins a serializer needs from its declaration: dotted source=
+# paths and nested serializers become select_related (to-one) and
+# prefetch_related (to-many) lookups, and the columns read become only().
+# A field the planner cannot see through (a SerializerMethodField, a source
+# naming a property or method) keeps every column of its model.
+
+
+@dataclass
+class QueryPlan:
+    select_related: Set[str] = field(default_factory=set)
+    prefetch_related: List = field(default_factory=list)
+    only: Set[str] = field(default_factory=set)
+
+    def apply(self, queryset, defer=True):
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if defer:
+            queryset = queryset.only(*sorted(self.only))
+        return queryset
+
+
+def _join(prefix, name):
+    return f'{prefix}__{name}' if prefix else name
+
+
+def _model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _all_columns(model, prefix):
+    return {_join(prefix, model_field.name) for model_field in model._meta.concrete_fields}
+
+
+def _plan_source(plan, model, prefix, source_attrs, nested):
+    """Add the lookups for one serializer field reading source_attrs from model"""
+    for index, attr in enumerate(source_attrs):
+        model_field = _model_field(model, attr)
+        if model_field is None:
+            # A property or method: it may read any column
+            plan.only.update(_all_columns(model, prefix))
+            return
+        path = _join(prefix, attr)
+        last = index == len(source_attrs) - 1
+        if model_field.concrete:
+            plan.only.add(path)
+
+        if not model_field.is_relation:
+            return
+        if model_field.many_to_many or model_field.one_to_many:
+            related = model_field.related_model._default_manager.all()
+            if last and nested is not None:
+                related = plan_for_serializer(type(nested), model_field.related_model).apply(related, defer=False)
+            plan.prefetch_related.append(Prefetch(path, queryset=related))
+            return
+        if last and nested is None:
+            # Rendered as a primary key: the local column is enough
+            return
+        # Forward foreign key or one-to-one, or a reverse one-to-one
+        plan.select_related.add(path)
+        model = model_field.related_model
+        prefix = path
+
+    if nested is not None:
+        nested_plan = plan_for_serializer(type(nested), model)
+        plan.select_related.update(_join(prefix, lookup) for lookup in nested_plan.select_related)
+        plan.prefetch_related.extend(
+            Prefetch(_join(prefix, lookup.prefetch_through), queryset=lookup.queryset)
+            for lookup in nested_plan.prefetch_related
+        )
+        plan.only.update(_join(prefix, path) for path in nested_plan.only)
+
+
+@lru_cache(maxsize=None)
+def plan_for_serializer(serializer_class, model) -> QueryPlan:
+    """The QueryPlan serializing model instances with serializer_class needs"""
+    plan = QueryPlan()
+    for serializer_field in serializer_class().fields.values():
+        if serializer_field.write_only:
+            continue
+        nested = None
+        if isinstance(serializer_field, serializers.ListSerializer):
+            nested = serializer_field.child
+        elif isinstance(serializer_field, serializers.BaseSerializer):
+            nested = serializer_field
+
+        if serializer_field.source == '*':
+            if nested is not None:
+                _plan_source(plan, model, '', [], nested)
+            else:
+                # SerializerMethodField and friends get the whole instance
+                plan.only.update(_all_columns(model, ''))
+            continue
+        _plan_source(plan, model, '', serializer_field.source_attrs, nested)
+    return plan
+
+
+class QueryPlannerMixin:
+    """
+    Applies the serializer's QueryPlan to every queryset the view reads, so
+    a new related field in a serializer cannot add a query per row.
+    Columns are deferred for list and retrieve only; other actions may read
+    fields the serializer does not show.
+    """
+    deferred_actions = ('list', 'retrieve')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        plan = plan_for_serializer(self.get_serializer_class(), queryset.model)
+        return plan.apply(queryset, defer=self.action in self.deferred_actions)
@@ -0,0 +1,112 @@
+from itertools import islice
+from typing import List, Tuple
+import heapq
+import numpy as np
+from django.conf import settings
+from django.db.models import Q
+from .models import WorkerProfile
+from .geo import cells_within, location_score_beyond
+from .matching import (
+    MATCH_THRESHOLD, WORKER_FEATURE_FIELDS, build_worker_features,
+    location_point, score_workers_for_job
+)
+from .materialization import ranked_matches_for_job
+from .sql_scoring import sql_top_matches_for_job
+from .skill_index import candidate_worker_ids
+
+
+def max_score_without_skills(location_score=1.0):
+    """
+    Best score a worker with no skill overlap can reach: skills contribute 0,
+    location at most location_score, everything else 1.0 (same operation
+    order as the scorer).
+    """
+    return 0.0 + 0.0 * 0.4 + location_score * 0.3 + 1.0 * 0.2 + 1.0 * 0.1
+
+
+def rank_workers(job, workers, limit, chunk_size=None) -> List[Tuple[float, int]]:
+    """
+    Score a WorkerProfile queryset against job.
+    Returns up to limit (score, worker_id) pairs above MATCH_THRESHOLD,
+    best first, ties broken by worker id.
+
+    Workers are streamed in chunks of only the scoring columns and folded
+    into a bounded heap, so memory does not grow with the worker table.
+    """
+    chunk_size = chunk_size or settings.MATCH_SCAN_CHUNK_SIZE
+    rows = workers.order_by('id').values_list(*WORKER_FEATURE_FIELDS).iterator(chunk_size=chunk_size)
+
+    # Min-heap of (score, -worker_id): the root is the weakest kept match
+    heap = []
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+
+        features = build_worker_features(chunk)
+        scores = score_workers_for_job(job, features)
+        above = np.flatnonzero(scores > MATCH_THRESHOLD)
+        if len(above) > limit:
+            # Keep every worker tied with the chunk's k-th best score
+            kth = np.partition(scores[above], -limit)[-limit]
+            above = above[scores[above] >= kth]
+
+        for index in above:
+            entry = (float(scores[index]), -int(features.worker_ids[index]))
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    return [(score, -negative_id) for score, negative_id in sorted(heap, reverse=True)]
+
+
+def top_matches_for_job(job, limit=10) -> List[Tuple[float, int]]:
+    """
+    Top matching workers for a job as (score, worker_id) pairs.
+
+    With MATCH_BACKEND = 'materialized' the ranked MatchScore table is read,
+    with 'sql' the database scores and ranks the workers itself.
+    Otherwise scores are computed live, scanning workers in tiers:
+    first those sharing a skill with the job (skill index), then those
+    within MATCH_RADIUS_KM or with an unresolved location (grid index),
+    then everyone else. A tier is only scanned when the list is not yet
+    full of scores strictly above the best any remaining worker can reach.
+    Everyone else is ranked by the database (core.sql_scoring, same scores),
+    so only their best limit rows are loaded; the result equals a full scan.
+    """
+    if settings.MATCH_BACKEND == 'materialized':
+        return ranked_matches_for_job(job, limit)
+    if settings.MATCH_BACKEND == 'sql':
+        return sql_top_matches_for_job(job, limit)
+
+    tiers = []
+    if job.required_skills:
+        tiers.append((Q(id__in=candidate_worker_ids(job)), max_score_without_skills()))
+    point = location_point(job)
+    if point is not None:
+        radius = settings.MATCH_RADIUS_KM
+        nearby = Q(geo_cell__in=cells_within(point, radius)) | Q(geo_cell__isnull=True)
+        tiers.append((nearby, max_score_without_skills(location_score_beyond(radius))))
+
+    ranked = []
+    scanned = None
+    for condition, ceiling in tiers + [(None, None)]:
+        workers = WorkerProfile.objects.all()
+        if condition is not None:
+            workers = workers.filter(condition)
+        if scanned is not None:
+            workers = workers.exclude(scanned)
+
+        if condition is None:
+            ranked += sql_top_matches_for_job(job, limit, workers)
+        else:
+            ranked += rank_workers(job, workers, limit)
+        ranked.sort(key=lambda match: (-match[0], match[1]))
+        del ranked[limit:]
+
+        if ceiling is not None and len(ranked) == limit and ranked[-1][0] > ceiling:
+            break
+        if condition is not None:
+            scanned = condition if scanned is None else scanned | condition
+    return ranked
@@ -0,0 +1,67 @@
+from itertools import islice
+from typing import List, Optional, Tuple
+import heapq
+from django.conf import settings
+from django.db.models import Q
+from .models import JobPosting
+from .geo import cells_within, resolve_location
+from .matching import calculate_match_score, features_from_jobs, score_jobs_for_worker
+from .skill_index import candidate_job_ids
+
+
+def recommended_jobs_for_worker(worker, limit=5, location: Optional[str] = None) -> List[Tuple[float, JobPosting]]:
+    """
+    Best open jobs for a worker as (score, job) pairs, best first.
+    location narrows the search to jobs naming it or, for places in the
+    gazetteer, jobs in the grid cells around it.
+
+    Scores skill-overlapping jobs live: MatchScore only keeps each job's top
+    workers, so a worker's rows do not list every job they match. Remaining
+    slots are filled with the newest other open jobs so channels always have
+    something to show.
+    """
+    open_jobs = JobPosting.objects.filter(is_open=True)
+    if location:
+        in_location = Q(location__icontains=location)
+        point = resolve_location(location)
+        if point is not None:
+            in_location |= Q(geo_cell__in=cells_within(point, settings.JOB_SEARCH_RADIUS_KM))
+        open_jobs = open_jobs.filter(in_location)
+
+    recommended = live_recommendations(worker, open_jobs.select_related('employer'), limit)
+
+    if len(recommended) < limit:
+        others = open_jobs.select_related('employer').exclude(
+            id__in=[job.id for _, job in recommended]
+        )[:limit - len(recommended)]
+        recommended += [(calculate_match_score(worker, job), job) for job in others]
+    return recommended
+
+
+def live_recommendations(worker, open_jobs, limit) -> List[Tuple[float, JobPosting]]:
+    """
+    Score every open job sharing a skill with the worker (from the skill
+    index) and return the best limit, ties going to the newer job.
+
+    Candidates are streamed in chunks and scored in batch, only a heap of
+    limit jobs is kept, so the work grows with the worker's skill overlap.
+    """
+    chunk_size = settings.MATCH_SCAN_CHUNK_SIZE
+    candidates = open_jobs.filter(id__in=candidate_job_ids(worker)).order_by('id').iterator(chunk_size=chunk_size)
+
+    # Min-heap of (score, job_id, job); ids are unique so jobs are never compared
+    heap = []
+    while True:
+        chunk = list(islice(candidates, chunk_size))
+        if not chunk:
+            break
+
+        scores = score_jobs_for_worker(worker, features_from_jobs(chunk))
+        for score, job in zip(scores.tolist(), chunk):
+            entry = (score, job.id, job)
+            if len(heap) < limit:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    return [(score, job) for score, _, job in sorted(heap, reverse=True)]
@@ -0,0 +1,122 @@
+import re
+from typing import List
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Full-text search over job postings. Migration 0008 keeps a search document
+# per posting: a weighted tsvector column with a GIN index on PostgreSQL, an
+# FTS5 table on SQLite. English is stemmed (the english configuration, the
+# porter tokenizer); Swahili has no stemmer in either database, so words
+# are also kept as written and every term matches as a word prefix, which
+# covers suffixed forms ("mjenga" finds "mjengaji"). SQLite drops a table's
+# triggers when a migration remakes it, so they are recreated after migrate.
+
+# Document fields and their weight class, most important first
+SEARCH_FIELD_WEIGHTS = [('title', 'A'), ('description', 'B'), ('location', 'C')]
+
+POSTGRES_SEARCH_COLUMN = 'search_document'
+POSTGRES_SEARCH_INDEX = 'core_job_search_document_idx'
+# english stems English words; simple keeps every other word as written
+POSTGRES_CONFIGS = ('english', 'simple')
+
+SQLITE_SEARCH_TABLE = 'core_jobposting_fts'
+SQLITE_TOKENIZER = 'porter unicode61 remove_diacritics 2'
+# bm25 column weights for the A, B and C classes
+SQLITE_WEIGHTS = {'A': 10.0, 'B': 4.0, 'C': 2.0}
+
+# Longer queries are cut to their first terms
+MAX_SEARCH_TERMS = 10
+
+
+def sqlite_search_triggers(table='core_jobposting'):
+    """CREATE TRIGGER statements keeping the FTS5 table in step with the job table"""
+    fields = ', '.join(field for field, _ in SEARCH_FIELD_WEIGHTS)
+
+    def values(prefix):
+        return ', '.join(f'{prefix}.{field}' for field, _ in SEARCH_FIELD_WEIGHTS)
+    fts = SQLITE_SEARCH_TABLE
+    delete_old = f"INSERT INTO {fts} ({fts}, rowid, {fields}) VALUES ('delete', old.id, {values('old')});"
+    insert_new = f'INSERT INTO {fts} (rowid, {fields}) VALUES (new.id, {values("new")});'
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN {insert_new} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN {delete_old} END',
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {fields} ON {table} '
+        f'BEGIN {delete_old} {insert_new} END',
+    ]
+
+
+def ensure_sqlite_search_triggers(connection):
+    """
+    Recreate missing FTS5 triggers: SQLite migrations that alter the job table
+    rebuild it, which drops them (the index itself stays valid, ids are kept)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SQLITE_SEARCH_TABLE])
+        if cursor.fetchone() is None:
+            return
+        for statement in sqlite_search_triggers():
+            cursor.execute(statement)
+
+
+def restore_search_triggers(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """post_migrate receiver putting back FTS5 triggers dropped by a table remake"""
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        ensure_sqlite_search_triggers(connection)
+
+
+def search_terms(text) -> List[str]:
+    """Lowercased words of a search query, without punctuation"""
+    return re.findall(r'[^\W_]+', (text or '').lower())[:MAX_SEARCH_TERMS]
+
+
+def _postgres_search(queryset, terms):
+    table = queryset.model._meta.db_table
+    column = f'"{table}"."{POSTGRES_SEARCH_COLUMN}"'
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    query = ' || '.join(f"to_tsquery('{config}', %s)" for config in POSTGRES_CONFIGS)
+    params = [tsquery] * len(POSTGRES_CONFIGS)
+    return queryset.filter(
+        RawSQL(f'{column} @@ ({query})', params, output_field=BooleanField())
+    ).annotate(
+        search_rank=RawSQL(f'ts_rank_cd({column}, {query})', params, output_field=FloatField())
+    )
+
+
+def _sqlite_search(queryset, terms):
+    table = queryset.model._meta.db_table
+    match = ' '.join(f'"{term}"*' for term in terms)
+    weights = ', '.join(str(SQLITE_WEIGHTS[weight]) for _, weight in SEARCH_FIELD_WEIGHTS)
+    return queryset.filter(
+        id__in=RawSQL(f'SELECT rowid FROM {SQLITE_SEARCH_TABLE} WHERE {SQLITE_SEARCH_TABLE} MATCH %s', [match])
+    ).annotate(
+        # bm25 is lower for better matches
+        search_rank=RawSQL(
+            f'SELECT -bm25({SQLITE_SEARCH_TABLE}, {weights}) FROM {SQLITE_SEARCH_TABLE} '
+            f'WHERE {SQLITE_SEARCH_TABLE} MATCH %s AND rowid = "{table}"."id"',
+            [match], output_field=FloatField()
+        )
+    )
+
+
+def search_jobs(queryset, text):
+    """
+    Job postings matching every term of text (as a word or word prefix),
+    annotated with search_rank (higher is more relevant)
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return _postgres_search(queryset, terms)
+    if vendor == 'sqlite':
+        return _sqlite_search(queryset, terms)
+
+    # No search document on other databases
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(description__icontains=term) | Q(location__icontains=term)
+        )
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
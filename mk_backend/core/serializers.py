@@ -1,6 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import WorkerProfile, Employer, JobPosting, Application, MatchScore
+from .models import (
+    WorkerProfile, Employer, JobPosting, Application, MatchScore, ArchivedJobPosting, ArchivedApplication
+)
+
+# Columns derived from location and skills on save for matching; never part of the API
+INTERNAL_FIELDS = ['latitude', 'longitude', 'geo_cell', 'location_key', 'skill_mask']
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -14,7 +19,7 @@ class WorkerProfileSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = WorkerProfile
-        fields = '__all__'
+        exclude = INTERNAL_FIELDS
         read_only_fields = ['created_at', 'updated_at']
 
 
@@ -29,28 +34,24 @@ class EmployerSerializer(serializers.ModelSerializer):
 
 class JobPostingSerializer(serializers.ModelSerializer):
     employer_name = serializers.CharField(source='employer.company_name', read_only=True)
-    applications_count = serializers.SerializerMethodField()
     
     class Meta:
         model = JobPosting
-        fields = '__all__'
+        exclude = INTERNAL_FIELDS
         read_only_fields = ['created_at', 'updated_at']
-    
-    def get_applications_count(self, obj):
-        return obj.applications.count()
 
 
 class JobPostingCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobPosting
-        exclude = ['employer']
+        exclude = ['employer', *INTERNAL_FIELDS]
         read_only_fields = ['created_at', 'updated_at']
 
 
 class ApplicationSerializer(serializers.ModelSerializer):
     worker_name = serializers.CharField(source='worker.full_name', read_only=True)
     job_title = serializers.CharField(source='job.title', read_only=True)
-    employer_name = serializers.CharField(source='job.employer.company_name', read_only=True)
+    employer_name = serializers.CharField(source='employer.company_name', read_only=True)
     
     class Meta:
         model = Application
@@ -97,4 +98,19 @@ class MatchScoreSerializer(serializers.ModelSerializer):
     class Meta:
         model = MatchScore
         fields = '__all__'
-        read_only_fields = ['calculated_at']
\ No newline at end of file
+        read_only_fields = ['calculated_at']
+
+
+class ArchivedJobPostingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedJobPosting
+        fields = '__all__'
+
+
+class ArchivedApplicationSerializer(serializers.ModelSerializer):
+    worker_name = serializers.CharField(source='worker.full_name', read_only=True)
+    job_title = serializers.CharField(source='job.title', read_only=True)
+    
+    class Meta:
+        model = ArchivedApplication
+        fields = '__all__'
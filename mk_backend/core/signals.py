@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import WorkerProfile, Employer, JobPosting, Application, MatchScore
+from .counters import adjust_applications_count
+from .skill_index import sync_worker_skills, sync_job_skills
+from .materialization import (
+    WORKER_SCORING_FIELDS, JOB_SCORING_FIELDS, materialize_worker, materialize_job
+)
+from .match_cache import MATCH_CACHE_WORKER_FIELDS, bump_worker_set_version, bump_job_version
+
+
+def _affects_scores(update_fields, scoring_fields):
+    return update_fields is None or bool(scoring_fields & set(update_fields))
+
+
+@receiver(post_save, sender=WorkerProfile)
+def update_worker_skill_index(sender, instance, raw=False, **kwargs):
+    """Keep the skill -> worker index in sync (rows are removed by FK cascade on delete)"""
+    if not raw:
+        sync_worker_skills(instance)
+
+
+@receiver(post_save, sender=JobPosting)
+def update_job_skill_index(sender, instance, raw=False, **kwargs):
+    """Keep the skill -> job index in sync (rows are removed by FK cascade on delete)"""
+    if not raw:
+        sync_job_skills(instance)
+
+
+@receiver(post_save, sender=JobPosting)
+def update_copied_employer(sender, instance, raw=False, **kwargs):
+    """Keep Application.employer and MatchScore.employer equal to the job's employer"""
+    loaded_employer_id = getattr(instance, '_loaded_employer_id', None)
+    if not raw and loaded_employer_id is not None and loaded_employer_id != instance.employer_id:
+        for model in (Application, MatchScore):
+            model.objects.filter(job=instance).update(employer_id=instance.employer_id)
+    instance._loaded_employer_id = instance.employer_id
+
+
+@receiver(post_save, sender=WorkerProfile)
+def update_worker_match_scores(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Recompute the worker's MatchScore row once the save is committed"""
+    if raw or not settings.MATCH_SCORES_AUTO_UPDATE:
+        return
+    if _affects_scores(update_fields, WORKER_SCORING_FIELDS):
+        transaction.on_commit(lambda: materialize_worker(instance))
+
+
+@receiver(post_save, sender=JobPosting)
+def update_job_match_scores(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Recompute (or drop, once closed) the job's MatchScore column once the save is committed"""
+    if raw or not settings.MATCH_SCORES_AUTO_UPDATE:
+        return
+    if _affects_scores(update_fields, JOB_SCORING_FIELDS):
+        transaction.on_commit(lambda: materialize_job(instance))
+
+
+# Cache invalidation is registered after the MatchScore receivers so its
+# on_commit callbacks run once the materialized rows are up to date.
+
+@receiver(post_save, sender=WorkerProfile)
+@receiver(post_delete, sender=WorkerProfile)
+def invalidate_worker_matches(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Move every job_matches cache entry to a new worker-set version once committed"""
+    if not raw and _affects_scores(update_fields, MATCH_CACHE_WORKER_FIELDS):
+        transaction.on_commit(bump_worker_set_version)
+
+
+@receiver(post_save, sender=JobPosting)
+def invalidate_job_matches(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Move the job's job_matches cache entries to a new job version once committed"""
+    if not raw and _affects_scores(update_fields, JOB_SCORING_FIELDS):
+        transaction.on_commit(lambda: bump_job_version(instance.id))
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, raw=False, **kwargs):
+    """Keep JobPosting.applications_count in step with new (or moved) applications"""
+    if raw:
+        return
+    loaded_job_id = getattr(instance, '_loaded_job_id', None)
+    if created:
+        adjust_applications_count(instance.job_id, 1)
+    elif loaded_job_id is not None and loaded_job_id != instance.job_id:
+        adjust_applications_count(loaded_job_id, -1)
+        adjust_applications_count(instance.job_id, 1)
+    instance._loaded_job_id = instance.job_id
+
+
+def _deletes_jobs(origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, (JobPosting, Employer))
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, origin=None, **kwargs):
+    """Decrement the job's applications_count (also when a job's worker is deleted)"""
+    # Cascades from a job (or its employer) delete the job row too
+    if origin is None or not _deletes_jobs(origin):
+        adjust_applications_count(instance.job_id, -1)
@@ -0,0 +1,135 @@
+from itertools import islice
+from typing import Iterable, List, Tuple
+from django.db import transaction
+from django.db.models import Count
+from .models import WorkerProfile, JobPosting, WorkerSkill, JobSkill
+from .skills import canonical_skills, skill_mask
+
+SKILL_KEY_LENGTH = 100
+
+
+def index_keys(skills: Iterable[str]) -> List[str]:
+    """Canonical skill names stored in the index for a skills list"""
+    return sorted({skill[:SKILL_KEY_LENGTH] for skill in canonical_skills(skills)})
+
+
+def _sync_postings(model, owner_field, owner_id, skills):
+    keys = set(index_keys(skills))
+    postings = model.objects.filter(**{owner_field: owner_id})
+    existing = set(postings.values_list('skill', flat=True))
+
+    stale = existing - keys
+    if stale:
+        postings.filter(skill__in=stale).delete()
+
+    missing = keys - existing
+    if missing:
+        model.objects.bulk_create(
+            [model(skill=skill, **{owner_field: owner_id}) for skill in missing],
+            ignore_conflicts=True
+        )
+
+
+def sync_worker_skills(worker):
+    """Bring a worker's postings in line with worker.skills"""
+    _sync_postings(WorkerSkill, 'worker_id', worker.id, worker.skills)
+
+
+def sync_job_skills(job):
+    """Bring a job's postings in line with job.required_skills"""
+    _sync_postings(JobSkill, 'job_id', job.id, job.required_skills)
+
+
+def rebuild_skill_index(batch_size=5000):
+    """Rebuild both indexes from scratch, e.g. after bulk inserts"""
+    WorkerSkill.objects.all().delete()
+    JobSkill.objects.all().delete()
+
+    _bulk_index(
+        WorkerSkill, 'worker_id',
+        WorkerProfile.objects.values_list('id', 'skills'), batch_size
+    )
+    _bulk_index(
+        JobSkill, 'job_id',
+        JobPosting.objects.values_list('id', 'required_skills'), batch_size
+    )
+
+
+def _bulk_index(model, owner_field, rows, batch_size):
+    postings = []
+    for owner_id, skills in rows.iterator(chunk_size=batch_size):
+        postings.extend(model(skill=skill, **{owner_field: owner_id}) for skill in index_keys(skills))
+        if len(postings) >= batch_size:
+            model.objects.bulk_create(postings)
+            postings = []
+    if postings:
+        model.objects.bulk_create(postings)
+
+
+def remask_skills(batch_size=1000, dry_run=False) -> Tuple[int, int]:
+    """
+    Recompute skill masks and postings after SKILL_TAXONOMY gained skills or
+    synonyms. Only rows whose mask changed are rewritten, batch_size rows per
+    transaction. Returns the number of (workers, jobs) changed.
+    """
+    return (
+        _remask(WorkerProfile, 'skills', WorkerSkill, 'worker_id', batch_size, dry_run),
+        _remask(JobPosting, 'required_skills', JobSkill, 'job_id', batch_size, dry_run),
+    )
+
+
+def _remask(model, skills_field, index, owner_field, batch_size, dry_run):
+    changed = 0
+    rows = model.objects.order_by('id').values_list('id', skills_field, 'skill_mask').iterator(chunk_size=batch_size)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+
+        stale = [
+            (owner_id, skills, skill_mask(skills))
+            for owner_id, skills, mask in chunk
+            if skill_mask(skills) != mask
+        ]
+        changed += len(stale)
+        if dry_run or not stale:
+            continue
+
+        # A changed mask means some skill now has another canonical name
+        with transaction.atomic():
+            model.objects.bulk_update(
+                [model(id=owner_id, skill_mask=mask) for owner_id, _, mask in stale], ['skill_mask']
+            )
+            index.objects.filter(**{f'{owner_field}__in': [owner_id for owner_id, _, _ in stale]}).delete()
+            index.objects.bulk_create([
+                index(skill=skill, **{owner_field: owner_id})
+                for owner_id, skills, _ in stale
+                for skill in index_keys(skills)
+            ])
+    return changed
+
+
+def candidate_worker_ids(job):
+    """Ids of workers sharing at least one skill with the job (a subquery)"""
+    return WorkerSkill.objects.filter(
+        skill__in=index_keys(job.required_skills)
+    ).values('worker_id')
+
+
+def candidate_job_ids(worker):
+    """Ids of jobs requiring at least one of the worker's skills (a subquery)"""
+    return JobSkill.objects.filter(
+        skill__in=index_keys(worker.skills)
+    ).values('job_id')
+
+
+def jobs_with_skills(skills: Iterable[str], match_all=True):
+    """
+    Ids of jobs requiring every skill (match_all) or any of them, matched
+    exactly on canonical names (a subquery over the indexed postings)
+    """
+    keys = index_keys(skills)
+    postings = JobSkill.objects.filter(skill__in=keys)
+    if not match_all:
+        return postings.values('job_id')
+    return postings.values('job_id').annotate(matched=Count('id')).filter(matched=len(keys)).values('job_id')
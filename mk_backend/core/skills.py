@@ -0,0 +1,129 @@
+from functools import lru_cache
+from typing import Iterable, List, Set, Tuple
+import numpy as np
+
+# Canonical skill vocabulary. A skill's id is its position in this list and
+# its bit in skill_mask columns, so only ever append (at most 63 entries),
+# then run `manage.py remask_skills` to update the stored masks.
+SKILL_TAXONOMY = [
+    ('plumbing', ['plumber', 'fundi bomba']),
+    ('pipe fitting', ['pipe fitter', 'pipefitter', 'pipe installation']),
+    ('electrical', ['electrician', 'electrical work', 'fundi stima']),
+    ('wiring', ['electrical wiring', 'house wiring']),
+    ('carpentry', ['carpenter', 'joinery', 'joiner', 'fundi seremala']),
+    ('woodwork', ['woodworking', 'furniture making']),
+    ('masonry', ['mason', 'bricklaying', 'bricklayer', 'fundi mjengo']),
+    ('painting', ['painter', 'house painting']),
+    ('welding', ['welder', 'metal fabrication', 'fabrication']),
+    ('roofing', ['roofer']),
+    ('tiling', ['tiler', 'tile fixing']),
+    ('plastering', ['plasterer']),
+    ('steel fixing', ['steel fixer']),
+    ('construction', ['construction work', 'building']),
+    ('general labour', ['general labor', 'labourer', 'laborer', 'casual labour', 'kibarua']),
+    ('cleaning', ['cleaner', 'usafi']),
+    ('housekeeping', ['housekeeper', 'house help', 'domestic work', 'mama fua']),
+    ('laundry', ['dobi', 'washing clothes']),
+    ('cooking', ['cook', 'chef', 'mpishi']),
+    ('baking', ['baker']),
+    ('waitering', ['waiter', 'waitress', 'serving']),
+    ('bartending', ['bartender']),
+    ('hospitality', ['hotel work']),
+    ('childcare', ['nanny', 'ayah', 'babysitting']),
+    ('elderly care', ['caregiver', 'caregiving']),
+    ('driving', ['driver', 'dereva', 'chauffeur']),
+    ('delivery', ['courier', 'deliveries']),
+    ('boda boda', ['bodaboda', 'motorbike riding', 'motorcycle riding', 'rider']),
+    ('mechanics', ['mechanic', 'motor vehicle repair', 'fundi gari']),
+    ('security', ['security guard', 'guard', 'askari', 'watchman']),
+    ('night shift', ['night work']),
+    ('farming', ['farm work', 'farmhand', 'agriculture', 'kilimo']),
+    ('gardening', ['gardener', 'landscaping', 'shamba']),
+    ('tailoring', ['tailor', 'dressmaking', 'fundi cherehani']),
+    ('hairdressing', ['hairdresser', 'salon', 'braiding']),
+    ('barbering', ['barber', 'kinyozi']),
+    ('sales', ['salesperson', 'selling', 'retail sales']),
+    ('customer service', ['customer care']),
+    ('cashier', ['till operator']),
+    ('loading', ['loader', 'porter', 'offloading']),
+    ('packing', ['packer', 'packaging']),
+    ('warehouse', ['warehousing', 'storekeeping', 'storekeeper']),
+    ('forklift operation', ['forklift', 'forklift driver']),
+    ('machine operation', ['machine operator']),
+    ('data entry', ['data clerk']),
+    ('computer skills', ['computer literacy', 'ms office']),
+    ('bookkeeping', ['accounting', 'book keeping']),
+    ('first aid', []),
+    ('butchery', ['butcher']),
+    ('fishing', ['fisherman', 'uvuvi']),
+]
+
+MAX_SKILL_BITS = 63
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase, treat '_' and '-' as spaces and collapse whitespace"""
+    return ' '.join(skill.lower().replace('_', ' ').replace('-', ' ').split())
+
+
+@lru_cache(maxsize=1)
+def skill_vocabulary():
+    """Map of every canonical name and synonym to (canonical name, skill id)"""
+    if len(SKILL_TAXONOMY) > MAX_SKILL_BITS:
+        raise ValueError(f'SKILL_TAXONOMY holds more than {MAX_SKILL_BITS} skills')
+    vocabulary = {}
+    for skill_id, (name, synonyms) in enumerate(SKILL_TAXONOMY):
+        for term in [name] + synonyms:
+            vocabulary[normalize_skill(term)] = (name, skill_id)
+    return vocabulary
+
+
+def canonical_skill(skill: str) -> str:
+    """Canonical name for a skill; unknown skills are only normalized"""
+    normalized = normalize_skill(skill)
+    entry = skill_vocabulary().get(normalized)
+    return entry[0] if entry else normalized
+
+
+def canonical_skills(skills: Iterable[str]) -> Set[str]:
+    """Set of canonical names for a skills list, ignoring blanks"""
+    canonical = set()
+    for skill in skills or []:
+        if isinstance(skill, str):
+            name = canonical_skill(skill)
+            if name:
+                canonical.add(name)
+    return canonical
+
+
+def split_skills(skills: Iterable[str]) -> Tuple[int, List[str]]:
+    """(bitmask of taxonomy skills, sorted canonical names of other skills)"""
+    vocabulary = skill_vocabulary()
+    mask = 0
+    others = set()
+    for skill in skills or []:
+        if not isinstance(skill, str):
+            continue
+        normalized = normalize_skill(skill)
+        entry = vocabulary.get(normalized)
+        if entry:
+            mask |= 1 << entry[1]
+        elif normalized:
+            others.add(normalized)
+    return mask, sorted(others)
+
+
+def skill_mask(skills: Iterable[str]) -> int:
+    """Bitmask of the taxonomy skills in a skills list"""
+    return split_skills(skills)[0]
+
+
+_BYTE_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.int64)
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Number of set bits in each int64 mask"""
+    masks = np.ascontiguousarray(masks, dtype=np.int64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks).astype(np.int64)
+    return _BYTE_POPCOUNT[masks.view(np.uint8)].reshape(-1, 8).sum(axis=1)
@@ -0,0 +1,141 @@
+from typing import List, Tuple
+from django.db import connection
+from django.db.models import (
+    BooleanField, Case, Exists, F, FloatField, OuterRef, Q, Value, When
+)
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Least
+from django.db.models.lookups import Contains, GreaterThan, LessThanOrEqual
+from .models import WorkerProfile, WorkerSkill
+from .geo import DISTANCE_BANDS, FAR_LOCATION_SCORE, KM_PER_DEGREE, longitude_scale
+from .matching import (
+    EXPERIENCE_WEIGHTS, MATCH_THRESHOLD, calculate_experience_match, location_point
+)
+from .skills import split_skills
+
+# calculate_match_score as ORM expressions, so the database scores and ranks
+# workers (ORDER BY score DESC LIMIT k) without loading them. Every constant
+# is cast to double precision and the terms are combined in the scorer's
+# order, so SQLite and Postgres return the same floats as core.matching.
+
+
+def _float(value):
+    # Postgres would otherwise treat literals as exact numerics
+    return Cast(Value(value), output_field=FloatField())
+
+
+def skills_score_expression(required_skills):
+    """Share of the job's canonical skills held by the worker"""
+    required_mask, required_others = split_skills(required_skills)
+    bits = [1 << bit for bit in range(required_mask.bit_length()) if required_mask >> bit & 1]
+    required_count = len(bits) + len(required_others)
+    if not required_count:
+        return _float(0.0)
+
+    # Taxonomy skills are bits of skill_mask; other skills are looked up in
+    # the skill index, which is keyed by the same canonical names
+    held = [GreaterThan(F('skill_mask').bitand(bit), 0) for bit in bits]
+    held += [
+        Exists(WorkerSkill.objects.filter(worker=OuterRef('pk'), skill=skill[:100]))
+        for skill in required_others
+    ]
+    matches = None
+    for condition in held:
+        term = Case(When(condition, then=_float(1.0)), default=_float(0.0), output_field=FloatField())
+        matches = term if matches is None else matches + term
+    return matches / _float(float(required_count))
+
+
+def location_score_expression(job_location, job_point=None):
+    """Distance bands for resolved workers, string comparison for the rest"""
+    whens = []
+    if job_point is not None:
+        dlat = (F('latitude') - _float(job_point[0])) * _float(KM_PER_DEGREE)
+        dlon = (F('longitude') - _float(job_point[1])) * _float(longitude_scale(job_point[0]))
+        squared_km = dlat * dlat + dlon * dlon
+        distance_score = Case(
+            *[
+                When(LessThanOrEqual(squared_km, _float(max_km * max_km)), then=_float(score))
+                for max_km, score in DISTANCE_BANDS
+            ],
+            default=_float(FAR_LOCATION_SCORE),
+            output_field=FloatField(),
+        )
+        whens.append(When(
+            Q(latitude__isnull=False, longitude__isnull=False), then=distance_score
+        ))
+
+    if not job_location:
+        return Case(*whens, default=_float(0.5), output_field=FloatField())
+
+    # location_key holds str.lower() of the location, so case folding matches
+    # core.matching for non-ASCII names too (SQLite's LIKE only folds ASCII)
+    job_key = job_location.lower()
+    whens += [
+        When(Q(location_key=''), then=_float(0.5)),
+        When(Q(location_key=job_key), then=_float(1.0)),
+        When(Q(location_key__contains=job_key), then=_float(0.7)),
+        When(Contains(Value(job_key), F('location_key')), then=_float(0.7)),
+    ]
+    return Case(*whens, default=_float(0.3), output_field=FloatField())
+
+
+def experience_score_expression(job_type):
+    """Experience fit, precomputed per experience level for the job type"""
+    return Case(
+        *[
+            When(experience_level=level, then=_float(calculate_experience_match(level, job_type)))
+            for level in EXPERIENCE_WEIGHTS
+        ],
+        default=_float(calculate_experience_match(None, job_type)),
+        output_field=FloatField(),
+    )
+
+
+def _prefers_job_type(job_type):
+    if connection.vendor == 'postgresql':
+        return Q(preferred_job_types__contains=[job_type])
+    # SQLite has no JSON containment; look through the array with json_each
+    column = f'{connection.ops.quote_name(WorkerProfile._meta.db_table)}.{connection.ops.quote_name("preferred_job_types")}'
+    return RawSQL(
+        f'EXISTS (SELECT 1 FROM json_each({column}) WHERE json_each.value = %s)',
+        [job_type],
+        output_field=BooleanField(),
+    )
+
+
+def job_type_score_expression(job_type):
+    """Preference for the job type: 0.5 without preferences, else 1.0 or 0.3"""
+    return Case(
+        When(Q(preferred_job_types=[]), then=_float(0.5)),
+        When(_prefers_job_type(job_type), then=_float(1.0)),
+        default=_float(0.3),
+        output_field=FloatField(),
+    )
+
+
+def match_score_expression(job):
+    """calculate_match_score(worker, job) for every worker row"""
+    score = _float(0.0)
+    score = score + skills_score_expression(job.required_skills) * _float(0.4)
+    score = score + location_score_expression(job.location, location_point(job)) * _float(0.3)
+    score = score + experience_score_expression(job.job_type) * _float(0.2)
+    score = score + job_type_score_expression(job.job_type) * _float(0.1)
+    return Least(score, _float(1.0))
+
+
+def annotate_match_scores(workers, job):
+    """Annotate a WorkerProfile queryset with match_score for job"""
+    return workers.annotate(match_score=match_score_expression(job))
+
+
+def sql_top_matches_for_job(job, limit, workers=None) -> List[Tuple[float, int]]:
+    """
+    Top (score, worker_id) pairs above MATCH_THRESHOLD, ranked by the database.
+    workers narrows the candidates (a WorkerProfile queryset, default all).
+    """
+    workers = WorkerProfile.objects.all() if workers is None else workers
+    ranked = annotate_match_scores(workers, job).filter(
+        match_score__gt=MATCH_THRESHOLD
+    ).order_by('-match_score', 'id').values_list('match_score', 'id')[:limit]
+    return list(ranked)
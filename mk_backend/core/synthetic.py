@@ -0,0 +1,236 @@
+# Reproducible synthetic workers, employers and jobs for benchmarks and load
+# tests. Each generator draws from its own random.Random seeded with
+# (seed, kind), so the same seed and counts always give the same rows.
+# Instances come back unsaved with their derived fields (coordinates, grid
+# cell, skill mask) resolved, ready for bulk_create.
+
+from decimal import Decimal
+from functools import lru_cache
+from itertools import accumulate
+from typing import Iterator, List, Sequence, Tuple
+import bisect
+import json
+import random
+
+from django.contrib.auth.models import User
+from .geo import GAZETTEER_PATH, location_fields
+from .models import WorkerProfile, Employer, JobPosting, Application
+from .skills import SKILL_TAXONOMY
+
+# Synthetic rows are recognisable by these prefixes (no real Kenyan number starts +2540)
+WORKER_PHONE_PREFIX = '+2540'
+USERNAME_PREFIX = 'synthetic-employer-'
+
+# Workers per scale name; jobs are JOBS_PER_WORKER of that
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+JOBS_PER_WORKER = 0.05
+JOBS_PER_EMPLOYER = 5
+
+FIRST_NAMES = [
+    'John', 'Mary', 'Peter', 'Grace', 'James', 'Faith', 'Joseph', 'Mercy', 'David', 'Esther',
+    'Samuel', 'Ann', 'Daniel', 'Jane', 'Kevin', 'Lucy', 'Brian', 'Caroline', 'Dennis', 'Wanjiku',
+    'Otieno', 'Akinyi', 'Kamau', 'Njeri', 'Mwangi', 'Achieng', 'Kipchoge', 'Chebet', 'Mutua', 'Nafula',
+]
+LAST_NAMES = [
+    'Kamau', 'Otieno', 'Mwangi', 'Ochieng', 'Kariuki', 'Wanjala', 'Njoroge', 'Kiprop', 'Mutua', 'Omondi',
+    'Waweru', 'Cheruiyot', 'Onyango', 'Maina', 'Kimani', 'Wafula', 'Odhiambo', 'Korir', 'Nyambura', 'Barasa',
+]
+COMPANY_SUFFIXES = ['Builders', 'Contractors', 'Services', 'Enterprises', 'Logistics', 'Farms', 'Hotels', 'Ltd']
+
+# Skills workers list that are not in the taxonomy
+OTHER_SKILLS = [
+    'solar installation', 'phone repair', 'tuk tuk driving', 'beadwork', 'shoe repair',
+    'borehole drilling', 'sign writing', 'dj', 'photography', 'beekeeping',
+]
+
+# (value, weight) distributions
+EXPERIENCE_DISTRIBUTION = [('entry', 40), ('intermediate', 30), ('experienced', 20), ('expert', 10)]
+JOB_TYPE_DISTRIBUTION = [('temporary', 35), ('contract', 30), ('part_time', 15), ('full_time', 20)]
+LANGUAGE_DISTRIBUTION = [('en', 45), ('sw', 50), ('fr', 5)]
+SKILL_COUNT_DISTRIBUTION = [(1, 35), (2, 35), (3, 20), (4, 10)]
+REQUIRED_SKILL_COUNT_DISTRIBUTION = [(1, 50), (2, 35), (3, 15)]
+PREFERRED_TYPE_COUNT_DISTRIBUTION = [(0, 30), (1, 50), (2, 20)]
+APPLICATION_STATUS_DISTRIBUTION = [('pending', 70), ('accepted', 10), ('rejected', 20)]
+APPLICATION_CHANNEL_DISTRIBUTION = [('whatsapp', 55), ('ussd', 30), ('web', 15)]
+
+SYNONYM_RATE = 0.15
+OTHER_SKILL_RATE = 0.05
+UNRESOLVED_LOCATION_RATE = 0.05
+OPEN_JOB_RATE = 0.85
+PAY_RANGES = {
+    'temporary': (500, 1500),
+    'part_time': (800, 2500),
+    'contract': (1500, 5000),
+    'full_time': (15000, 60000),
+}
+
+
+class WeightedChoice:
+    """Draws values with fixed relative weights (bisect over cumulative weights)"""
+
+    def __init__(self, values: Sequence, weights: Sequence[float]):
+        self.values = list(values)
+        self.cumulative = list(accumulate(weights))
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        return cls([value for value, _ in pairs], [weight for _, weight in pairs])
+
+    @classmethod
+    def zipf(cls, values: Sequence, exponent=1.0):
+        """Popularity falling off with rank, like real skill and place demand"""
+        return cls(values, [1.0 / (rank ** exponent) for rank in range(1, len(values) + 1)])
+
+    def draw(self, rng: random.Random):
+        return self.values[bisect.bisect(self.cumulative, rng.random() * self.cumulative[-1])]
+
+    def sample(self, rng: random.Random, count: int) -> List:
+        """count distinct values"""
+        picked = []
+        while len(picked) < min(count, len(self.values)):
+            value = self.draw(rng)
+            if value not in picked:
+                picked.append(value)
+        return picked
+
+
+@lru_cache(maxsize=1)
+def _places() -> List[str]:
+    with open(GAZETTEER_PATH, encoding='utf-8') as f:
+        return list(json.load(f)['places'])
+
+
+@lru_cache(maxsize=None)
+def _location_fields(location):
+    return location_fields(location)
+
+
+def _rng(seed, kind):
+    return random.Random(f'{seed}:{kind}')
+
+
+class _Distributions:
+    def __init__(self, rng):
+        places = list(_places())
+        rng.shuffle(places)
+        self.places = WeightedChoice.zipf([place.title() for place in places], exponent=0.9)
+        self.skills = WeightedChoice.zipf([(name, synonyms) for name, synonyms in SKILL_TAXONOMY], exponent=1.1)
+        self.experience = WeightedChoice.from_pairs(EXPERIENCE_DISTRIBUTION)
+        self.job_types = WeightedChoice.from_pairs(JOB_TYPE_DISTRIBUTION)
+        self.languages = WeightedChoice.from_pairs(LANGUAGE_DISTRIBUTION)
+        self.skill_counts = WeightedChoice.from_pairs(SKILL_COUNT_DISTRIBUTION)
+        self.required_skill_counts = WeightedChoice.from_pairs(REQUIRED_SKILL_COUNT_DISTRIBUTION)
+        self.preferred_type_counts = WeightedChoice.from_pairs(PREFERRED_TYPE_COUNT_DISTRIBUTION)
+
+    def location(self, rng):
+        if rng.random() < UNRESOLVED_LOCATION_RATE:
+            return f'Kijiji {rng.randint(1, 500)}'
+        return self.places.draw(rng)
+
+    def skill_list(self, rng, count):
+        skills = []
+        for name, synonyms in self.skills.sample(rng, count):
+            skills.append(rng.choice(synonyms) if synonyms and rng.random() < SYNONYM_RATE else name)
+        if rng.random() < OTHER_SKILL_RATE:
+            skills.append(rng.choice(OTHER_SKILLS))
+        return skills
+
+
+def _resolve(instance):
+    for field, value in _location_fields(instance.location).items():
+        setattr(instance, field, value)
+    instance.resolve_skill_mask()
+    return instance
+
+
+def synthetic_workers(count: int, seed: int = 0) -> Iterator[WorkerProfile]:
+    """count unsaved workers; phone numbers are unique per index"""
+    rng = _rng(seed, 'workers')
+    dist = _Distributions(_rng(seed, 'distributions'))
+    for index in range(count):
+        preferred = dist.job_types.sample(rng, dist.preferred_type_counts.draw(rng))
+        yield _resolve(WorkerProfile(
+            full_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            phone_number=f'{WORKER_PHONE_PREFIX}{index:09d}',
+            location=dist.location(rng),
+            skills=dist.skill_list(rng, dist.skill_counts.draw(rng)),
+            experience_level=dist.experience.draw(rng),
+            language_preference=dist.languages.draw(rng),
+            preferred_job_types=preferred,
+        ))
+
+
+def synthetic_users(count: int, seed: int = 0) -> Iterator[User]:
+    """count unsaved employer accounts without usable passwords"""
+    for index in range(count):
+        user = User(username=f'{USERNAME_PREFIX}{seed}-{index}', email=f'employer{index}@example.com')
+        user.set_unusable_password()
+        yield user
+
+
+def synthetic_employers(user_ids: Sequence[int], seed: int = 0) -> Iterator[Employer]:
+    """One unsaved employer per user id"""
+    rng = _rng(seed, 'employers')
+    sectors = [sector for sector, _ in Employer.SECTOR_CHOICES]
+    for index, user_id in enumerate(user_ids):
+        yield Employer(
+            user_id=user_id,
+            company_name=f'{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_SUFFIXES)}',
+            email=f'employer{index}@example.com',
+            phone=f'+2541{index:08d}',
+            sector=rng.choice(sectors),
+            verified=rng.random() < 0.6,
+        )
+
+
+def synthetic_jobs(count: int, employer_ids: Sequence[int], seed: int = 0) -> Iterator[JobPosting]:
+    """count unsaved jobs spread over employer_ids"""
+    rng = _rng(seed, 'jobs')
+    dist = _Distributions(_rng(seed, 'distributions'))
+    for _ in range(count):
+        job_type = dist.job_types.draw(rng)
+        required_skills = dist.skill_list(rng, dist.required_skill_counts.draw(rng))
+        low, high = PAY_RANGES[job_type]
+        yield _resolve(JobPosting(
+            title=f'{required_skills[0].title()} needed',
+            description=f'Looking for help with {", ".join(required_skills)}.',
+            location=dist.location(rng),
+            employer_id=rng.choice(employer_ids),
+            pay_rate=Decimal(rng.randrange(low, high + 1, 50)),
+            required_skills=required_skills,
+            job_type=job_type,
+            is_open=rng.random() < OPEN_JOB_RATE,
+        ))
+
+
+def synthetic_applications(worker_ids: Sequence[int], jobs: Sequence[Tuple[int, int]],
+                           per_worker: float = 0.5, seed: int = 0) -> Iterator[Application]:
+    """
+    Unsaved applications averaging per_worker per worker, at most one per (worker, job).
+    jobs are (job id, employer id) pairs.
+    """
+    rng = _rng(seed, 'applications')
+    statuses = WeightedChoice.from_pairs(APPLICATION_STATUS_DISTRIBUTION)
+    channels = WeightedChoice.from_pairs(APPLICATION_CHANNEL_DISTRIBUTION)
+    whole, fraction = divmod(per_worker, 1)
+    for worker_id in worker_ids:
+        count = int(whole) + (rng.random() < fraction)
+        for job_id, employer_id in rng.sample(jobs, min(count, len(jobs))):
+            yield Application(
+                worker_id=worker_id,
+                job_id=job_id,
+                employer_id=employer_id,
+                status=statuses.draw(rng),
+                channel=channels.draw(rng),
+            )
+
+
+def scale_counts(scale: str):
+    """(workers, jobs, employers) for a scale name in SCALES"""
+    workers = SCALES[scale]
+    jobs = max(1, int(workers * JOBS_PER_WORKER))
+    return workers, jobs, max(1, jobs // JOBS_PER_EMPLOYER)
@@ -1,11 +1,57 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.management.sql import emit_post_migrate_signal
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from datetime import timedelta
+from io import StringIO
+from itertools import islice
+from unittest import mock, skipUnless
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
 from rest_framework.test import APITestCase, APIClient
-from rest_framework import status
+from rest_framework import status, serializers
 from rest_framework_simplejwt.tokens import RefreshToken
-from .models import WorkerProfile, Employer, JobPosting, Application, MatchScore
-from .matching import calculate_match_score
+from .models import (
+    WorkerProfile, Employer, JobPosting, Application, MatchScore, WorkerSkill, JobSkill,
+    ArchivedJobPosting, ArchivedApplication
+)
+from .matching import (
+    WORKER_FEATURE_FIELDS, build_worker_features, calculate_match_score, calculate_location_match,
+    features_from_jobs, features_from_workers, score_jobs_for_worker, score_workers_for_job
+)
+from .geo import resolve_location, cells_within, grid_cell, location_score_beyond, squared_distance_km
+from .ranking import max_score_without_skills, rank_workers, top_matches_for_job
+from .recommendations import recommended_jobs_for_worker
+from .sql_scoring import annotate_match_scores, sql_top_matches_for_job
+from .synthetic import synthetic_workers, synthetic_users, synthetic_employers, synthetic_jobs, scale_counts
+from .skills import skill_vocabulary
+from .management.commands.generate_load_data import COPY_NULL, copy_value
+from .skill_index import candidate_worker_ids, index_keys, jobs_with_skills
+from .search import SQLITE_SEARCH_TABLE, search_jobs, search_terms
+from .pagination import KeysetCursorPagination
+from .skills import SKILL_TAXONOMY, canonical_skills, skill_mask, popcount
+from .query_planner import plan_for_serializer
+from .middleware import request_stats, reset_request_stats
+from .archival import archive_closed_jobs
+from .job_import import csv_rows
+from .db_router import REPLICA_PIN_COOKIE, PrimaryReplicaRouter, replica_reads, routing_request
+from .urls import router
+from .serializers import ApplicationSerializer, JobPostingSerializer, UserSerializer
+from .materialization import materialize_job, materialize_worker
+from .match_cache import job_matches_cache_key, job_version_key, get_or_compute, _acquire
+import numpy as np
 
 
 class ModelTests(TestCase):
@@ -127,6 +173,2331 @@ class MatchingTests(TestCase):
         self.assertLess(score, 0.5)
 
 
+
+class BatchScoringTests(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        
+        worker_specs = [
+            ('Nairobi', ['plumbing', 'electrical'], 'intermediate', ['full_time', 'contract']),
+            ('nairobi', ['Plumbing', 'plumbing'], 'expert', []),
+            ('Westlands, Nairobi', ['carpentry'], 'entry', ['part_time']),
+            ('Mombasa', [], 'experienced', ['temporary']),
+            ('', ['ELECTRICAL', 'wiring'], 'unknown', ['full_time']),
+            ('Kisumu', ['cleaning', 'housekeeping'], 'experienced', ['part_time', 'contract']),
+        ]
+        self.workers = [
+            WorkerProfile.objects.create(
+                full_name=f'Worker {i}',
+                phone_number=f'+25470000000{i}',
+                location=location,
+                skills=skills,
+                experience_level=experience,
+                preferred_job_types=job_types
+            )
+            for i, (location, skills, experience, job_types) in enumerate(worker_specs)
+        ]
+        
+        job_specs = [
+            ('Nairobi', ['plumbing'], 'full_time'),
+            ('NAIROBI', ['plumbing', 'Electrical', 'plumbing'], 'contract'),
+            ('Nairobi', [], 'part_time'),
+            ('', ['carpentry', 'painting'], 'temporary'),
+            ('Mombasa', ['wiring'], 'seasonal'),
+        ]
+        self.jobs = [
+            JobPosting.objects.create(
+                title=f'Job {i}',
+                description='Batch scoring job',
+                location=location,
+                employer=self.employer,
+                pay_rate=2500.00,
+                required_skills=skills,
+                job_type=job_type
+            )
+            for i, (location, skills, job_type) in enumerate(job_specs)
+        ]
+        
+    def test_batch_scores_match_scalar_scores(self):
+        features = features_from_workers(self.workers)
+        for job in self.jobs:
+            scores = score_workers_for_job(job, features)
+            expected = [calculate_match_score(worker, job) for worker in self.workers]
+            self.assertEqual(scores.tolist(), expected)
+            
+    def test_batch_scores_empty_population(self):
+        features = features_from_workers([])
+        self.assertEqual(len(score_workers_for_job(self.jobs[0], features)), 0)
+        
+    def test_job_batch_scores_match_scalar_scores(self):
+        features = features_from_jobs(self.jobs)
+        for worker in self.workers:
+            scores = score_jobs_for_worker(worker, features)
+            expected = [calculate_match_score(worker, job) for job in self.jobs]
+            self.assertEqual(scores.tolist(), expected)
+        self.assertEqual(len(score_jobs_for_worker(self.workers[0], features_from_jobs([]))), 0)
+        
+    def test_matches_endpoint_ranks_by_batch_score(self):
+        client = APIClient()
+        client.force_authenticate(self.employer_user)
+        job = self.jobs[1]
+        
+        url = reverse('jobposting-matches', kwargs={'pk': job.id})
+        response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        expected = sorted(
+            (w for w in self.workers if calculate_match_score(w, job) > 0.3),
+            key=lambda w: calculate_match_score(w, job),
+            reverse=True
+        )[:10]
+        self.assertEqual([m['worker_id'] for m in response.data], [w.id for w in expected])
+        self.assertEqual(
+            [m['score'] for m in response.data],
+            [calculate_match_score(w, job) for w in expected]
+        )
+
+
+class SkillIndexTests(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        self.plumber = WorkerProfile.objects.create(
+            full_name='John Doe',
+            phone_number='+254700123456',
+            location='Nairobi',
+            skills=['Plumbing', 'electrical'],
+            experience_level='intermediate'
+        )
+        self.cook = WorkerProfile.objects.create(
+            full_name='Jane Cook',
+            phone_number='+254700123457',
+            location='Nairobi',
+            skills=['cooking'],
+            experience_level='experienced',
+            preferred_job_types=['full_time']
+        )
+        
+    def test_index_follows_worker_changes(self):
+        self.assertEqual(
+            set(WorkerSkill.objects.filter(worker=self.plumber).values_list('skill', flat=True)),
+            {'plumbing', 'electrical'}
+        )
+        
+        self.plumber.skills = ['plumbing', 'welding']
+        self.plumber.save()
+        self.assertEqual(
+            set(WorkerSkill.objects.filter(worker=self.plumber).values_list('skill', flat=True)),
+            {'plumbing', 'welding'}
+        )
+        
+        self.plumber.delete()
+        self.assertFalse(WorkerSkill.objects.filter(skill='plumbing').exists())
+        
+    def test_candidates_share_a_skill(self):
+        job = JobPosting.objects.create(
+            title='Plumber Job',
+            description='Need plumber',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=['PLUMBING']
+        )
+        self.assertEqual(set(JobSkill.objects.filter(job=job).values_list('skill', flat=True)), {'plumbing'})
+        self.assertEqual(
+            list(WorkerProfile.objects.filter(id__in=candidate_worker_ids(job)).values_list('id', flat=True)),
+            [self.plumber.id]
+        )
+        
+    def test_top_matches_equal_full_scan(self):
+        job = JobPosting.objects.create(
+            title='Plumber Job',
+            description='Need plumber',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=['plumbing'],
+            job_type='full_time'
+        )
+        workers = WorkerProfile.objects.order_by('id')
+        expected = sorted(
+            ((calculate_match_score(w, job), w.id) for w in workers if calculate_match_score(w, job) > 0.3),
+            key=lambda match: (-match[0], match[1])
+        )
+        # The cook shares no skill but still clears the threshold on location and experience
+        self.assertIn(self.cook.id, [worker_id for _, worker_id in expected])
+        self.assertEqual(top_matches_for_job(job, limit=10), expected)
+        self.assertEqual(top_matches_for_job(job, limit=1), expected[:1])
+        
+    def test_whatsapp_job_search_prefers_skill_overlap(self):
+        other = JobPosting.objects.create(
+            title='Cook Job',
+            description='Need cook',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2000.00,
+            required_skills=['cooking']
+        )
+        job = JobPosting.objects.create(
+            title='Electrician Job',
+            description='Need electrician',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=3000.00,
+            required_skills=['electrical']
+        )
+        response = APIClient().post(reverse('whatsapp_webhook'), {
+            'From': f'whatsapp:{self.plumber.phone_number}',
+            'Body': 'jobs nairobi'
+        }, format='json')
+        lines = response.data['message'].splitlines()
+        self.assertTrue(lines[1].startswith(f'{job.id}:'))
+        self.assertTrue(lines[2].startswith(f'{other.id}:'))
+
+
+class TopKSelectionTests(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        locations = ['Nairobi', 'Mombasa', 'Kisumu']
+        levels = ['entry', 'intermediate', 'experienced', 'expert']
+        skill_sets = [['plumbing'], ['plumbing', 'welding'], ['cooking'], []]
+        for i in range(24):
+            WorkerProfile.objects.create(
+                full_name=f'Worker {i}',
+                phone_number=f'+2547001000{i:02d}',
+                location=locations[i % 3],
+                skills=skill_sets[i % 4],
+                experience_level=levels[i % 4]
+            )
+        self.job = JobPosting.objects.create(
+            title='Plumber Job',
+            description='Need plumber',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=['plumbing', 'welding'],
+            job_type='contract'
+        )
+        self.expected = sorted(
+            (
+                (calculate_match_score(w, self.job), w.id)
+                for w in WorkerProfile.objects.all()
+                if calculate_match_score(w, self.job) > 0.3
+            ),
+            key=lambda match: (-match[0], match[1])
+        )
+        
+    def test_streamed_top_k_equals_full_sort(self):
+        for chunk_size in (1, 5, 7, 100):
+            for limit in (1, 3, 10, 50):
+                self.assertEqual(
+                    rank_workers(self.job, WorkerProfile.objects.all(), limit, chunk_size=chunk_size),
+                    self.expected[:limit]
+                )
+                
+    def test_fallback_is_ranked_by_score(self):
+        job = JobPosting.objects.create(
+            title='Mason Job',
+            description='Need mason',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=['masonry'],
+            job_type='contract'
+        )
+        # Far from the job, sharing no skill, but the best fit otherwise and the newest ids
+        far = [
+            WorkerProfile.objects.create(
+                full_name=f'Far Worker {i}',
+                phone_number=f'+2547001100{i:02d}',
+                location='Mombasa',
+                skills=['cooking'],
+                experience_level='expert',
+                preferred_job_types=['contract']
+            )
+            for i in range(2)
+        ]
+        expected = sorted(
+            (
+                (calculate_match_score(w, job), w.id)
+                for w in WorkerProfile.objects.all()
+                if calculate_match_score(w, job) > 0.3
+            ),
+            key=lambda match: (-match[0], match[1])
+        )
+        ceiling = max_score_without_skills(location_score_beyond(settings.MATCH_RADIUS_KM))
+        self.assertLessEqual(calculate_match_score(far[0], job), ceiling)
+        
+        with CaptureQueriesContext(connection) as queries:
+            ranked = top_matches_for_job(job, limit=10)
+        self.assertEqual(ranked, expected[:10])
+        self.assertTrue({worker.id for worker in far} <= {worker_id for _, worker_id in ranked})
+        # The database ranks the remaining workers and returns only the best rows
+        self.assertIn('LIMIT 10', queries[-1]['sql'])
+        
+    @override_settings(MATCH_RESULTS_MAX_LIMIT=5)
+    def test_matches_limit_is_capped(self):
+        client = APIClient()
+        client.force_authenticate(self.employer_user)
+        url = reverse('jobposting-matches', kwargs={'pk': self.job.id})
+        
+        response = client.get(f'{url}?limit=3')
+        self.assertEqual([m['worker_id'] for m in response.data], [w for _, w in self.expected[:3]])
+        
+        response = client.get(f'{url}?limit=500')
+        self.assertEqual(len(response.data), 5)
+        
+        response = client.get(f'{url}?limit=many')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(MATCH_SCORES_AUTO_UPDATE=True)
+class MatchScoreMaterializationTests(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plumbing_job = JobPosting.objects.create(
+                title='Plumber Job',
+                description='Need plumber',
+                location='Nairobi',
+                employer=self.employer,
+                pay_rate=2500.00,
+                required_skills=['plumbing'],
+                job_type='part_time'
+            )
+            self.cooking_job = JobPosting.objects.create(
+                title='Cook Job',
+                description='Need cook',
+                location='Mombasa',
+                employer=self.employer,
+                pay_rate=2000.00,
+                required_skills=['cooking'],
+                job_type='temporary'
+            )
+            self.worker = WorkerProfile.objects.create(
+                full_name='John Doe',
+                phone_number='+254700123456',
+                location='Nairobi',
+                skills=['plumbing'],
+                experience_level='intermediate',
+                preferred_job_types=['part_time']
+            )
+            
+    def stored_scores(self):
+        return dict(MatchScore.objects.filter(worker=self.worker).values_list('job_id', 'score'))
+        
+    def expected_scores(self, worker):
+        scores = {}
+        for job in JobPosting.objects.filter(is_open=True):
+            score = calculate_match_score(worker, job)
+            if score > 0.3:
+                scores[job.id] = score
+        return scores
+        
+    def test_new_worker_gets_a_row(self):
+        self.assertEqual(self.stored_scores(), self.expected_scores(self.worker))
+        self.assertIn(self.plumbing_job.id, self.stored_scores())
+        
+    def test_worker_change_recomputes_row(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.worker.skills = ['cooking']
+            self.worker.location = 'Mombasa'
+            self.worker.experience_level = 'entry'
+            self.worker.save()
+        self.assertEqual(self.stored_scores(), self.expected_scores(self.worker))
+        
+    def test_job_change_recomputes_column(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cooking_job.required_skills = ['plumbing']
+            self.cooking_job.location = 'Nairobi'
+            self.cooking_job.save()
+        self.assertEqual(
+            MatchScore.objects.get(worker=self.worker, job=self.cooking_job).score,
+            calculate_match_score(self.worker, self.cooking_job)
+        )
+        
+    def stored_column(self, job):
+        return list(MatchScore.objects.filter(job=job).order_by('-score', 'worker_id').values_list('score', 'worker_id'))
+        
+    def expected_column(self, job, limit):
+        return sorted(
+            (
+                (calculate_match_score(w, job), w.id)
+                for w in WorkerProfile.objects.all()
+                if calculate_match_score(w, job) > 0.3
+            ),
+            key=lambda match: (-match[0], match[1])
+        )[:limit]
+        
+    @override_settings(MATCH_RESULTS_MAX_LIMIT=2)
+    def test_job_column_keeps_top_k(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i, (skills, location) in enumerate([
+                (['plumbing'], 'Nairobi'), (['cooking'], 'Nairobi'), (['plumbing'], 'Mombasa')
+            ]):
+                WorkerProfile.objects.create(
+                    full_name=f'Worker {i}',
+                    phone_number=f'+2547003000{i:02d}',
+                    location=location,
+                    skills=skills,
+                    experience_level='intermediate'
+                )
+        expected = self.expected_column(self.plumbing_job, 2)
+        self.assertEqual(self.stored_column(self.plumbing_job), expected)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plumbing_job.location = 'Mombasa'
+            self.plumbing_job.save()
+        self.assertEqual(self.stored_column(self.plumbing_job), self.expected_column(self.plumbing_job, 2))
+        
+    @override_settings(MATCH_RESULTS_MAX_LIMIT=2)
+    def test_worker_changes_keep_columns_exact(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            others = [
+                WorkerProfile.objects.create(
+                    full_name=f'Worker {i}',
+                    phone_number=f'+2547003000{i:02d}',
+                    location='Nairobi',
+                    skills=['plumbing'],
+                    experience_level=level
+                )
+                for i, level in enumerate(['entry', 'experienced'])
+            ]
+        self.assertEqual(self.stored_column(self.plumbing_job), self.expected_column(self.plumbing_job, 2))
+        
+        # Dropping within a full column lets a worker outside it back in
+        for worker, skills in ((self.worker, ['cooking']), (others[0], ['plumbing', 'welding']), (self.worker, ['plumbing'])):
+            with self.captureOnCommitCallbacks(execute=True):
+                worker.skills = skills
+                worker.save()
+            for job in (self.plumbing_job, self.cooking_job):
+                self.assertEqual(self.stored_column(job), self.expected_column(job, 2))
+        
+    def test_closed_job_is_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plumbing_job.is_open = False
+            self.plumbing_job.save()
+        self.assertFalse(MatchScore.objects.filter(job=self.plumbing_job).exists())
+        
+    def test_unrelated_update_skips_recompute(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.worker.language_preference = 'sw'
+            self.worker.save(update_fields=['language_preference'])
+        self.assertEqual(callbacks, [])
+        
+    @override_settings(MATCH_BACKEND='materialized')
+    def test_matches_endpoint_reads_materialized_table(self):
+        client = APIClient()
+        client.force_authenticate(self.employer_user)
+        url = reverse('jobposting-matches', kwargs={'pk': self.plumbing_job.id})
+        response = client.get(url)
+        self.assertEqual(response.data, [{
+            'worker_id': self.worker.id,
+            'worker_name': self.worker.full_name,
+            'score': calculate_match_score(self.worker, self.plumbing_job),
+            'phone': self.worker.phone_number
+        }])
+
+
+@override_settings(MATCH_SCORES_AUTO_UPDATE=False)
+class RebuildMatchScoresTests(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        for i, skills in enumerate([['plumbing'], ['cooking'], ['plumbing', 'welding'], []]):
+            WorkerProfile.objects.create(
+                full_name=f'Worker {i}',
+                phone_number=f'+25470020000{i}',
+                location='Nairobi' if i % 2 else 'Mombasa',
+                skills=skills,
+                experience_level='experienced'
+            )
+        self.open_job = JobPosting.objects.create(
+            title='Plumber Job',
+            description='Need plumber',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=['plumbing', 'welding'],
+            job_type='contract'
+        )
+        self.closed_job = JobPosting.objects.create(
+            title='Old Job',
+            description='Filled',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=['plumbing'],
+            is_open=False
+        )
+        
+    def test_rebuild_scores_open_jobs_and_drops_stale_rows(self):
+        worker = WorkerProfile.objects.first()
+        MatchScore.objects.create(worker=worker, job=self.closed_job, score=0.9)
+        stale_worker = WorkerProfile.objects.get(skills=[])
+        MatchScore.objects.create(worker=stale_worker, job=self.open_job, score=0.99)
+        
+        out = StringIO()
+        call_command('rebuild_match_scores', workers=1, chunk_size=3, stdout=out)
+        self.assertIn('Rebuilt match scores', out.getvalue())
+        
+        expected = {
+            (w.id, self.open_job.id): calculate_match_score(w, self.open_job)
+            for w in WorkerProfile.objects.all()
+            if calculate_match_score(w, self.open_job) > 0.3
+        }
+        stored = {
+            (worker_id, job_id): score
+            for worker_id, job_id, score in MatchScore.objects.values_list('worker_id', 'job_id', 'score')
+        }
+        self.assertEqual(stored, expected)
+        
+    @override_settings(MATCH_RESULTS_MAX_LIMIT=2)
+    def test_rebuild_keeps_each_jobs_top_matches(self):
+        expected = sorted(
+            (
+                (calculate_match_score(w, self.open_job), w.id)
+                for w in WorkerProfile.objects.all()
+                if calculate_match_score(w, self.open_job) > 0.3
+            ),
+            key=lambda match: (-match[0], match[1])
+        )
+        self.assertGreater(len(expected), 2)
+        
+        # One worker per shard: the cap has to hold across shards
+        call_command('rebuild_match_scores', workers=1, chunk_size=1, stdout=StringIO())
+        stored = MatchScore.objects.filter(job=self.open_job).order_by('-score', 'worker_id')
+        self.assertEqual(list(stored.values_list('score', 'worker_id')), expected[:2])
+
+
+@override_settings(MATCH_SCORES_AUTO_UPDATE=True)
+class RecommendedJobsTests(APITestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.worker = WorkerProfile.objects.create(
+                full_name='John Doe',
+                phone_number='+254700123456',
+                location='Nairobi',
+                skills=['plumbing', 'electrical'],
+                experience_level='intermediate',
+                preferred_job_types=['part_time']
+            )
+            self.best = JobPosting.objects.create(
+                title='Plumber Job',
+                description='Need plumber',
+                location='Nairobi',
+                employer=self.employer,
+                pay_rate=2500.00,
+                required_skills=['plumbing', 'electrical'],
+                job_type='part_time'
+            )
+            self.good = JobPosting.objects.create(
+                title='Electrician Job',
+                description='Need electrician',
+                location='Mombasa',
+                employer=self.employer,
+                pay_rate=3000.00,
+                required_skills=['electrical', 'wiring'],
+                job_type='full_time'
+            )
+            self.closed = JobPosting.objects.create(
+                title='Filled Plumber Job',
+                description='Filled',
+                location='Nairobi',
+                employer=self.employer,
+                pay_rate=2500.00,
+                required_skills=['plumbing', 'electrical'],
+                job_type='part_time',
+                is_open=False
+            )
+            
+    def test_service_ranks_open_jobs_by_score(self):
+        recommended = recommended_jobs_for_worker(self.worker, limit=5)
+        self.assertEqual([job.id for _, job in recommended], [self.best.id, self.good.id])
+        self.assertEqual(recommended[0][0], calculate_match_score(self.worker, self.best))
+        
+    def test_live_path_scores_older_candidates(self):
+        for i in range(50):
+            JobPosting.objects.create(
+                title=f'Wiring Job {i}',
+                description='Need wiring',
+                location='Mombasa',
+                employer=self.employer,
+                pay_rate=1500.00,
+                required_skills=['electrical', 'wiring', 'welding'],
+                job_type='full_time'
+            )
+        with mock.patch('core.recommendations.calculate_match_score') as scalar:
+            recommended = recommended_jobs_for_worker(self.worker, limit=5)
+        scalar.assert_not_called()
+        self.assertEqual(recommended[0], (calculate_match_score(self.worker, self.best), self.best))
+        self.assertEqual(len(recommended), 5)
+        
+    def test_recommended_jobs_endpoint(self):
+        url = reverse('workerprofile-recommended-jobs', kwargs={'pk': self.worker.id})
+        response = self.client.get(f'{url}?limit=1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['job_id'], self.best.id)
+        self.assertEqual(response.data[0]['employer_name'], 'TestCorp')
+        
+    def test_ussd_job_search_is_ranked(self):
+        response = self.client.post(reverse('ussd_webhook'), {
+            'sessionId': 'test_session',
+            'phoneNumber': self.worker.phone_number,
+            'text': '2'
+        }, format='json')
+        lines = response.data['response'].splitlines()
+        self.assertEqual(lines[1], f'1. {self.best.title} - $2500.00')
+        self.assertNotIn(self.closed.title, response.data['response'])
+
+
+class GeoLocationTests(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        
+    def create_worker(self, i, location, skills=()):
+        return WorkerProfile.objects.create(
+            full_name=f'Worker {i}',
+            phone_number=f'+25470030000{i}',
+            location=location,
+            skills=list(skills),
+            experience_level='experienced'
+        )
+        
+    def test_gazetteer_resolution(self):
+        self.assertEqual(resolve_location('  WESTLANDS '), resolve_location('westlands'))
+        self.assertEqual(resolve_location('Westlands, Nairobi'), resolve_location('Westlands'))
+        self.assertEqual(resolve_location('Msa'), resolve_location('Mombasa'))
+        self.assertIsNone(resolve_location('Atlantis'))
+        self.assertIsNone(resolve_location(''))
+        
+    def test_locations_resolved_on_save(self):
+        worker = self.create_worker(0, 'Kilimani')
+        self.assertEqual((worker.latitude, worker.longitude), resolve_location('kilimani'))
+        
+        worker.location = 'Somewhere New'
+        worker.save(update_fields=['location'])
+        worker.refresh_from_db()
+        self.assertIsNone(worker.latitude)
+        self.assertIsNone(worker.geo_cell)
+        
+    def test_coordinates_stay_out_of_the_api(self):
+        client = APIClient()
+        response = client.post(reverse('workerprofile-list'), {
+            'full_name': 'Jane Doe',
+            'phone_number': '+254700300099',
+            'location': 'Kilimani',
+            'skills': ['plumbing'],
+            'latitude': 0.0,
+            'geo_cell': 1
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        worker = WorkerProfile.objects.get(id=response.data['id'])
+        self.assertEqual((worker.latitude, worker.longitude), resolve_location('kilimani'))
+        
+        job = JobPosting.objects.create(
+            title='Plumber Job',
+            description='Need plumber',
+            location='Westlands',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=['plumbing']
+        )
+        for response in (
+            response,
+            client.get(reverse('workerprofile-detail', kwargs={'pk': worker.id})),
+            client.get(reverse('jobposting-detail', kwargs={'pk': job.id})),
+        ):
+            self.assertFalse({'latitude', 'longitude', 'geo_cell', 'location_key'} & set(response.data))
+            
+    def test_distance_scores(self):
+        nairobi, westlands, mombasa = (resolve_location(p) for p in ('Nairobi', 'Westlands', 'Mombasa'))
+        self.assertEqual(calculate_location_match('Westlands', 'Nairobi', westlands, nairobi), 0.85)
+        self.assertEqual(calculate_location_match('Nairobi', 'Nairobi', nairobi, nairobi), 1.0)
+        self.assertEqual(calculate_location_match('Mombasa', 'Nairobi', mombasa, nairobi), 0.3)
+        # Unresolved places keep the string comparison
+        self.assertEqual(calculate_location_match('Atlantis', 'Nairobi', None, nairobi), 0.3)
+        
+    def test_grid_cells_cover_radius(self):
+        job_point = resolve_location('Nairobi')
+        cells = set(cells_within(job_point, 25))
+        for name in ('westlands', 'karen', 'ruiru', 'kitengela', 'thika', 'machakos', 'nakuru'):
+            point = resolve_location(name)
+            if squared_distance_km(point, job_point) <= 25 * 25:
+                self.assertIn(grid_cell(point), cells, name)
+                
+    def test_batch_scores_match_scalar_with_coordinates(self):
+        locations = ['Westlands', 'Karen', 'Thika', 'Mombasa', 'Atlantis', '', 'Nairobi, Kenya']
+        workers = [self.create_worker(i, location, ['plumbing']) for i, location in enumerate(locations)]
+        features = features_from_workers(workers)
+        for job_location in ('Nairobi', 'Ruiru', 'Atlantis'):
+            job = JobPosting.objects.create(
+                title='Plumber Job',
+                description='Need plumber',
+                location=job_location,
+                employer=self.employer,
+                pay_rate=2500.00,
+                required_skills=['plumbing']
+            )
+            self.assertEqual(
+                score_workers_for_job(job, features).tolist(),
+                [calculate_match_score(worker, job) for worker in workers]
+            )
+            
+    @override_settings(MATCH_RADIUS_KM=25)
+    def test_top_matches_with_geo_tiers_equal_full_scan(self):
+        locations = ['Westlands', 'Karen', 'Mombasa', 'Kisumu', 'Atlantis', 'Nakuru', 'Kilimani', 'Eldoret']
+        for i, location in enumerate(locations):
+            self.create_worker(i, location, ['plumbing'] if i % 3 == 0 else ['cooking'])
+        job = JobPosting.objects.create(
+            title='Plumber Job',
+            description='Need plumber',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=['plumbing'],
+            job_type='contract'
+        )
+        expected = sorted(
+            (
+                (calculate_match_score(w, job), w.id)
+                for w in WorkerProfile.objects.all()
+                if calculate_match_score(w, job) > 0.3
+            ),
+            key=lambda match: (-match[0], match[1])
+        )
+        for limit in (1, 2, 4, 10):
+            self.assertEqual(top_matches_for_job(job, limit=limit), expected[:limit])
+            
+    def test_whatsapp_search_finds_nearby_jobs(self):
+        worker = self.create_worker(0, 'Westlands', ['plumbing'])
+        job = JobPosting.objects.create(
+            title='Plumber Job',
+            description='Need plumber',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=['plumbing']
+        )
+        response = APIClient().post(reverse('whatsapp_webhook'), {
+            'From': f'whatsapp:{worker.phone_number}',
+            'Body': 'jobs westlands'
+        }, format='json')
+        self.assertIn(f'{job.id}: Plumber Job', response.data['message'])
+
+
+class SkillTaxonomyTests(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        
+    def create_worker(self, i, skills):
+        return WorkerProfile.objects.create(
+            full_name=f'Worker {i}',
+            phone_number=f'+25470040000{i}',
+            location='Nairobi',
+            skills=skills,
+            experience_level='experienced'
+        )
+        
+    def create_job(self, required_skills):
+        return JobPosting.objects.create(
+            title='Skilled Job',
+            description='Need help',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=required_skills
+        )
+        
+    def test_synonyms_share_canonical_skill(self):
+        self.assertEqual(canonical_skills(['Plumber', 'fundi bomba', 'plumbing']), {'plumbing'})
+        self.assertEqual(canonical_skills(['pipe_fitting', 'Pipe-Fitter']), {'pipe fitting'})
+        self.assertEqual(canonical_skills(['Solar  Installation', '']), {'solar installation'})
+        self.assertEqual(skill_mask(['plumber']), skill_mask(['plumbing']))
+        self.assertEqual(skill_mask(['solar installation']), 0)
+        
+    def test_popcount(self):
+        masks = np.array([0, 1, 0b1011, (1 << 62) | 1], dtype=np.int64)
+        self.assertEqual(popcount(masks).tolist(), [0, 1, 3, 2])
+        
+    def test_skill_mask_maintained_on_save(self):
+        worker = self.create_worker(0, ['plumber'])
+        self.assertEqual(worker.skill_mask, skill_mask(['plumbing']))
+        
+        response = APIClient().patch(
+            reverse('workerprofile-detail', kwargs={'pk': worker.id}), {'skill_mask': 0}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('skill_mask', response.data)
+        worker.refresh_from_db()
+        self.assertEqual(worker.skill_mask, skill_mask(['plumbing']))
+        
+        worker.skills = ['electrician', 'welding']
+        worker.save(update_fields=['skills'])
+        worker.refresh_from_db()
+        self.assertEqual(worker.skill_mask, skill_mask(['electrical', 'welding']))
+        
+    def test_synonyms_score_as_matches(self):
+        worker = self.create_worker(0, ['plumber', 'Electrician'])
+        job = self.create_job(['plumbing', 'electrical'])
+        self.assertEqual(calculate_match_score(worker, job), calculate_match_score(
+            self.create_worker(1, ['plumbing', 'electrical']), job
+        ))
+        self.assertIn(worker.id, list(candidate_worker_ids(job).values_list('worker_id', flat=True)))
+        
+    def test_batch_scores_match_scalar_with_synonyms(self):
+        skill_sets = [
+            ['plumber'], ['Pipe_Fitting', 'solar installation'], ['solar installation'],
+            ['cook', 'waiter'], [], ['plumbing', 'plumber', 'PLUMBING']
+        ]
+        workers = [self.create_worker(i, skills) for i, skills in enumerate(skill_sets)]
+        features = features_from_workers(workers)
+        for required_skills in (['plumbing', 'pipe fitting'], ['solar installation'], ['cooking', 'solar installation'], []):
+            job = self.create_job(required_skills)
+            self.assertEqual(
+                score_workers_for_job(job, features).tolist(),
+                [calculate_match_score(worker, job) for worker in workers]
+            )
+            
+    def test_remask_after_appending_a_skill(self):
+        worker = self.create_worker(0, ['drone piloting', 'plumber'])
+        job = self.create_job(['drone pilot', 'plumbing'])
+        
+        def batch_score():
+            rows = WorkerProfile.objects.filter(id=worker.id).values_list(*WORKER_FEATURE_FIELDS)
+            return score_workers_for_job(job, build_worker_features(rows)).tolist()
+            
+        try:
+            with mock.patch('core.skills.SKILL_TAXONOMY', SKILL_TAXONOMY + [('drone piloting', ['drone pilot'])]):
+                skill_vocabulary.cache_clear()
+                # Stored masks predate the new skill until they are remasked
+                self.assertNotEqual(batch_score(), [calculate_match_score(worker, job)])
+                
+                out = StringIO()
+                call_command('remask_skills', '--dry-run', stdout=out)
+                self.assertIn('1 workers and 1 jobs', out.getvalue())
+                call_command('remask_skills', stdout=StringIO())
+                self.assertEqual(batch_score(), [calculate_match_score(worker, job)])
+                self.assertEqual(
+                    set(JobSkill.objects.filter(job=job).values_list('skill', flat=True)),
+                    {'drone piloting', 'plumbing'}
+                )
+        finally:
+            skill_vocabulary.cache_clear()
+            
+    def test_skills_filter_uses_taxonomy(self):
+        plumbing = self.create_job(['plumber', 'welding'])
+        self.create_job(['plumbing'])
+        solar = self.create_job(['solar installation'])
+        client = APIClient()
+        
+        response = client.get(reverse('jobposting-list'), {'skills': 'plumbing,welder'})
+        self.assertEqual([job['id'] for job in response.data['results']], [plumbing.id])
+        
+        response = client.get(reverse('jobposting-list'), {'skills': 'Solar_Installation'})
+        self.assertEqual([job['id'] for job in response.data['results']], [solar.id])
+        
+    def test_skills_filter_is_exact(self):
+        self.create_job(['carpentry', 'solar installation'])
+        client = APIClient()
+        for skills in ('art', 'Solar', 'install'):
+            response = client.get(reverse('jobposting-list'), {'skills': skills})
+            self.assertEqual(response.data['count'], 0, skills)
+        
+    def test_skills_filter_all_or_any(self):
+        plumbing = self.create_job(['plumbing'])
+        both = self.create_job(['plumber', 'solar installation'])
+        solar = self.create_job(['solar installation'])
+        self.create_job(['cooking'])
+        client = APIClient()
+        
+        response = client.get(reverse('jobposting-list'), {'skills': 'plumbing,solar installation'})
+        self.assertEqual({job['id'] for job in response.data['results']}, {both.id})
+        
+        response = client.get(reverse('jobposting-list'), {'skills_any': 'plumbing,solar installation'})
+        self.assertEqual({job['id'] for job in response.data['results']}, {plumbing.id, both.id, solar.id})
+        
+        response = client.get(reverse('jobposting-list'), {'skills': ' , '})
+        self.assertEqual(response.data['count'], 4)
+        
+    def test_skills_filter_uses_skill_index(self):
+        plan = JobPosting.objects.filter(
+            id__in=jobs_with_skills(['plumbing', 'solar installation'])
+        ).explain()
+        self.assertIn('core_jobskill', plan)
+        # SQLite: postings are searched by skill, not scanned
+        self.assertNotIn('SCAN core_jobskill', plan)
+
+
+class MatchCacheInvalidationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        self.job = JobPosting.objects.create(
+            title='Plumber Job',
+            description='Need plumber',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=['plumbing']
+        )
+        self.worker = self.create_worker(0, ['plumbing'])
+        self.client.force_authenticate(self.employer_user)
+        self.url = reverse('jobposting-matches', kwargs={'pk': self.job.id})
+        
+    def create_worker(self, i, skills):
+        with self.captureOnCommitCallbacks(execute=True):
+            return WorkerProfile.objects.create(
+                full_name=f'Worker {i}',
+                phone_number=f'+25470050000{i}',
+                location='Nairobi',
+                skills=skills,
+                experience_level='experienced'
+            )
+            
+    def matched_ids(self):
+        return [match['worker_id'] for match in self.client.get(self.url).data]
+        
+    def test_new_worker_invalidates_cached_matches(self):
+        self.assertEqual(self.matched_ids(), [self.worker.id])
+        newcomer = self.create_worker(1, ['plumbing', 'pipe fitting'])
+        self.assertEqual(sorted(self.matched_ids()), sorted([self.worker.id, newcomer.id]))
+        
+    def test_job_edit_invalidates_only_that_job(self):
+        cached_score = self.client.get(self.url).data[0]['score']
+        other_key = job_matches_cache_key(self.job.id + 1, 10)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.required_skills = ['cooking']
+            self.job.location = 'Mombasa'
+            self.job.save()
+        score = self.client.get(self.url).data[0]['score']
+        self.assertLess(score, cached_score)
+        self.assertEqual(score, calculate_match_score(self.worker, self.job))
+        self.assertEqual(job_matches_cache_key(self.job.id + 1, 10), other_key)
+        
+    def test_unrelated_saves_keep_cache_key(self):
+        key = job_matches_cache_key(self.job.id, 10)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.worker.language_preference = 'sw'
+            self.worker.save(update_fields=['language_preference'])
+            self.job.title = 'Senior Plumber'
+            self.job.save(update_fields=['title'])
+        self.assertEqual(job_matches_cache_key(self.job.id, 10), key)
+        
+    def test_renamed_worker_is_not_served_stale(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.worker.full_name = 'John D.'
+            self.worker.save(update_fields=['full_name'])
+        self.assertEqual(self.client.get(self.url).data[0]['worker_name'], 'John D.')
+        
+    def test_evicted_version_does_not_reuse_old_keys(self):
+        key = job_matches_cache_key(self.job.id, 10)
+        cache.delete(job_version_key(self.job.id))
+        self.assertNotEqual(job_matches_cache_key(self.job.id, 10), key)
+
+
+class MatchCacheStampedeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        
+    def slow_compute(self):
+        self.calls += 1
+        time.sleep(0.2)
+        return ['fresh']
+        
+    def concurrent_reads(self, key, readers=8, **kwargs):
+        results = []
+        barrier = threading.Barrier(readers)
+        
+        def read():
+            barrier.wait()
+            results.append(get_or_compute(key, self.slow_compute, 60, **kwargs))
+            
+        threads = [threading.Thread(target=read) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+        
+    def test_single_flight_with_local_lock(self):
+        self.assertEqual(self.concurrent_reads('stampede_local'), [['fresh']] * 8)
+        self.assertEqual(self.calls, 1)
+        
+    def test_single_flight_with_cache_lock(self):
+        with mock.patch('core.match_cache._uses_local_cache', return_value=False):
+            self.assertEqual(self.concurrent_reads('stampede_shared'), [['fresh']] * 8)
+        self.assertEqual(self.calls, 1)
+        
+    def test_expired_entry_served_while_rebuilding(self):
+        cache.set('stale_key', {'value': ['old'], 'delta': 0.1, 'expires': time.time() - 1}, 60)
+        release = _acquire('stale_key')
+        try:
+            self.assertEqual(get_or_compute('stale_key', self.slow_compute, 60), ['old'])
+        finally:
+            release()
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(get_or_compute('stale_key', self.slow_compute, 60), ['fresh'])
+        
+    def test_previous_version_never_served(self):
+        get_or_compute('matches_v1', lambda: ['v1'], 60)
+        # A caller rebuilding the bumped version: others wait for its result
+        results = []
+        release = _acquire('matches_v2')
+        reader = threading.Thread(target=lambda: results.append(get_or_compute('matches_v2', self.slow_compute, 60)))
+        reader.start()
+        time.sleep(0.1)
+        cache.set('matches_v2', {'value': ['v2'], 'delta': 0.1, 'expires': time.time() + 60}, 60)
+        release()
+        reader.join()
+        self.assertEqual(results, [['v2']])
+        self.assertEqual(self.calls, 0)
+        
+    def test_early_recomputation(self):
+        cache.set('fresh_key', {'value': ['cached'], 'delta': 0.01, 'expires': time.time() + 600}, 60)
+        self.assertEqual(get_or_compute('fresh_key', self.slow_compute, 60), ['cached'])
+        
+        # A costly entry close to expiry is almost certainly refreshed early
+        cache.set('hot_key', {'value': ['cached'], 'delta': 1e6, 'expires': time.time() + 1}, 60)
+        self.assertEqual(get_or_compute('hot_key', self.slow_compute, 60), ['fresh'])
+        self.assertEqual(self.calls, 1)
+
+
+# Its own cache, so match lists cached here never reach other classes' job ids
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sql-scoring'}})
+class SqlScoringTests(TestCase):
+    """Runs against the configured database (SQLite, or Postgres with USE_POSTGRES)"""
+    
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        profiles = [
+            (['plumbing', 'pipe fitting'], 'Westlands', 'experienced', ['contract']),
+            (['plumber', 'solar installation'], 'Nairobi', 'expert', []),
+            (['Solar Installation'], 'Mombasa', 'entry', ['full_time', 'contract']),
+            (['cooking'], 'Atlantis', 'intermediate', ['part_time']),
+            ([], '', 'entry', ['temporary']),
+            (['electrician', 'wiring'], 'Kisumu Town', 'experienced', ['full_time']),
+            (['carpentry'], 'Unknown Village, Atlantis', 'expert', ['contract']),
+            (['welding', 'plumbing'], 'Thika', 'intermediate', []),
+            (['plumbing'], 'Ölkalou', 'expert', ['contract']),
+        ]
+        self.workers = []
+        for i, (skills, location, experience, job_types) in enumerate(profiles):
+            self.workers.append(WorkerProfile.objects.create(
+                full_name=f'Worker {i}',
+                phone_number=f'+25470060000{i}',
+                location=location,
+                skills=skills,
+                experience_level=experience,
+                preferred_job_types=job_types
+            ))
+            
+    def create_job(self, required_skills, location, job_type):
+        return JobPosting.objects.create(
+            title='Job',
+            description='Work',
+            location=location,
+            employer=self.employer,
+            pay_rate=2500.00,
+            required_skills=required_skills,
+            job_type=job_type
+        )
+        
+    def jobs(self):
+        return [
+            self.create_job(['plumbing', 'solar installation'], 'Nairobi', 'contract'),
+            self.create_job(['electrical'], 'Atlantis', 'full_time'),
+            self.create_job(['cooking', 'baking', 'hospitality'], 'Unknown Village', 'part_time'),
+            self.create_job([], '', 'temporary'),
+            self.create_job(['solar installation'], 'Mombasa', 'full_time'),
+            # Case folding beyond ASCII, which SQLite's LIKE and LOWER skip
+            self.create_job(['plumbing'], 'ölkalou', 'contract'),
+            self.create_job(['plumbing'], 'öLKALOU Town', 'contract'),
+        ]
+        
+    def test_scores_match_python_scorer(self):
+        for job in self.jobs():
+            scores = dict(annotate_match_scores(WorkerProfile.objects.all(), job).values_list('id', 'match_score'))
+            for worker in self.workers:
+                self.assertEqual(scores[worker.id], calculate_match_score(worker, job), (worker.id, job.id))
+                
+    def test_top_matches_equal_live_ranking(self):
+        for job in self.jobs():
+            for limit in (1, 3, 10):
+                self.assertEqual(sql_top_matches_for_job(job, limit), top_matches_for_job(job, limit))
+                
+    @override_settings(MATCH_BACKEND='sql')
+    def test_matches_endpoint_uses_sql_backend(self):
+        cache.clear()
+        job = self.jobs()[0]
+        client = APIClient()
+        client.force_authenticate(self.employer_user)
+        response = client.get(reverse('jobposting-matches', kwargs={'pk': job.id}), {'limit': 3})
+        self.assertEqual(
+            [(m['score'], m['worker_id']) for m in response.data],
+            sql_top_matches_for_job(job, 3)
+        )
+
+
+class SyntheticPopulationTests(TestCase):
+    def worker_rows(self, count, seed):
+        return [
+            (w.full_name, w.phone_number, w.location, w.skills, w.experience_level, w.preferred_job_types)
+            for w in synthetic_workers(count, seed)
+        ]
+        
+    def test_same_seed_same_population(self):
+        self.assertEqual(self.worker_rows(200, seed=7), self.worker_rows(200, seed=7))
+        self.assertNotEqual(self.worker_rows(200, seed=7), self.worker_rows(200, seed=8))
+        # A larger population starts with the smaller one
+        self.assertEqual(self.worker_rows(300, seed=7)[:200], self.worker_rows(200, seed=7))
+        
+    def test_rows_are_valid_and_resolved(self):
+        workers = list(synthetic_workers(500, seed=1))
+        self.assertEqual(len({w.phone_number for w in workers}), 500)
+        for worker in workers:
+            worker.full_clean(exclude=['user', 'preferred_job_types'])
+            self.assertEqual(worker.skill_mask, skill_mask(worker.skills))
+        self.assertGreater(sum(w.latitude is not None for w in workers), 400)
+        vocabulary = skill_vocabulary()
+        self.assertGreater(sum(any(s in vocabulary for s in w.skills) for w in workers), 450)
+        
+    def test_bulk_insert(self):
+        User.objects.bulk_create(synthetic_users(3, seed=2))
+        user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+        Employer.objects.bulk_create(synthetic_employers(user_ids, seed=2))
+        employer_ids = list(Employer.objects.values_list('id', flat=True))
+        WorkerProfile.objects.bulk_create(synthetic_workers(50, seed=2))
+        JobPosting.objects.bulk_create(synthetic_jobs(20, employer_ids, seed=2))
+        self.assertEqual(WorkerProfile.objects.count(), 50)
+        self.assertEqual(JobPosting.objects.filter(employer_id__in=employer_ids).count(), 20)
+        
+    def test_scale_counts(self):
+        self.assertEqual(scale_counts('10k'), (10_000, 500, 100))
+        self.assertEqual(scale_counts('1m')[0], 1_000_000)
+
+
+class GenerateLoadDataTests(TestCase):
+    def generate(self, **options):
+        options = {'workers': 60, 'jobs': 12, 'employers': 3, 'seed': 5, 'scores_per_job': 5, **options}
+        call_command('generate_load_data', stdout=StringIO(), **options)
+        
+    def snapshot(self):
+        return (
+            list(WorkerProfile.objects.order_by('id').values_list(
+                'phone_number', 'skills', 'skill_mask', 'location', 'latitude', 'geo_cell'
+            )),
+            list(JobPosting.objects.order_by('id').values_list('title', 'required_skills', 'job_type', 'is_open')),
+            list(Application.objects.order_by('worker__phone_number', 'job_id').values_list(
+                'worker__phone_number', 'job__title', 'status', 'channel'
+            )),
+        )
+        
+    def test_generates_consistent_rows(self):
+        self.generate(applications_per_worker=1.5)
+        self.assertEqual(WorkerProfile.objects.count(), 60)
+        self.assertEqual(JobPosting.objects.count(), 12)
+        self.assertEqual(Employer.objects.count(), 3)
+        self.assertGreater(Application.objects.count(), 60)
+        
+        for worker in WorkerProfile.objects.all():
+            self.assertEqual(worker.skill_mask, skill_mask(worker.skills))
+            self.assertEqual(
+                sorted(worker.skill_postings.values_list('skill', flat=True)), index_keys(worker.skills)
+            )
+        for match in MatchScore.objects.select_related('worker', 'job'):
+            self.assertTrue(match.job.is_open)
+            self.assertEqual(match.score, calculate_match_score(match.worker, match.job))
+        self.assertLessEqual(MatchScore.objects.values('job').distinct().count(), 12)
+        
+    def test_rerun_requires_flush_and_is_deterministic(self):
+        self.generate()
+        first = self.snapshot()
+        with self.assertRaises(CommandError):
+            self.generate()
+        self.generate(flush=True)
+        self.assertEqual(self.snapshot(), first)
+        self.assertEqual(WorkerProfile.objects.count(), 60)
+        
+    def test_flush_keeps_real_data(self):
+        employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        WorkerProfile.objects.create(full_name='Real', phone_number='+254700000001', location='Nairobi')
+        self.generate()
+        self.generate(flush=True, workers=10)
+        self.assertEqual(WorkerProfile.objects.count(), 11)
+        self.assertTrue(User.objects.filter(id=employer_user.id).exists())
+        
+    def test_copy_values(self):
+        worker = next(synthetic_workers(1))
+        worker.location = ''
+        worker.latitude = None
+        fields = {field.name: field for field in WorkerProfile._meta.concrete_fields}
+        self.assertEqual(copy_value(fields['location'], worker), '')
+        self.assertEqual(copy_value(fields['latitude'], worker), COPY_NULL)
+        self.assertEqual(json.loads(copy_value(fields['skills'], worker)), worker.skills)
+
+
+class ListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        self.rows = 0
+        
+    def add_rows(self, count):
+        """Add count workers and jobs, each worker applying to and matched with each new job"""
+        with override_settings(MATCH_SCORES_AUTO_UPDATE=False):
+            for i in range(self.rows, self.rows + count):
+                worker = WorkerProfile.objects.create(
+                    full_name=f'Worker {i}',
+                    phone_number=f'+2547008000{i:02d}',
+                    location='Nairobi',
+                    skills=['plumbing']
+                )
+                job = JobPosting.objects.create(
+                    title=f'Job {i}',
+                    description='Work',
+                    location='Nairobi',
+                    employer=self.employer,
+                    pay_rate=1000,
+                    required_skills=['plumbing']
+                )
+                Application.objects.create(worker=worker, job=job)
+                MatchScore.objects.create(worker=worker, job=job, score=0.9)
+        self.rows += count
+        
+    def assert_constant_queries(self, url, expected):
+        self.client.force_authenticate(self.employer_user)
+        # The first request also loads the user's (missing) worker profile
+        self.client.get(url)
+        for count in (2, 10):
+            self.add_rows(count)
+            with self.assertNumQueries(expected):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['count'], self.rows)
+            
+    def test_jobs_list(self):
+        self.assert_constant_queries(reverse('jobposting-list'), 2)
+        
+    def test_jobs_list_counts_applications(self):
+        self.add_rows(2)
+        Application.objects.create(
+            worker=WorkerProfile.objects.order_by('id').last(),
+            job=JobPosting.objects.order_by('id').first()
+        )
+        response = self.client.get(reverse('jobposting-list'), {'ordering': 'created_at'})
+        self.assertEqual([job['applications_count'] for job in response.data['results']], [2, 1])
+        self.assertEqual(response.data['results'][0]['employer_name'], 'TestCorp')
+        
+    def test_applications_list(self):
+        self.assert_constant_queries(reverse('application-list'), 2)
+        
+    def test_match_scores_list(self):
+        self.assert_constant_queries(reverse('matchscore-list'), 2)
+        
+    def test_workers_list(self):
+        self.assert_constant_queries(reverse('workerprofile-list'), 2)
+
+
+class QueryPlannerTests(APITestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        self.worker = WorkerProfile.objects.create(
+            full_name='John Doe',
+            phone_number='+254700123457',
+            location='Nairobi',
+            skills=['plumbing']
+        )
+        self.job = JobPosting.objects.create(
+            title='Plumber needed',
+            description='Fix pipes',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=1000,
+            required_skills=['plumbing']
+        )
+        Application.objects.create(worker=self.worker, job=self.job)
+        
+    def test_dotted_sources_are_joined(self):
+        plan = plan_for_serializer(ApplicationSerializer, Application)
+        self.assertEqual(plan.select_related, {'worker', 'job', 'employer'})
+        self.assertEqual(plan.prefetch_related, [])
+        # Related rows load only the columns shown
+        self.assertIn('employer__company_name', plan.only)
+        self.assertNotIn('job__description', plan.only)
+        self.assertIn('status', plan.only)
+        
+    def test_nested_serializers(self):
+        class JobSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = JobPosting
+                fields = ['id', 'title']
+        
+        class EmployerWithJobsSerializer(serializers.ModelSerializer):
+            user = UserSerializer(read_only=True)
+            job_postings = JobSerializer(many=True, read_only=True)
+            
+            class Meta:
+                model = Employer
+                fields = ['company_name', 'user', 'job_postings']
+        
+        plan = plan_for_serializer(EmployerWithJobsSerializer, Employer)
+        self.assertEqual(plan.select_related, {'user'})
+        self.assertEqual([lookup.prefetch_to for lookup in plan.prefetch_related], ['job_postings'])
+        self.assertIn('user__username', plan.only)
+        
+        employers = plan.apply(Employer.objects.all())
+        with self.assertNumQueries(2):
+            data = EmployerWithJobsSerializer(employers, many=True).data
+        self.assertEqual(data[0]['user']['username'], 'emp')
+        self.assertEqual(data[0]['job_postings'][0]['title'], 'Plumber needed')
+        
+    def test_method_fields_keep_all_columns(self):
+        plan = plan_for_serializer(JobPostingSerializer, JobPosting)
+        self.assertEqual(plan.select_related, {'employer'})
+        self.assertIn('description', plan.only)
+        self.assertIn('employer__company_name', plan.only)
+        self.assertNotIn('employer__email', plan.only)
+        
+    def test_views_apply_plan(self):
+        self.client.force_authenticate(self.employer_user)
+        url = reverse('application-list')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.data['results'][0]['employer_name'], 'TestCorp')
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('"description"', queries[-1]['sql'])
+        
+    def test_writes_load_full_rows(self):
+        self.client.force_authenticate(self.employer_user)
+        response = self.client.patch(
+            reverse('application-update-status', kwargs={'pk': self.job.applications.get().id}),
+            {'status': 'accepted'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'accepted')
+        self.assertEqual(Application.objects.get().status, 'accepted')
+
+
+class PerformanceMiddlewareTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        reset_request_stats()
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        self.job = JobPosting.objects.create(
+            title='Plumber needed',
+            description='Fix pipes',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=1000,
+            required_skills=['plumbing']
+        )
+        self.client.force_authenticate(self.employer_user)
+        
+    @override_settings(PERF_METRICS_HEADERS=True)
+    def test_headers(self):
+        url = reverse('jobposting-matches', kwargs={'pk': self.job.id})
+        cold = self.client.get(url)
+        warm = self.client.get(url)
+        self.assertEqual(warm['X-DB-Queries'], '1')  # the job
+        self.assertGreater(int(cold['X-DB-Queries']), 1)
+        # Versions and the list miss on the first request and hit on the second
+        self.assertGreater(int(cold['X-Cache-Misses']), 0)
+        self.assertEqual(warm['X-Cache-Misses'], '0')
+        self.assertGreaterEqual(int(warm['X-Cache-Hits']), 3)
+        self.assertGreater(float(cold['X-Response-Time-Ms']), 0)
+        self.assertGreaterEqual(float(cold['X-Response-Time-Ms']), float(cold['X-DB-Time-Ms']))
+        
+    def test_cache_methods_restored_after_request(self):
+        self.client.get(reverse('jobposting-matches', kwargs={'pk': self.job.id}))
+        backend = caches['default']
+        self.assertNotIn('get', backend.__dict__)
+        self.assertNotIn('get_many', backend.__dict__)
+        self.assertEqual(backend.get_many(['missing']), {})
+        
+    @override_settings(PERF_METRICS_HEADERS=False)
+    def test_headers_disabled(self):
+        response = self.client.get(reverse('jobposting-list'))
+        self.assertNotIn('X-DB-Queries', response)
+        
+    def test_aggregates_by_view_name(self):
+        for _ in range(3):
+            self.client.get(reverse('jobposting-list'))
+        self.client.get(reverse('jobposting-detail', kwargs={'pk': self.job.id}))
+        self.client.get('/missing/')
+        stats = request_stats()
+        self.assertEqual(stats['jobposting-list']['requests'], 3)
+        self.assertEqual(stats['jobposting-list']['queries'], 6)
+        self.assertEqual(stats['jobposting-list']['max_queries'], 2)
+        self.assertEqual(stats['jobposting-detail']['requests'], 1)
+        self.assertEqual(stats['unresolved']['requests'], 1)
+        reset_request_stats()
+        self.assertEqual(request_stats(), {})
+
+# Most queries each router endpoint may run (url name: (method, budget)),
+# counting the request user's worker/employer profile lookups. Every
+# endpoint registered in core.urls needs an entry.
+QUERY_BUDGETS = {
+    'api-root': ('get', 0),
+    'workerprofile-list': ('get', 2),
+    'workerprofile-detail': ('get', 1),
+    'workerprofile-recommended-jobs': ('get', 3),
+    'employer-list': ('get', 3),
+    'employer-detail': ('get', 2),
+    'jobposting-list': ('get', 2),
+    'jobposting-detail': ('get', 1),
+    'jobposting-matches': ('get', 6),
+    'jobposting-archived': ('get', 2),
+    'jobposting-import': ('post', 4),
+    'application-list': ('get', 4),
+    'application-detail': ('get', 3),
+    'application-update-status': ('patch', 4),
+    'application-archived': ('get', 3),
+    'matchscore-list': ('get', 4),
+    'matchscore-detail': ('get', 3),
+}
+
+
+class QueryBudgetTests(APITestCase):
+    ROWS = 5
+    
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        # Enough rows that a query per row overruns every budget
+        with override_settings(MATCH_SCORES_AUTO_UPDATE=False):
+            for i in range(self.ROWS):
+                worker = WorkerProfile.objects.create(
+                    full_name=f'Worker {i}',
+                    phone_number=f'+2547009000{i:02d}',
+                    location='Nairobi',
+                    skills=['plumbing']
+                )
+                job = JobPosting.objects.create(
+                    title=f'Job {i}',
+                    description='Work',
+                    location='Nairobi',
+                    employer=self.employer,
+                    pay_rate=1000,
+                    required_skills=['plumbing']
+                )
+                Application.objects.create(worker=worker, job=job)
+                MatchScore.objects.create(worker=worker, job=job, score=0.9)
+        self.objects = {
+            'workerprofile': worker,
+            'employer': self.employer,
+            'jobposting': job,
+            'application': Application.objects.first(),
+            'matchscore': MatchScore.objects.first(),
+        }
+        
+    def url_names(self):
+        return {url.name for url in router.urls if url.name}
+        
+    def assert_within_budget(self, name):
+        method, budget = QUERY_BUDGETS[name]
+        basename = name.split('-')[0]
+        kwargs = {'pk': self.objects[basename].pk} if name in self.detail_names() else {}
+        data = {'status': 'accepted'} if method == 'patch' else None
+        encoding = {'format': 'json'}
+        if name == 'jobposting-import':
+            # One chunk of rows: queries per chunk, not per row
+            data = 'title,description,location,pay_rate\n' + 'Shift,Weld gates,Nairobi,1000\n' * self.ROWS
+            encoding = {'content_type': 'text/csv'}
+        # A fresh user, as in a real request: profile lookups count too
+        self.client.force_authenticate(User.objects.get(pk=self.employer_user.pk))
+        with override_settings(PERF_METRICS_HEADERS=True):
+            response = getattr(self.client, method)(reverse(name, kwargs=kwargs), data, **encoding)
+        self.assertLess(response.status_code, 400, name)
+        queries = int(response['X-DB-Queries'])
+        self.assertLessEqual(queries, budget, f'{name} ran {queries} queries, budget {budget}')
+        
+    def detail_names(self):
+        return {
+            url.name for url in router.urls if url.name and 'pk' in url.pattern.regex.groupindex
+        }
+        
+    def test_every_endpoint_has_a_budget(self):
+        self.assertEqual(self.url_names(), set(QUERY_BUDGETS))
+        
+    def test_endpoints_within_budget(self):
+        for name in sorted(self.url_names()):
+            with self.subTest(name):
+                cache.clear()
+                self.assert_within_budget(name)
+
+
+class HotPathIndexTests(TestCase):
+    def setUp(self):
+        employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        
+    def assert_uses_index(self, queryset, index_name):
+        if connection.vendor == 'postgresql':
+            # Test tables are too small for the planner to prefer an index on its own
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn('TEMP B-TREE FOR ORDER BY', plan)
+        self.assertNotIn('Seq Scan', plan)
+        
+    def test_open_jobs_newest_first(self):
+        self.assert_uses_index(JobPosting.objects.filter(is_open=True), 'core_job_open_created_idx')
+        
+    def test_open_jobs_by_pay(self):
+        self.assert_uses_index(
+            JobPosting.objects.filter(is_open=True, pay_rate__gte=500, pay_rate__lte=2000).order_by('pay_rate'),
+            'core_job_open_pay_idx'
+        )
+        
+    def test_open_jobs_by_location(self):
+        index_name = 'core_job_location_trgm_idx' if connection.vendor == 'postgresql' else 'core_job_open_created_idx'
+        self.assert_uses_index(
+            JobPosting.objects.filter(is_open=True, location__icontains='nairobi'), index_name
+        )
+        
+    def test_employer_jobs(self):
+        self.assert_uses_index(
+            JobPosting.objects.filter(employer=self.employer), 'core_job_employer_created_idx'
+        )
+        
+    def test_worker_applications(self):
+        self.assert_uses_index(Application.objects.filter(worker_id=1), 'core_app_worker_applied_idx')
+        
+    def test_job_match_scores(self):
+        self.assert_uses_index(
+            MatchScore.objects.filter(job_id=1).order_by('-score')[:10], 'core_match_job_score_idx'
+        )
+        
+    def test_employer_applications(self):
+        self.assert_uses_index(
+            Application.objects.filter(employer=self.employer), 'core_app_employer_applied_idx'
+        )
+        
+    def test_employer_match_scores(self):
+        self.assert_uses_index(
+            MatchScore.objects.filter(employer=self.employer)[:10], 'core_match_employer_score_idx'
+        )
+
+
+class JobSearchTests(APITestCase):
+    def setUp(self):
+        employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        
+    def create_job(self, title, description, location='Nairobi', **kwargs):
+        return JobPosting.objects.create(
+            title=title,
+            description=description,
+            location=location,
+            employer=self.employer,
+            pay_rate=1000,
+            **kwargs
+        )
+        
+    def search(self, text, **params):
+        response = self.client.get(reverse('jobposting-list'), {'search': text, **params})
+        return [job['id'] for job in response.data['results']]
+        
+    def test_search_terms(self):
+        self.assertEqual(search_terms(' Plumber, pipe_fitting! "Nairobi" '), ['plumber', 'pipe', 'fitting', 'nairobi'])
+        self.assertEqual(search_terms('*'), [])
+        
+    def test_stemming_and_prefixes(self):
+        plumbing = self.create_job('Plumbing repairs', 'Fixing leaking pipes')
+        builder = self.create_job('Fundi wa ujenzi', 'Tunatafuta mjengaji hodari', location='Kisumu')
+        self.assertEqual(self.search('repair plumbed'), [plumbing.id])
+        self.assertEqual(self.search('pipe leak'), [plumbing.id])
+        self.assertEqual(self.search('mjenga'), [builder.id])
+        self.assertEqual(self.search('FUNDI kisumu'), [builder.id])
+        # Every term must match
+        self.assertEqual(self.search('plumbing kisumu'), [])
+        
+    def test_ranked_by_relevance(self):
+        in_description = self.create_job('General work', 'Some welding needed')
+        in_title = self.create_job('Welding job', 'Metal work')
+        self.assertEqual(self.search('welding'), [in_title.id, in_description.id])
+        # An explicit ordering wins over relevance
+        self.assertEqual(self.search('welding', ordering='created_at'), [in_description.id, in_title.id])
+        
+    def test_document_follows_updates_and_deletes(self):
+        job = self.create_job('Cook', 'Hotel kitchen')
+        job.title = 'Waiter'
+        job.save()
+        self.assertEqual(self.search('cook'), [])
+        self.assertEqual(self.search('waiter'), [job.id])
+        JobPosting.objects.filter(id=job.id).delete()
+        self.assertEqual(self.search('waiter'), [])
+        
+    def test_closed_jobs_are_not_listed(self):
+        self.create_job('Driver', 'Delivery van', is_open=False)
+        self.assertEqual(self.search('driver'), [])
+        self.assertEqual(search_jobs(JobPosting.objects.all(), 'driver').count(), 1)
+        
+    def test_bulk_inserted_jobs_are_searchable(self):
+        JobPosting.objects.bulk_create([
+            JobPosting(title='Security guard', description='Night shift', location='Mombasa',
+                       employer=self.employer, pay_rate=1000)
+        ])
+        self.assertEqual(len(self.search('guard')), 1)
+        
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite FTS5 triggers')
+    def test_triggers_are_restored_after_migrate(self):
+        # What an SQLite table remake (e.g. AddField on core_jobposting) leaves behind
+        with connection.cursor() as cursor:
+            for suffix in ('insert', 'delete', 'update'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {SQLITE_SEARCH_TABLE}_{suffix}')
+        emit_post_migrate_signal(0, False, connection.alias)
+        job = self.create_job('Painter', 'House painting')
+        self.assertEqual(self.search('painter'), [job.id])
+
+
+@mock.patch.object(KeysetCursorPagination, 'page_size', 3)
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        with override_settings(MATCH_SCORES_AUTO_UPDATE=False):
+            self.jobs = [
+                JobPosting.objects.create(
+                    title=f'Welding job {i}',
+                    description='Welding',
+                    location='Nairobi',
+                    employer=self.employer,
+                    pay_rate=1000 + 500 * (i % 3),
+                    required_skills=['welding']
+                )
+                for i in range(8)
+            ]
+            worker = WorkerProfile.objects.create(
+                full_name='John Doe',
+                phone_number='+254700123457',
+                location='Nairobi',
+                skills=['welding']
+            )
+            for i, job in enumerate(self.jobs):
+                MatchScore.objects.create(worker=worker, job=job, score=0.5 + 0.1 * (i % 2))
+        # Ties on the ordering field are broken by id
+        tied = JobPosting.objects.filter(id__in=[job.id for job in self.jobs[2:6]])
+        tied.update(created_at=self.jobs[2].created_at)
+        self.client.force_authenticate(self.employer_user)
+        
+    def walk(self, url, params=None):
+        """Ids of every page, following next links from an empty cursor"""
+        response = self.client.get(url, {**(params or {}), 'cursor': ''})
+        pages = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            pages.append([row['id'] for row in response.data['results']])
+            if not response.data['next']:
+                return pages
+            response = self.client.get(response.data['next'])
+            
+    def test_walks_every_row_once_in_order(self):
+        pages = self.walk(reverse('jobposting-list'))
+        self.assertEqual([len(page) for page in pages], [3, 3, 2])
+        expected = JobPosting.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual(sum(pages, []), list(expected))
+        
+    def test_requested_ordering(self):
+        ids = sum(self.walk(reverse('jobposting-list'), {'ordering': 'pay_rate'}), [])
+        self.assertEqual(ids, list(JobPosting.objects.order_by('pay_rate', 'id').values_list('id', flat=True)))
+        
+    def test_match_scores_and_search(self):
+        ids = sum(self.walk(reverse('matchscore-list')), [])
+        self.assertEqual(ids, list(MatchScore.objects.order_by('-score', '-id').values_list('id', flat=True)))
+        ids = sum(self.walk(reverse('jobposting-list'), {'search': 'welding'}), [])
+        self.assertCountEqual(ids, [job.id for job in self.jobs])
+        
+    def test_previous_link(self):
+        first = self.client.get(reverse('jobposting-list'), {'cursor': ''})
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        third = self.client.get(second.data['next'])
+        back = self.client.get(third.data['previous'])
+        self.assertEqual(back.data['results'], second.data['results'])
+        back = self.client.get(back.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertIsNone(back.data['previous'])
+        
+    def test_seeks_without_count_or_offset(self):
+        first = self.client.get(reverse('jobposting-list'), {'cursor': ''})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first.data['next'])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT(*)', queries[0]['sql'])
+        self.assertNotIn('OFFSET', queries[0]['sql'])
+        
+    def test_invalid_cursors(self):
+        response = self.client.get(reverse('jobposting-list'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        # A cursor belongs to the ordering it was made for
+        next_link = self.client.get(reverse('jobposting-list'), {'cursor': ''}).data['next']
+        response = self.client.get(next_link + '&ordering=pay_rate')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+    def test_page_numbers_by_default(self):
+        response = self.client.get(reverse('application-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 0)
+        response = self.client.get(reverse('jobposting-list'), {'page': 2})
+        self.assertEqual(response.data['count'], 8)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIn('page=3', response.data['next'])
+        
+    @override_settings(KEYSET_PAGINATION=True)
+    def test_setting_makes_cursors_the_default(self):
+        response = self.client.get(reverse('jobposting-list'))
+        self.assertNotIn('count', response.data)
+        self.assertIn('cursor=', response.data['next'])
+        response = self.client.get(reverse('jobposting-list'), {'page': 1})
+        self.assertEqual(response.data['count'], 8)
+
+
+class ApplicationsCountTests(APITestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        with override_settings(MATCH_SCORES_AUTO_UPDATE=False):
+            self.job = JobPosting.objects.create(
+                title='Plumbing job',
+                description='Fix pipes',
+                location='Nairobi',
+                employer=self.employer,
+                pay_rate=1500.00,
+                required_skills=['plumbing']
+            )
+            self.other_job = JobPosting.objects.create(
+                title='Welding job',
+                description='Weld gates',
+                location='Nairobi',
+                employer=self.employer,
+                pay_rate=2000.00,
+                required_skills=['welding']
+            )
+            self.worker_user = User.objects.create_user('worker', 'worker@test.com', 'pass')
+            self.worker = WorkerProfile.objects.create(
+                user=self.worker_user,
+                full_name='John Doe',
+                phone_number='+254700123457',
+                location='Nairobi',
+                skills=['plumbing']
+            )
+            
+    def count(self, job):
+        job.refresh_from_db(fields=['applications_count'])
+        return job.applications_count
+        
+    def test_api_and_webhook_applications_are_counted(self):
+        self.client.force_authenticate(self.worker_user)
+        response = self.client.post(reverse('application-list'), {'job': self.job.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        APIClient().post(reverse('whatsapp_webhook'), {
+            'From': f'whatsapp:{self.worker.phone_number}',
+            'Body': f'apply {self.other_job.id}'
+        }, format='json')
+        # Applying twice creates nothing
+        APIClient().post(reverse('whatsapp_webhook'), {
+            'From': f'whatsapp:{self.worker.phone_number}',
+            'Body': f'apply {self.other_job.id}'
+        }, format='json')
+        self.assertEqual(self.count(self.job), 1)
+        self.assertEqual(self.count(self.other_job), 1)
+        
+    def test_deletes_and_moves_are_counted(self):
+        application = Application.objects.create(worker=self.worker, job=self.job)
+        application.job = self.other_job
+        application.save()
+        self.assertEqual((self.count(self.job), self.count(self.other_job)), (0, 1))
+        # Status changes leave the count alone
+        application.status = 'reviewed'
+        application.save()
+        self.assertEqual(self.count(self.other_job), 1)
+        application.delete()
+        self.assertEqual(self.count(self.other_job), 0)
+        
+        Application.objects.create(worker=self.worker, job=self.job)
+        self.worker.delete()
+        self.assertEqual(self.count(self.job), 0)
+        
+    def test_job_save_keeps_concurrent_count(self):
+        stale = JobPosting.objects.get(id=self.job.id)
+        Application.objects.create(worker=self.worker, job=self.job)
+        stale.title = 'Plumbing and drainage job'
+        stale.save()
+        self.assertEqual(self.count(self.job), 1)
+        
+    def test_job_save_semantics_are_unchanged(self):
+        # Saving a deleted row inserts it again
+        job = JobPosting.objects.get(id=self.other_job.id)
+        JobPosting.objects.filter(id=job.id).delete()
+        job.save()
+        self.assertTrue(JobPosting.objects.filter(id=job.id, title='Welding job').exists())
+        # Explicit update_fields may still write the column
+        job.applications_count = 3
+        job.save(update_fields=['applications_count'])
+        self.assertEqual(self.count(job), 3)
+        
+    def test_job_delete_skips_count_updates(self):
+        Application.objects.create(worker=self.worker, job=self.job)
+        with CaptureQueriesContext(connection) as queries:
+            self.job.delete()
+        self.assertFalse(any(query['sql'].startswith('UPDATE "core_jobposting"') for query in queries.captured_queries))
+        self.assertFalse(Application.objects.exists())
+        
+    def test_reconcile_fixes_drift(self):
+        Application.objects.create(worker=self.worker, job=self.job)
+        JobPosting.objects.filter(id=self.job.id).update(applications_count=7)
+        JobPosting.objects.filter(id=self.other_job.id).update(applications_count=2)
+        out = StringIO()
+        call_command('reconcile_applications_count', '--dry-run', stdout=out)
+        self.assertIn('2 jobs', out.getvalue())
+        self.assertEqual(self.count(self.job), 7)
+        
+        call_command('reconcile_applications_count', '--batch-size', '1', stdout=StringIO())
+        self.assertEqual((self.count(self.job), self.count(self.other_job)), (1, 0))
+        
+    def test_list_reads_the_column(self):
+        Application.objects.create(worker=self.worker, job=self.job)
+        self.client.force_authenticate(self.employer_user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('jobposting-list'), {'ordering': 'created_at'})
+        self.assertEqual([job['applications_count'] for job in response.data['results']], [1, 0])
+        self.assertFalse(any('core_application' in query['sql'] for query in queries.captured_queries))
+
+
+class EmployerCopyTests(APITestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        self.other_employer = Employer.objects.create(
+            user=User.objects.create_user('emp2', 'emp2@test.com', 'pass'),
+            company_name='OtherCorp',
+            email='other@corp.com',
+            phone='+254700123458',
+            sector='construction'
+        )
+        with override_settings(MATCH_SCORES_AUTO_UPDATE=False):
+            self.job = JobPosting.objects.create(
+                title='Plumbing job',
+                description='Fix pipes',
+                location='Nairobi',
+                employer=self.employer,
+                pay_rate=1500.00,
+                required_skills=['plumbing']
+            )
+            self.other_job = JobPosting.objects.create(
+                title='Plumbing repairs',
+                description='Fix taps',
+                location='Nairobi',
+                employer=self.other_employer,
+                pay_rate=1500.00,
+                required_skills=['plumbing']
+            )
+            self.worker_user = User.objects.create_user('worker', 'worker@test.com', 'pass')
+            self.worker = WorkerProfile.objects.create(
+                user=self.worker_user,
+                full_name='John Doe',
+                phone_number='+254700123457',
+                location='Nairobi',
+                skills=['plumbing']
+            )
+            
+    def employers(self, model):
+        return dict(model.objects.values_list('job_id', 'employer_id'))
+        
+    def test_applications_copy_the_job_employer(self):
+        self.client.force_authenticate(self.worker_user)
+        response = self.client.post(reverse('application-list'), {'job': self.job.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        application = Application.objects.get()
+        self.assertEqual(application.employer_id, self.employer.id)
+        
+        application = Application.objects.get()
+        application.job = self.other_job
+        application.save(update_fields=['job'])
+        self.assertEqual(self.employers(Application), {self.other_job.id: self.other_employer.id})
+        
+    def test_match_score_writers_copy_the_job_employer(self):
+        expected = {self.job.id: self.employer.id, self.other_job.id: self.other_employer.id}
+        materialize_worker(self.worker)
+        self.assertEqual(self.employers(MatchScore), expected)
+        MatchScore.objects.all().delete()
+        for job in (self.job, self.other_job):
+            materialize_job(job)
+        self.assertEqual(self.employers(MatchScore), expected)
+        MatchScore.objects.all().delete()
+        call_command('rebuild_match_scores', workers=1, stdout=StringIO())
+        self.assertEqual(self.employers(MatchScore), expected)
+        
+    def test_job_changing_employer_moves_the_copies(self):
+        Application.objects.create(worker=self.worker, job=self.job)
+        MatchScore.objects.create(worker=self.worker, job=self.job, score=0.9)
+        job = JobPosting.objects.get(id=self.job.id)
+        job.employer = self.other_employer
+        with override_settings(MATCH_SCORES_AUTO_UPDATE=False):
+            job.save()
+        self.assertEqual(self.employers(Application), {self.job.id: self.other_employer.id})
+        self.assertEqual(self.employers(MatchScore), {self.job.id: self.other_employer.id})
+        
+    def test_employer_lists_do_not_join_jobs(self):
+        Application.objects.create(worker=self.worker, job=self.job)
+        Application.objects.create(worker=self.worker, job=self.other_job)
+        MatchScore.objects.create(worker=self.worker, job=self.job, score=0.9)
+        self.client.force_authenticate(self.employer_user)
+        for url in (reverse('application-list'), reverse('matchscore-list')):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual([row['job'] for row in response.data['results']], [self.job.id])
+            # Jobs are joined for job_title only, not to find the employer's rows
+            where = queries.captured_queries[-1]['sql'].split(' WHERE ')[1]
+            self.assertNotIn('core_jobposting', where)
+
+
+@override_settings(REPLICA_DATABASES=['replica'], MATCH_SCORES_AUTO_UPDATE=False)
+class ReplicaRoutingTests(TransactionTestCase):
+    """The test database is the primary; a second SQLite file is its replica"""
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.replica_dir = tempfile.TemporaryDirectory()
+        cls.replica_path = os.path.join(cls.replica_dir.name, 'replica.sqlite3')
+        connections.settings['replica'] = {**connections.settings['default'], 'NAME': cls.replica_path}
+        
+    @classmethod
+    def tearDownClass(cls):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        cls.replica_dir.cleanup()
+        super().tearDownClass()
+        
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        self.job = self.create_job('Plumbing job')
+        self.worker = WorkerProfile.objects.create(
+            full_name='John Doe',
+            phone_number='+254700123457',
+            location='Nairobi',
+            skills=['plumbing']
+        )
+        self.replicate()
+        # Not replicated yet
+        self.new_job = self.create_job('Plumbing repairs')
+        self.new_worker = WorkerProfile.objects.create(
+            full_name='Jane Doe',
+            phone_number='+254700123458',
+            location='Nairobi',
+            skills=['plumbing']
+        )
+        
+    def create_job(self, title):
+        return JobPosting.objects.create(
+            title=title,
+            description='Fix pipes',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=1500.00,
+            required_skills=['plumbing']
+        )
+        
+    def replicate(self):
+        """Copy the primary into the replica file"""
+        connections['replica'].close()
+        connection.ensure_connection()
+        replica = sqlite3.connect(self.replica_path)
+        connection.connection.backup(replica)
+        replica.close()
+        
+    def whatsapp(self, phone, body):
+        return APIClient().post(reverse('whatsapp_webhook'), {
+            'From': f'whatsapp:{phone}',
+            'Body': body
+        }, format='json').data['message']
+        
+    def test_job_list_and_detail_read_the_replica(self):
+        response = self.client.get(reverse('jobposting-list'))
+        self.assertEqual([job['id'] for job in response.data['results']], [self.job.id])
+        self.assertNotIn(REPLICA_PIN_COOKIE, response.cookies)
+        response = self.client.get(reverse('jobposting-detail', args=[self.new_job.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+    def test_client_that_wrote_reads_the_primary(self):
+        client = APIClient()
+        client.force_authenticate(self.employer_user)
+        response = client.post(reverse('jobposting-list'), {
+            'title': 'Welding job',
+            'description': 'Weld gates',
+            'location': 'Nairobi',
+            'pay_rate': '2000.00',
+            'required_skills': ['welding']
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(REPLICA_PIN_COOKIE, response.cookies)
+        response = client.get(reverse('jobposting-list'))
+        self.assertEqual(len(response.data['results']), 3)
+        
+    def test_reads_after_a_write_use_the_primary(self):
+        router = PrimaryReplicaRouter()
+        with routing_request():
+            with replica_reads():
+                self.assertEqual(router.db_for_read(JobPosting), 'replica')
+                self.assertFalse(JobPosting.objects.filter(id=self.new_job.id).exists())
+                JobPosting.objects.filter(id=self.job.id).update(pay_rate=1600)
+                self.assertTrue(JobPosting.objects.filter(id=self.new_job.id).exists())
+        # Outside requests and replica_reads blocks
+        self.assertEqual(router.db_for_read(JobPosting), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'core'))
+        self.assertIsNone(router.allow_migrate('default', 'core'))
+        
+    def test_webhook_job_searches(self):
+        self.assertTrue(self.whatsapp(self.worker.phone_number, 'jobs').startswith('Jobs in'))
+        self.assertIn('register first', self.whatsapp(self.new_worker.phone_number, 'jobs'))
+        response = APIClient().post(reverse('ussd_webhook'), {
+            'sessionId': '1',
+            'phoneNumber': self.new_worker.phone_number,
+            'text': '2'
+        }, format='json')
+        self.assertIn('register first', response.data['response'])
+        
+    def test_webhook_writes_pin_the_phone(self):
+        phone = '+254700123459'
+        self.whatsapp(phone, 'register Mary nairobi plumbing')
+        self.assertNotIn('register first', self.whatsapp(phone, 'jobs'))
+        
+        self.whatsapp(self.new_worker.phone_number, f'apply {self.job.id}')
+        self.assertNotIn('register first', self.whatsapp(self.new_worker.phone_number, 'jobs'))
+
+
+@override_settings(MATCH_SCORES_AUTO_UPDATE=False)
+class ArchivalTests(APITestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        self.worker_user = User.objects.create_user('worker', 'worker@test.com', 'pass')
+        self.worker = WorkerProfile.objects.create(
+            user=self.worker_user,
+            full_name='John Doe',
+            phone_number='+254700123457',
+            location='Nairobi',
+            skills=['plumbing']
+        )
+        self.old_job = self.create_job('Plumbing job')
+        self.application = Application.objects.create(worker=self.worker, job=self.old_job, status='accepted')
+        MatchScore.objects.create(worker=self.worker, job=self.old_job, score=0.9)
+        self.recent_job = self.create_job('Plumbing repairs')
+        self.open_job = self.create_job('Pipe fitting', is_open=True)
+        JobPosting.objects.filter(id=self.old_job.id).update(updated_at=timezone.now() - timedelta(days=40))
+        JobPosting.objects.filter(id=self.open_job.id).update(updated_at=timezone.now() - timedelta(days=40))
+        
+    def create_job(self, title, is_open=False):
+        return JobPosting.objects.create(
+            title=title,
+            description='Fix pipes',
+            location='Nairobi',
+            employer=self.employer,
+            pay_rate=1500.00,
+            required_skills=['plumbing'],
+            is_open=is_open
+        )
+        
+    def test_moves_long_closed_jobs_with_their_rows(self):
+        self.assertEqual(archive_closed_jobs(days=30), (1, 1))
+        self.assertEqual(set(JobPosting.objects.values_list('id', flat=True)), {self.recent_job.id, self.open_job.id})
+        for model in (Application, MatchScore, JobSkill):
+            self.assertFalse(model.objects.filter(job_id=self.old_job.id).exists())
+        self.assertNotIn(self.old_job.id, search_jobs(JobPosting.objects.all(), 'plumbing').values_list('id', flat=True))
+        
+        job = ArchivedJobPosting.objects.get(id=self.old_job.id)
+        self.assertEqual((job.title, job.employer_id, job.applications_count), ('Plumbing job', self.employer.id, 1))
+        self.assertEqual(job.created_at, self.old_job.created_at)
+        application = ArchivedApplication.objects.get()
+        self.assertEqual(
+            (application.id, application.job_id, application.worker_id, application.status),
+            (self.application.id, self.old_job.id, self.worker.id, 'accepted')
+        )
+        self.assertEqual(archive_closed_jobs(days=30), (0, 0))
+        
+    def test_archive_ids_are_as_wide_as_the_source_ids(self):
+        for archive_model, model in ((ArchivedJobPosting, JobPosting), (ArchivedApplication, Application)):
+            self.assertEqual(archive_model._meta.pk.get_internal_type(), 'BigIntegerField')
+            self.assertEqual(model._meta.pk.get_internal_type(), 'BigAutoField')
+        
+    def test_command_batches_and_dry_run(self):
+        JobPosting.objects.filter(id=self.recent_job.id).update(updated_at=timezone.now() - timedelta(days=40))
+        out = StringIO()
+        call_command('archive_closed_jobs', '--days', '30', '--dry-run', stdout=out)
+        self.assertIn('2 jobs with 1 applications would be archived', out.getvalue())
+        self.assertEqual(ArchivedJobPosting.objects.count(), 0)
+        
+        out = StringIO()
+        call_command('archive_closed_jobs', '--days', '30', '--batch-size', '1', stdout=out)
+        self.assertIn('Archived 2 jobs with 1 applications', out.getvalue())
+        self.assertEqual(list(JobPosting.objects.values_list('id', flat=True)), [self.open_job.id])
+        
+    def test_history_endpoints(self):
+        archive_closed_jobs(days=30)
+        response = self.client.get(reverse('jobposting-detail', args=[self.old_job.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+        self.client.force_authenticate(self.employer_user)
+        response = self.client.get(reverse('jobposting-archived'))
+        self.assertEqual([job['id'] for job in response.data['results']], [self.old_job.id])
+        response = self.client.get(reverse('application-archived'))
+        self.assertEqual([row['job_title'] for row in response.data['results']], ['Plumbing job'])
+        
+        self.client.force_authenticate(self.worker_user)
+        response = self.client.get(reverse('application-archived'))
+        self.assertEqual([row['id'] for row in response.data['results']], [self.application.id])
+        response = self.client.get(reverse('jobposting-archived'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(MATCH_SCORES_AUTO_UPDATE=False)
+class JobImportTests(APITestCase):
+    CSV = (
+        'title,description,location,pay_rate,required_skills,job_type\n'
+        'Plumbing job,Fix pipes,Nairobi,1500,"plumbing, welding",contract\n'
+        'Bad pay,Fix taps,Nairobi,lots,plumbing,\n'
+        '"Night shift","Guard the\nsite",Mombasa,900,security,\n'
+    )
+    
+    def setUp(self):
+        self.employer_user = User.objects.create_user('emp', 'emp@test.com', 'pass')
+        self.employer = Employer.objects.create(
+            user=self.employer_user,
+            company_name='TestCorp',
+            email='test@corp.com',
+            phone='+254700123456',
+            sector='construction'
+        )
+        self.client.force_authenticate(self.employer_user)
+        self.url = reverse('jobposting-import')
+        
+    def test_csv_upload(self):
+        upload = SimpleUploadedFile('shifts.csv', ('\ufeff' + self.CSV).encode(), content_type='text/csv')
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 1))
+        self.assertEqual(response.data['errors'][0]['line'], 3)
+        self.assertIn('pay_rate', response.data['errors'][0]['errors'])
+        
+        job = JobPosting.objects.get(title='Plumbing job')
+        self.assertEqual((job.employer, job.job_type, job.required_skills), (self.employer, 'contract', ['plumbing', 'welding']))
+        self.assertIsNotNone(job.geo_cell)
+        self.assertEqual(job.skill_mask, skill_mask(['plumbing', 'welding']))
+        self.assertEqual(set(job.skill_postings.values_list('skill', flat=True)), {'plumbing', 'welding'})
+        self.assertEqual(JobPosting.objects.get(title='Night shift').description, 'Guard the\nsite')
+        self.assertEqual(list(search_jobs(JobPosting.objects.all(), 'plumbing').values_list('id', flat=True)), [job.id])
+        
+    def test_ndjson_body_in_chunks(self):
+        lines = [json.dumps({'title': f'Shift {i}', 'description': 'Weld', 'location': 'Nairobi',
+                             'pay_rate': '1000', 'required_skills': ['welding']}) for i in range(5)]
+        lines[1:1] = ['', '{not json', '["a list"]', json.dumps({'title': 'No pay'})]
+        with override_settings(JOB_IMPORT_CHUNK_SIZE=2), CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, '\n'.join(lines), content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['created'], response.data['failed']), (5, 3))
+        self.assertEqual([error['line'] for error in response.data['errors']], [3, 4, 5])
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT INTO "core_jobposting"')]
+        self.assertEqual(len(inserts), 3)
+        
+    def test_errors_are_capped_and_unreadable_input_stops(self):
+        body = 'title,pay_rate\n' + 'x,bad\n' * 5
+        with override_settings(JOB_IMPORT_MAX_ERRORS=2):
+            response = self.client.post(self.url, body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual((response.data['failed'], len(response.data['errors'])), (5, 2))
+        
+        body = self.CSV.encode().replace(b'Mombasa', b'Momb\xffasa')
+        response = self.client.post(self.url, body, content_type='text/csv')
+        self.assertEqual(response.data['created'], 1)
+        self.assertIn('Unreadable upload', str(response.data['errors'][-1]['errors']))
+        
+    def test_rows_are_read_lazily(self):
+        def lines():
+            yield b'title,pay_rate\n'
+            while True:
+                yield b'Shift,1000\n'
+        self.assertEqual([line for line, _ in islice(csv_rows(lines()), 3)], [2, 3, 4])
+        
+    @override_settings(MATCH_BACKEND='materialized', MATCH_SCORES_AUTO_UPDATE=True)
+    def test_imported_jobs_are_scored_out_of_band(self):
+        worker = WorkerProfile.objects.create(
+            full_name='John Doe',
+            phone_number='+254700123457',
+            location='Nairobi',
+            skills=['plumbing', 'welding']
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url, self.CSV, content_type='text/csv')
+        self.assertEqual(callbacks, [])
+        self.assertFalse(MatchScore.objects.exists())
+        
+        job = JobPosting.objects.get(title='Plumbing job')
+        self.assertEqual(response.data['job_ids'], [job.id, JobPosting.objects.get(title='Night shift').id])
+        call_command('rebuild_match_scores', workers=1, jobs=','.join(map(str, response.data['job_ids'])), stdout=StringIO())
+        score = MatchScore.objects.get(job=job, worker=worker)
+        self.assertEqual(score.score, calculate_match_score(worker, job))
+        self.assertEqual(score.employer_id, self.employer.id)
+        
+    def test_employers_only_and_known_formats(self):
+        response = self.client.post(self.url, self.CSV, content_type='text/plain')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        self.client.force_authenticate(User.objects.create_user('other', 'other@test.com', 'pass'))
+        response = self.client.post(self.url, self.CSV, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(JobPosting.objects.count(), 0)
+
+
 class APITests(APITestCase):
     def setUp(self):
         self.client = APIClient()
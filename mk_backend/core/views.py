@@ -1,21 +1,29 @@
+import os
 from rest_framework import viewsets, status, permissions, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
-from django.core.cache import cache
-from django.db.models import Prefetch
-from .models import WorkerProfile, Employer, JobPosting, Application, MatchScore
+from rest_framework.filters import OrderingFilter
+from django.conf import settings
+from .models import (
+    WorkerProfile, Employer, JobPosting, Application, MatchScore, ArchivedJobPosting, ArchivedApplication
+)
 from .serializers import (
     WorkerProfileSerializer, EmployerSerializer, JobPostingSerializer,
     JobPostingCreateSerializer, ApplicationSerializer, ApplicationCreateSerializer,
-    MatchScoreSerializer
+    MatchScoreSerializer, ArchivedJobPostingSerializer, ArchivedApplicationSerializer
 )
-from .filters import JobPostingFilter, ApplicationFilter
-from .matching import calculate_match_score
+from .filters import JobPostingFilter, ApplicationFilter, JobSearchFilter
+from .ranking import top_matches_for_job
+from .match_cache import job_matches_cache_key, get_or_compute
+from .recommendations import recommended_jobs_for_worker
+from .query_planner import QueryPlannerMixin, plan_for_serializer
+from .db_router import ReplicaReadMixin
+from .job_import import IMPORT_CONTENT_TYPES, IMPORT_EXTENSIONS, IMPORT_READERS, import_jobs
+from .pagination import KeysetCursorPagination
 
 
-class WorkerProfileViewSet(viewsets.ModelViewSet):
+class WorkerProfileViewSet(QueryPlannerMixin, viewsets.ModelViewSet):
     queryset = WorkerProfile.objects.all()
     serializer_class = WorkerProfileSerializer
     permission_classes = [permissions.AllowAny]
@@ -23,9 +31,32 @@ class WorkerProfileViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         # Allow access to all worker profiles for matching purposes
         return WorkerProfile.objects.all()
+    
+    @action(detail=True, methods=['get'])
+    def recommended_jobs(self, request, pk=None):
+        """Get the best open jobs for a worker (?limit= up to MATCH_RESULTS_MAX_LIMIT)"""
+        worker = self.get_object()
+        try:
+            limit = int(request.query_params.get('limit', settings.MATCH_RESULTS_DEFAULT_LIMIT))
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.MATCH_RESULTS_MAX_LIMIT))
+        
+        jobs = []
+        for score, job in recommended_jobs_for_worker(worker, limit=limit):
+            jobs.append({
+                'job_id': job.id,
+                'title': job.title,
+                'employer_name': job.employer.company_name,
+                'location': job.location,
+                'pay_rate': str(job.pay_rate),
+                'job_type': job.job_type,
+                'score': score
+            })
+        return Response(jobs)
 
 
-class EmployerViewSet(viewsets.ModelViewSet):
+class EmployerViewSet(QueryPlannerMixin, viewsets.ModelViewSet):
     queryset = Employer.objects.all()
     serializer_class = EmployerSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -36,12 +67,12 @@ class EmployerViewSet(viewsets.ModelViewSet):
         return Employer.objects.none()
 
 
-class JobPostingViewSet(viewsets.ModelViewSet):
+class JobPostingViewSet(ReplicaReadMixin, QueryPlannerMixin, viewsets.ModelViewSet):
     queryset = JobPosting.objects.filter(is_open=True)
     serializer_class = JobPostingSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, JobSearchFilter]
     filterset_class = JobPostingFilter
-    search_fields = ['title', 'description', 'location']
+    pagination_class = KeysetCursorPagination
     ordering_fields = ['created_at', 'pay_rate']
     ordering = ['-created_at']
     
@@ -70,40 +101,85 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def matches(self, request, pk=None):
-        """Get match scores for a specific job with caching"""
+        """Get match scores for a specific job with caching (?limit= up to MATCH_RESULTS_MAX_LIMIT)"""
         job = self.get_object()
-        cache_key = f'job_matches_{job.id}'
+        try:
+            limit = int(request.query_params.get('limit', settings.MATCH_RESULTS_DEFAULT_LIMIT))
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.MATCH_RESULTS_MAX_LIMIT))
         
-        # Check cache first
-        matches = cache.get(cache_key)
-        if matches is None:
-            workers = WorkerProfile.objects.all()
-            matches = []
-            
-            for worker in workers:
-                score = calculate_match_score(worker, job)
-                if score > 0.3:  # Only return matches above threshold
-                    matches.append({
-                        'worker_id': worker.id,
-                        'worker_name': worker.full_name,
-                        'score': score,
-                        'phone': worker.phone_number
-                    })
+        def compute_matches():
+            ranked = top_matches_for_job(job, limit=limit)  # Top matches above threshold
+            workers = WorkerProfile.objects.in_bulk([worker_id for _, worker_id in ranked])
             
-            matches.sort(key=lambda x: x['score'], reverse=True)
-            matches = matches[:10]  # Top 10 matches
-            
-            # Cache for 15 minutes
-            cache.set(cache_key, matches, 900)
+            matches = []
+            for score, worker_id in ranked:
+                worker = workers[worker_id]
+                matches.append({
+                    'worker_id': worker.id,
+                    'worker_name': worker.full_name,
+                    'score': score,
+                    'phone': worker.phone_number
+                })
+            return matches
+        
+        # The key changes whenever workers or this job change; only one request
+        # rebuilds an expiring list while the others get the previous one
+        matches = get_or_compute(
+            job_matches_cache_key(job.id, limit), compute_matches, settings.MATCH_CACHE_TIMEOUT
+        )
         
         return Response(matches)
+    
+    @action(detail=False, methods=['post'], url_path='import', url_name='import')
+    def bulk_import(self, request):
+        """
+        Create many jobs from a CSV or NDJSON upload (a `file` form field, or
+        the request body sent as text/csv or application/x-ndjson)
+        """
+        if not hasattr(request.user, 'employer_profile'):
+            return Response({"error": "Only employers can import job postings"},
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        if request.content_type.startswith('multipart/form-data'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                return Response({"error": "Upload the jobs as the 'file' field"},
+                              status=status.HTTP_400_BAD_REQUEST)
+            extension = os.path.splitext(upload.name)[1].lower()
+            import_format = IMPORT_EXTENSIONS.get(extension) or IMPORT_CONTENT_TYPES.get(upload.content_type)
+            lines = upload
+        else:
+            # Read from the request stream, never as a whole body
+            import_format = IMPORT_CONTENT_TYPES.get(request.content_type.split(';')[0].strip())
+            lines = request.stream or []
+        if import_format is None:
+            return Response({"error": "Send CSV (text/csv) or NDJSON (application/x-ndjson)"},
+                          status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        
+        result = import_jobs(IMPORT_READERS[import_format](lines), request.user.employer_profile)
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['get'])
+    def archived(self, request):
+        """The employer's archived jobs (closed long ago, see archive_closed_jobs)"""
+        if not hasattr(request.user, 'employer_profile'):
+            return Response({"error": "Only employers can view archived jobs"},
+                          status=status.HTTP_403_FORBIDDEN)
+        jobs = plan_for_serializer(ArchivedJobPostingSerializer, ArchivedJobPosting).apply(
+            ArchivedJobPosting.objects.filter(employer=request.user.employer_profile)
+        )
+        page = self.paginate_queryset(jobs)
+        return self.get_paginated_response(ArchivedJobPostingSerializer(page, many=True).data)
 
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(QueryPlannerMixin, viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = ApplicationFilter
+    pagination_class = KeysetCursorPagination
     ordering_fields = ['applied_at']
     ordering = ['-applied_at']
     
@@ -122,7 +198,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         if hasattr(user, 'worker_profile'):
             return Application.objects.filter(worker=user.worker_profile)
         elif hasattr(user, 'employer_profile'):
-            return Application.objects.filter(job__employer=user.employer_profile)
+            return Application.objects.filter(employer=user.employer_profile)
         return Application.objects.none()
     
     def perform_create(self, serializer):
@@ -148,7 +224,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             return Response({"error": "Only employers can update application status"}, 
                           status=status.HTTP_403_FORBIDDEN)
         
-        if application.job.employer != request.user.employer_profile:
+        if application.employer_id != request.user.employer_profile.id:
             return Response({"error": "You can only update applications for your jobs"}, 
                           status=status.HTTP_403_FORBIDDEN)
         
@@ -161,17 +237,32 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(application)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def archived(self, request):
+        """Applications to archived jobs, for their worker or employer"""
+        user = request.user
+        if hasattr(user, 'worker_profile'):
+            applications = ArchivedApplication.objects.filter(worker=user.worker_profile)
+        elif hasattr(user, 'employer_profile'):
+            applications = ArchivedApplication.objects.filter(employer=user.employer_profile)
+        else:
+            applications = ArchivedApplication.objects.none()
+        applications = plan_for_serializer(ArchivedApplicationSerializer, ArchivedApplication).apply(applications)
+        page = self.paginate_queryset(applications)
+        return self.get_paginated_response(ArchivedApplicationSerializer(page, many=True).data)
 
 
-class MatchScoreViewSet(viewsets.ReadOnlyModelViewSet):
+class MatchScoreViewSet(QueryPlannerMixin, viewsets.ReadOnlyModelViewSet):
     queryset = MatchScore.objects.all()
     serializer_class = MatchScoreSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetCursorPagination
     
     def get_queryset(self):
         user = self.request.user
         if hasattr(user, 'worker_profile'):
             return MatchScore.objects.filter(worker=user.worker_profile)
         elif hasattr(user, 'employer_profile'):
-            return MatchScore.objects.filter(job__employer=user.employer_profile)
+            return MatchScore.objects.filter(employer=user.employer_profile)
         return MatchScore.objects.none()
\ No newline at end of file
@@ -7,7 +7,8 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.core.cache import cache
 from .models import WorkerProfile, JobPosting, Application
-from .matching import calculate_match_score
+from .recommendations import recommended_jobs_for_worker
+from .db_router import pin_to_primary, replica_reads, request_wrote
 import json
 import logging
 from twilio.twiml.messaging_response import MessagingResponse
@@ -28,6 +29,7 @@ def whatsapp_webhook(request):
     Handle WhatsApp messages via Twilio
     Expected format: {"From": "+254...", "Body": "message"}
     """
+    phone = None
     try:
         phone = request.data.get('From', '').replace('whatsapp:', '')
         message = request.data.get('Body', '').strip().lower()
@@ -36,7 +38,8 @@ def whatsapp_webhook(request):
         if message.startswith('register'):
             return handle_worker_registration(phone, message)
         elif message.startswith('jobs'):
-            return handle_job_search(phone, message)
+            with replica_reads(client=phone):
+                return handle_job_search(phone, message)
         elif message.startswith('apply'):
             return handle_job_application(phone, message)
         else:
@@ -46,6 +49,10 @@ def whatsapp_webhook(request):
             
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    finally:
+        # Webhook callers keep no cookies: pin the phone number instead
+        if request_wrote():
+            pin_to_primary(phone)
 
 
 @api_view(['POST'])
@@ -57,6 +64,7 @@ def ussd_webhook(request):
     Handle USSD sessions via Africa's Talking
     Expected format: {"sessionId": "...", "phoneNumber": "+254...", "text": "..."}
     """
+    phone = None
     try:
         session_id = request.data.get('sessionId')
         phone = request.data.get('phoneNumber')
@@ -68,7 +76,8 @@ def ussd_webhook(request):
         elif text == '1':
             response = "CON Enter your details:\nName*Location*Skills (comma separated)"
         elif text == '2':
-            response = handle_ussd_job_search(phone)
+            with replica_reads(client=phone):
+                response = handle_ussd_job_search(phone)
         elif text == '3':
             response = handle_ussd_applications(phone)
         elif text.startswith('1*'):
@@ -80,6 +89,9 @@ def ussd_webhook(request):
         
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    finally:
+        if request_wrote():
+            pin_to_primary(phone)
 
 
 def handle_worker_registration(phone, message):
@@ -117,17 +129,13 @@ def handle_job_search(phone, message):
         worker = WorkerProfile.objects.get(phone_number=phone)
         location = message.split(' ', 1)[1] if len(message.split(' ')) > 1 else worker.location
         
-        jobs = JobPosting.objects.filter(
-            is_open=True,
-            location__icontains=location
-        )[:5]
+        scored = recommended_jobs_for_worker(worker, limit=5, location=location)
         
-        if not jobs:
+        if not scored:
             return Response({"message": f"No jobs found in {location}. Try different location."})
         
         response = f"Jobs in {location}:\n"
-        for job in jobs:
-            score = calculate_match_score(worker, job)
+        for score, job in scored:
             response += f"{job.id}: {job.title} - ${job.pay_rate} (Match: {score:.0%})\n"
         response += "Reply 'apply [job_id]' to apply"
         
@@ -188,7 +196,7 @@ def handle_ussd_job_search(phone):
     """Handle USSD job search"""
     try:
         worker = WorkerProfile.objects.get(phone_number=phone)
-        jobs = JobPosting.objects.filter(is_open=True)[:3]
+        jobs = [job for _, job in recommended_jobs_for_worker(worker, limit=3)]
         
         if not jobs:
             return "END No jobs available."
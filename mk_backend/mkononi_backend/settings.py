@@ -49,6 +49,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -95,6 +97,24 @@ DATABASES = {
     }
 }
 
+# Read replica (core.db_router): list/retrieve of jobs and the WhatsApp/USSD
+# job searches read from it; clients that wrote stay on the primary for
+# REPLICA_PIN_SECONDS to cover replication lag
+REPLICA_DATABASES = []
+if config('DB_REPLICA_HOST', default='') or config('DB_REPLICA_NAME', default=''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': config('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'HOST': config('DB_REPLICA_HOST', default=DATABASES['default']['HOST']),
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES = ['replica']
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -197,6 +217,43 @@ CACHES = {
     }
 }
 
+# Job matching
+MATCH_RESULTS_DEFAULT_LIMIT = 10
+MATCH_RESULTS_MAX_LIMIT = config('MATCH_RESULTS_MAX_LIMIT', default=50, cast=int)
+MATCH_SCAN_CHUNK_SIZE = config('MATCH_SCAN_CHUNK_SIZE', default=2000, cast=int)
+# 'live' scores workers on request, 'materialized' reads the MatchScore table,
+# 'sql' scores and ranks workers inside the database
+MATCH_BACKEND = config('MATCH_BACKEND', default='live')
+# Workers this close to a job (or with an unresolved location) are scanned before the rest
+MATCH_RADIUS_KM = config('MATCH_RADIUS_KM', default=50, cast=float)
+# Resolved places within this radius count as "jobs in <place>" for WhatsApp search
+JOB_SEARCH_RADIUS_KM = config('JOB_SEARCH_RADIUS_KM', default=10, cast=float)
+# Recompute MatchScore rows when a worker or job is saved. Each job keeps its top
+# MATCH_RESULTS_MAX_LIMIT workers, so a save writes a bounded number of rows
+MATCH_SCORES_AUTO_UPDATE = config('MATCH_SCORES_AUTO_UPDATE', default=True, cast=bool)
+# Seconds a job_matches response stays cached; saves invalidate it through versioned keys
+MATCH_CACHE_TIMEOUT = config('MATCH_CACHE_TIMEOUT', default=900, cast=int)
+# An expired match list is still served for this long while one request rebuilds it
+MATCH_CACHE_STALE_TIMEOUT = config('MATCH_CACHE_STALE_TIMEOUT', default=300, cast=int)
+# Longest a rebuild holds the single-flight lock before others may take over
+MATCH_CACHE_LOCK_TIMEOUT = config('MATCH_CACHE_LOCK_TIMEOUT', default=30, cast=int)
+
+# Bulk job import (POST /api/jobs/import/): rows validated and inserted per chunk,
+# and row errors reported at most
+JOB_IMPORT_CHUNK_SIZE = config('JOB_IMPORT_CHUNK_SIZE', default=500, cast=int)
+JOB_IMPORT_MAX_ERRORS = config('JOB_IMPORT_MAX_ERRORS', default=100, cast=int)
+
+# Closed jobs untouched this long move to the archive tables (archive_closed_jobs)
+ARCHIVE_CLOSED_JOBS_AFTER_DAYS = config('ARCHIVE_CLOSED_JOBS_AFTER_DAYS', default=90, cast=int)
+
+# Page jobs, applications and matches with keyset cursors (no count) unless ?page= is given;
+# off, clients opt in with ?cursor=
+KEYSET_PAGINATION = config('KEYSET_PAGINATION', default=False, cast=bool)
+
+# Request metrics
+# Send each request's query count, DB time, cache hits/misses and wall time as X- headers
+PERF_METRICS_HEADERS = config('PERF_METRICS_HEADERS', default=DEBUG, cast=bool)
+
 # Swagger/OpenAPI Configuration
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Mkononi API',
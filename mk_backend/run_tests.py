@@ -19,6 +19,31 @@ if __name__ == "__main__":
     test_modules = [
         'core.tests.ModelTests',
         'core.tests.MatchingTests', 
+        'core.tests.BatchScoringTests',
+        'core.tests.SkillIndexTests',
+        'core.tests.TopKSelectionTests',
+        'core.tests.MatchScoreMaterializationTests',
+        'core.tests.RebuildMatchScoresTests',
+        'core.tests.RecommendedJobsTests',
+        'core.tests.GeoLocationTests',
+        'core.tests.SkillTaxonomyTests',
+        'core.tests.MatchCacheInvalidationTests',
+        'core.tests.MatchCacheStampedeTests',
+        'core.tests.SqlScoringTests',
+        'core.tests.SyntheticPopulationTests',
+        'core.tests.GenerateLoadDataTests',
+        'core.tests.ListQueryCountTests',
+        'core.tests.QueryPlannerTests',
+        'core.tests.PerformanceMiddlewareTests',
+        'core.tests.QueryBudgetTests',
+        'core.tests.HotPathIndexTests',
+        'core.tests.JobSearchTests',
+        'core.tests.KeysetPaginationTests',
+        'core.tests.ApplicationsCountTests',
+        'core.tests.EmployerCopyTests',
+        'core.tests.ReplicaRoutingTests',
+        'core.tests.ArchivalTests',
+        'core.tests.JobImportTests',
         'core.tests.APITests',
         'core.tests.WebhookTests'
     ]